@@ -0,0 +1,604 @@
+// Scripts base de la pagina del curso (tema, codigo, Mermaid, indice y
+// buscador). build-html.py los publica como dist/assets/course-core.<hash>.js
+// y el HTML los carga al final del <body>, donde antes iban en linea.
+
+// Theme management
+function getPreferredTheme() {
+    const saved = localStorage.getItem('course-theme');
+    if (saved) return saved;
+    return window.matchMedia('(prefers-color-scheme: dark)').matches ? 'dark' : 'light';
+}
+
+function getPreferredStyle() {
+    return localStorage.getItem('course-style') || 'enterprise';
+}
+
+function getPreferredCodeTheme() {
+    return localStorage.getItem('course-code-theme') || 'monokai';
+}
+
+function applyStyle(style) {
+    document.documentElement.setAttribute('data-style', style);
+    localStorage.setItem('course-style', style);
+    
+    const btn = document.getElementById('style-cycle-btn');
+    if (btn) {
+        btn.textContent = 'Estilo: ' + style.charAt(0).toUpperCase() + style.slice(1);
+        
+        // Set button colors based on style
+        const styleColors = {
+            'enterprise': { bg: '#2563eb', border: '#3b82f6', text: '#ffffff' },
+            'bold': { bg: '#ff6b35', border: '#ff8c5a', text: '#ffffff' },
+            'paper': { bg: '#c4956a', border: '#d4a87a', text: '#2d2419' }
+        };
+        
+        const colors = styleColors[style] || styleColors['enterprise'];
+        btn.style.backgroundColor = colors.bg;
+        btn.style.borderColor = colors.border;
+        btn.style.color = colors.text;
+    }
+}
+
+function cycleStyle() {
+    const styles = ['enterprise', 'bold', 'paper'];
+    const current = document.documentElement.getAttribute('data-style') || 'enterprise';
+    const currentIndex = styles.indexOf(current);
+    const nextIndex = (currentIndex + 1) % styles.length;
+    const nextStyle = styles[nextIndex];
+    applyStyle(nextStyle);
+    renderMermaid();
+}
+
+function applyCodeTheme(theme) {
+    localStorage.setItem('course-code-theme', theme);
+    const btn = document.getElementById('code-theme-cycle-btn');
+    if (btn) {
+        btn.textContent = 'Codigo: ' + theme.charAt(0).toUpperCase() + theme.slice(1).replace(/-/g, ' ');
+    }
+    
+    const hljsLink = document.getElementById('hljs-theme');
+    const themeMap = {
+        'monokai': 'monokai.min.css',
+        'github': 'github.min.css',
+        'github-dark': 'github-dark.min.css',
+        'atom-one-dark': 'atom-one-dark.min.css'
+    };
+    hljsLink.href = `https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/${themeMap[theme] || 'monokai.min.css'}`;
+    
+    // Blocks prehighlighted at build time only need the new theme stylesheet.
+    const highlightedBlocks = document.querySelectorAll('pre code[data-highlighted]:not([data-sma-prehighlighted])');
+    if (typeof hljs !== 'undefined') {
+        highlightedBlocks.forEach(block => {
+            block.removeAttribute('data-highlighted');
+            hljs.highlightElement(block);
+        });
+    }
+    enhanceCodeBlocksFrom(highlightedBlocks);
+}
+
+let mermaidLoadPromise = null;
+let highlightLoadPromise = null;
+
+function loadExternalScript(src) {
+    return new Promise((resolve, reject) => {
+        if (!src) {
+            reject(new Error('missing-script-src'));
+            return;
+        }
+
+        const selector = `script[data-sma-src="${src}"]`;
+        const existing = document.querySelector(selector);
+        if (existing) {
+            if (existing.dataset.loaded === '1') {
+                resolve();
+                return;
+            }
+            existing.addEventListener('load', () => resolve(), { once: true });
+            existing.addEventListener('error', () => reject(new Error(`script-load-failed:${src}`)), { once: true });
+            return;
+        }
+
+        const script = document.createElement('script');
+        script.src = src;
+        script.async = true;
+        script.dataset.smaSrc = src;
+        script.addEventListener('load', () => {
+            script.dataset.loaded = '1';
+            resolve();
+        }, { once: true });
+        script.addEventListener('error', () => reject(new Error(`script-load-failed:${src}`)), { once: true });
+        document.head.appendChild(script);
+    });
+}
+
+function ensureMermaidLoaded() {
+    if (typeof mermaid !== 'undefined') return Promise.resolve();
+    if (!mermaidLoadPromise) {
+        mermaidLoadPromise = loadExternalScript(window.__SMA_MERMAID_SRC).then(() => {
+            if (typeof mermaid === 'undefined') {
+                throw new Error('mermaid-unavailable');
+            }
+        });
+    }
+    return mermaidLoadPromise;
+}
+
+function ensureHighlightLoaded() {
+    if (typeof hljs !== 'undefined') return Promise.resolve();
+    if (!highlightLoadPromise) {
+        highlightLoadPromise = loadExternalScript(window.__SMA_HLJS_CORE_SRC)
+            .then(() => loadExternalScript(window.__SMA_HLJS_LANG_SRC))
+            .then(() => {
+                if (typeof hljs === 'undefined') {
+                    throw new Error('hljs-unavailable');
+                }
+            });
+    }
+    return highlightLoadPromise;
+}
+
+function detectSnippetLang(codeEl) {
+    const className = (codeEl.className || '').toLowerCase();
+    if (className.includes('language-kotlin') || className.includes('language-kt')) return 'KT';
+    if (className.includes('language-swift')) return 'Swift';
+    if (className.includes('language-js') || className.includes('language-javascript')) return 'JS';
+    if (className.includes('language-ts') || className.includes('language-typescript')) return 'TS';
+    if (className.includes('language-json')) return 'JSON';
+    if (className.includes('language-bash') || className.includes('language-shell')) return 'SH';
+    if (className.includes('language-yaml') || className.includes('language-yml')) return 'YAML';
+    if (className.includes('language-python') || className.includes('language-py')) return 'PY';
+    if (className.includes('language-mermaid')) return 'Mermaid';
+    if (className.includes('language-xml') || className.includes('language-html')) return 'XML';
+    if (className.includes('language-sql')) return 'SQL';
+    if (className.includes('language-markdown') || className.includes('language-md')) return 'MD';
+    if (className.includes('language-gherkin') || className.includes('language-feature')) return 'Gherkin';
+
+    const content = (codeEl.textContent || '').trim();
+    if (!content) return 'TXT';
+
+    if (
+        content.startsWith('flowchart') ||
+        content.startsWith('sequenceDiagram') ||
+        content.startsWith('classDiagram') ||
+        content.startsWith('stateDiagram') ||
+        content.startsWith('erDiagram')
+    ) return 'Mermaid';
+
+    if (/^(\$\s*)?(gradlew|adb|emulator|kotlin|ktlint|detekt|git|npm|node|python3|bash|sh)\b/m.test(content)) return 'SH';
+    if (/^\s*(package\s+[a-zA-Z0-9_.]+|import\s+[a-zA-Z0-9_.]+|data\s+class\s+\w+|sealed\s+(class|interface)\s+\w+|@Composable|class\s+\w+)/m.test(content)) return 'KT';
+    if (/^\s*(\{|\[\s*\{|"[^"]+"\s*:)/m.test(content)) return 'JSON';
+    if (/^\s*[a-zA-Z0-9_-]+\s*:\s*.+$/m.test(content) && !/;\s*$/m.test(content)) return 'YAML';
+    if (/^\s*SELECT\b|^\s*INSERT\b|^\s*UPDATE\b|^\s*DELETE\b|^\s*CREATE\s+TABLE\b/im.test(content)) return 'SQL';
+    if (/^\s*<[^>]+>/m.test(content)) return 'XML';
+
+    return 'TXT';
+}
+
+function copyCodeToClipboard(text) {
+    if (navigator.clipboard && navigator.clipboard.writeText) {
+        return navigator.clipboard.writeText(text);
+    }
+    return new Promise((resolve, reject) => {
+        try {
+            const ta = document.createElement('textarea');
+            ta.value = text;
+            ta.setAttribute('readonly', 'readonly');
+            ta.style.position = 'fixed';
+            ta.style.left = '-9999px';
+            document.body.appendChild(ta);
+            ta.select();
+            const ok = document.execCommand('copy');
+            document.body.removeChild(ta);
+            if (ok) resolve();
+            else reject(new Error('copy-failed'));
+        } catch (err) {
+            reject(err);
+        }
+    });
+}
+
+function enhanceCodeBlocks() {
+    enhanceCodeBlocksFrom(document.querySelectorAll('pre code'));
+}
+
+function enhanceCodeBlocksFrom(codes) {
+    Array.from(codes || []).forEach(code => {
+        const pre = code.closest('pre');
+        if (!pre || pre.classList.contains('mermaid')) return;
+        if (pre.dataset.codeEnhanced === '1') return;
+        pre.dataset.codeEnhanced = '1';
+        pre.classList.add('sma-code-enhanced');
+
+        const tools = document.createElement('div');
+        tools.className = 'sma-code-tools';
+
+        const lang = document.createElement('span');
+        lang.className = 'sma-code-lang';
+        lang.textContent = detectSnippetLang(code);
+
+        const copyBtn = document.createElement('button');
+        copyBtn.type = 'button';
+        copyBtn.className = 'sma-code-copy-btn';
+        copyBtn.textContent = 'Copiar';
+        copyBtn.setAttribute('aria-label', `Copiar snippet ${lang.textContent}`);
+        copyBtn.addEventListener('click', () => {
+            const originalText = copyBtn.textContent;
+            copyCodeToClipboard(code.textContent || '')
+                .then(() => {
+                    copyBtn.textContent = 'Copiado';
+                    setTimeout(() => { copyBtn.textContent = originalText; }, 1200);
+                })
+                .catch(() => {
+                    copyBtn.textContent = 'Error';
+                    setTimeout(() => { copyBtn.textContent = originalText; }, 1200);
+                });
+        });
+
+        tools.appendChild(lang);
+        tools.appendChild(copyBtn);
+        pre.appendChild(tools);
+    });
+}
+
+function highlightCodeBlock(block) {
+    if (!block) return;
+    if (block.dataset.highlighted === '1') {
+        enhanceCodeBlocksFrom([block]);
+        return;
+    }
+    if (typeof hljs === 'undefined') {
+        enhanceCodeBlocksFrom([block]);
+        return;
+    }
+    hljs.highlightElement(block);
+    block.dataset.highlighted = '1';
+    enhanceCodeBlocksFrom([block]);
+}
+
+async function initCodeHighlighting(root = document) {
+    const blocks = Array.from(root.querySelectorAll('pre code'));
+    if (!blocks.length) return;
+    enhanceCodeBlocksFrom(blocks.filter(block => block.dataset.highlighted === '1'));
+    // Highlight.js is only downloaded for languages the build could not highlight.
+    if (blocks.every(block => block.dataset.highlighted === '1')) return;
+
+    try {
+        await ensureHighlightLoaded();
+    } catch (error) {
+        console.warn('Highlight.js no cargado.', error);
+        enhanceCodeBlocksFrom(blocks);
+        return;
+    }
+
+    const warmup = blocks.slice(0, 16);
+    warmup.forEach(highlightCodeBlock);
+
+    if (!('IntersectionObserver' in window)) {
+        blocks.forEach(highlightCodeBlock);
+        return;
+    }
+
+    const codeObserver = new IntersectionObserver((entries, observerRef) => {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            highlightCodeBlock(entry.target);
+            observerRef.unobserve(entry.target);
+        });
+    }, { rootMargin: '360px 0px' });
+
+    blocks.forEach(block => {
+        if (block.dataset.highlighted === '1') return;
+        codeObserver.observe(block);
+    });
+}
+
+function cycleCodeTheme() {
+    const themes = ['monokai', 'github', 'github-dark', 'atom-one-dark'];
+    const current = localStorage.getItem('course-code-theme') || 'monokai';
+    const currentIndex = themes.indexOf(current);
+    const nextIndex = (currentIndex + 1) % themes.length;
+    const nextTheme = themes[nextIndex];
+    applyCodeTheme(nextTheme);
+}
+
+function applyTheme(theme) {
+    document.documentElement.setAttribute('data-theme', theme);
+    localStorage.setItem('course-theme', theme);
+    const btn = document.getElementById('theme-toggle');
+    btn.textContent = theme === 'dark' ? 'Tema: Oscuro' : 'Tema: Claro';
+    btn.title = theme === 'dark' ? 'Cambiar a tema claro' : 'Cambiar a tema oscuro';
+    // Keep code theme as selected, don't override
+}
+
+function toggleTheme() {
+    const current = document.documentElement.getAttribute('data-theme') || 'light';
+    applyTheme(current === 'dark' ? 'light' : 'dark');
+    renderMermaid();
+}
+
+// Apply saved preferences immediately
+applyStyle(getPreferredStyle());
+applyCodeTheme(getPreferredCodeTheme());
+applyTheme(getPreferredTheme());
+
+function currentMermaidTheme() {
+    const theme = document.documentElement.getAttribute('data-theme') || 'light';
+    return theme === 'dark' ? 'dark' : 'default';
+}
+
+async function renderMermaid(root = document) {
+    // Most diagrams are prerendered as SVG at build time; only load mermaid
+    // when some block still needs it.
+    const blocks = Array.from(root.querySelectorAll('pre.mermaid'));
+    if (!blocks.length) return;
+
+    try {
+        await ensureMermaidLoaded();
+    } catch (error) {
+        console.warn('Mermaid no cargado. Revisa conexión a internet/CDN.', error);
+        return;
+    }
+
+    blocks.forEach(function(el) {
+        if (!el.dataset.originalMermaid) {
+            el.dataset.originalMermaid = (el.textContent || '').trimEnd();
+        }
+        if (el.dataset.originalMermaid) {
+            el.innerHTML = '';
+            el.textContent = el.dataset.originalMermaid;
+        }
+        el.dataset.mermaidRendered = '0';
+        el.removeAttribute('data-processed');
+    });
+
+    mermaid.initialize({
+        startOnLoad: false,
+        theme: currentMermaidTheme(),
+        securityLevel: 'loose'
+    });
+
+    function renderNode(el) {
+        if (!el || el.dataset.mermaidRendered === '1') return;
+        mermaid.run({ nodes: [el] })
+            .then(function() {
+                el.dataset.mermaidRendered = '1';
+            })
+            .catch(function() {});
+    }
+
+    blocks.slice(0, 3).forEach(renderNode);
+
+    if (!('IntersectionObserver' in window)) {
+        blocks.forEach(renderNode);
+        return;
+    }
+
+    const mermaidObserver = new IntersectionObserver((entries, observerRef) => {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            renderNode(entry.target);
+            observerRef.unobserve(entry.target);
+        });
+    }, { rootMargin: '420px 0px' });
+
+    blocks.forEach(el => {
+        if (el.dataset.mermaidRendered === '1') return;
+        mermaidObserver.observe(el);
+    });
+}
+
+function bootCourseRenderers() {
+    renderMermaid();
+    initCodeHighlighting();
+    document.body.classList.add('sma-hydrated');
+}
+
+// Split builds insert each lesson when it is opened (see study-ux.js).
+document.addEventListener('sma:lesson-loaded', event => {
+    const section = event.detail && event.detail.section;
+    if (!section) return;
+    renderMermaid(section);
+    initCodeHighlighting(section);
+});
+
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', bootCourseRenderers, { once: true });
+} else {
+    bootCourseRenderers();
+}
+
+// Back to top button
+window.addEventListener('scroll', () => {
+    const btn = document.getElementById('back-to-top');
+    btn.style.display = window.scrollY > 400 ? 'block' : 'none';
+});
+
+// Active nav highlight
+const sections = document.querySelectorAll('section.lesson');
+const navLinks = document.querySelectorAll('#sidebar a');
+
+const observer = new IntersectionObserver(entries => {
+    entries.forEach(entry => {
+        if (entry.isIntersecting) {
+            navLinks.forEach(link => link.style.fontWeight = 'normal');
+            const active = document.querySelector(`#sidebar a[href="#${entry.target.id}"]`);
+            if (active) active.style.fontWeight = '700';
+        }
+    });
+}, { rootMargin: '-20% 0px -70% 0px' });
+
+sections.forEach(s => observer.observe(s));
+
+// Mobile sidebar toggle
+function toggleSidebar() {
+    if (window.innerWidth > 768) return;
+    document.body.classList.toggle('sidebar-open');
+}
+
+function closeSidebar() {
+    document.body.classList.remove('sidebar-open');
+}
+
+// Close sidebar when clicking a link on mobile
+document.querySelectorAll('#sidebar a').forEach(link => {
+    link.addEventListener('click', () => {
+        if (window.innerWidth <= 768) {
+            closeSidebar();
+        }
+    });
+});
+
+document.addEventListener('keydown', event => {
+    if (event.key === 'Escape') closeSidebar();
+});
+
+window.addEventListener('resize', () => {
+    if (window.innerWidth > 768) closeSidebar();
+});
+
+// Sidebar search/filter
+const sidebarSearchInput = document.getElementById('sidebar-search');
+const sidebarSearchCount = document.getElementById('sidebar-search-count');
+
+function normalizeSearchText(value) {
+    return (value || '')
+        .toLowerCase()
+        .normalize('NFD')
+        .replace(/[\u0300-\u036f]/g, '');
+}
+
+function applySidebarSearch() {
+    if (!sidebarSearchInput) return;
+    const query = normalizeSearchText(sidebarSearchInput.value.trim());
+    const sections = document.querySelectorAll('#sidebar li.nav-section');
+    let visibleLessons = 0;
+
+    sections.forEach(section => {
+        const sectionTitle = section.querySelector(':scope > strong');
+        const sectionLabel = normalizeSearchText(sectionTitle ? sectionTitle.textContent : '');
+        const links = section.querySelectorAll('a.doc-nav-link');
+        let sectionHasVisible = false;
+
+        links.forEach(link => {
+            const item = link.closest('li');
+            if (!item) return;
+            const lessonPath = normalizeSearchText(link.dataset.lessonPath || '');
+            const lessonTitle = normalizeSearchText(link.textContent || '');
+            const match = !query || lessonTitle.includes(query) || lessonPath.includes(query) || sectionLabel.includes(query);
+            item.style.display = match ? '' : 'none';
+            if (match) {
+                sectionHasVisible = true;
+                visibleLessons += 1;
+            }
+        });
+
+        section.style.display = sectionHasVisible ? '' : 'none';
+    });
+
+    if (sidebarSearchCount) {
+        if (!query) {
+            sidebarSearchCount.textContent = '';
+        } else if (visibleLessons === 1) {
+            sidebarSearchCount.textContent = '1 resultado';
+        } else {
+            sidebarSearchCount.textContent = `${visibleLessons} resultados`;
+        }
+    }
+
+    requestFullTextSearch(sidebarSearchInput.value);
+}
+
+// Full-text search: the index is built by build-html.py (dist/search) and
+// queried in assets/search-worker.js, so typing never blocks the main thread.
+const sidebarSearchResults = document.getElementById('sidebar-search-results');
+let searchWorker = null;
+let searchQueryId = 0;
+let searchDebounceTimer = null;
+
+function getSearchWorker() {
+    if (searchWorker !== null) return searchWorker || null;
+    searchWorker = false;
+    const workerSrc = window.__SMA_SEARCH_WORKER_SRC;
+    if (!workerSrc || !sidebarSearchInput || !sidebarSearchInput.dataset.searchIndex || typeof Worker === 'undefined') return null;
+    try {
+        searchWorker = new Worker(workerSrc);
+    } catch (error) {
+        console.warn('Busqueda de texto completo no disponible.', error);
+        return null;
+    }
+    searchWorker.addEventListener('message', event => renderFullTextResults(event.data || {}));
+    searchWorker.addEventListener('error', () => {
+        searchWorker = false;
+        hideFullTextResults();
+    });
+    return searchWorker;
+}
+
+function hideFullTextResults() {
+    if (sidebarSearchResults) sidebarSearchResults.hidden = true;
+}
+
+function requestFullTextSearch(rawQuery) {
+    clearTimeout(searchDebounceTimer);
+    searchQueryId += 1;
+    const query = (rawQuery || '').trim();
+    if (!sidebarSearchResults || normalizeSearchText(query).length < 2) {
+        hideFullTextResults();
+        return;
+    }
+    const id = searchQueryId;
+    searchDebounceTimer = setTimeout(() => {
+        const worker = getSearchWorker();
+        if (!worker) return;
+        worker.postMessage({
+            type: 'query',
+            id,
+            query: rawQuery,
+            limit: 20,
+            index: new URL(sidebarSearchInput.dataset.searchIndex, document.baseURI).href
+        });
+    }, 120);
+}
+
+function renderFullTextResults(data) {
+    if (data.id !== searchQueryId) return;
+    if (data.type !== 'results' || !data.hits.length) {
+        hideFullTextResults();
+        return;
+    }
+    const title = sidebarSearchResults.querySelector('.sidebar-search-results-title');
+    const list = sidebarSearchResults.querySelector('ol');
+    title.textContent = `En el contenido (${data.total})`;
+    list.replaceChildren(...data.hits.map(hit => {
+        const item = document.createElement('li');
+        const link = document.createElement('a');
+        link.className = 'sidebar-search-hit';
+        link.href = `#${hit.anchor}`;
+        link.title = hit.path;
+        const heading = document.createElement('span');
+        heading.className = 'sidebar-search-hit-heading';
+        heading.textContent = hit.heading;
+        const lesson = document.createElement('span');
+        lesson.className = 'sidebar-search-hit-lesson';
+        lesson.textContent = hit.anchor === hit.fileId ? hit.section : hit.lesson;
+        link.append(heading, lesson);
+        link.addEventListener('click', () => {
+            if (window.innerWidth <= 768) closeSidebar();
+        });
+        item.appendChild(link);
+        return item;
+    }));
+    sidebarSearchResults.hidden = false;
+}
+
+if (sidebarSearchInput) {
+    sidebarSearchInput.addEventListener('input', applySidebarSearch);
+    sidebarSearchInput.addEventListener('keydown', event => {
+        if (event.key === 'Escape') {
+            sidebarSearchInput.value = '';
+            applySidebarSearch();
+            sidebarSearchInput.blur();
+        }
+    });
+    applySidebarSearch();
+}
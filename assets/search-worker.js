@@ -0,0 +1,197 @@
+/*
+ * Busqueda de texto completo del curso, fuera del hilo principal.
+ *
+ * El indice lo genera scripts/build-html.py (scripts/course_search.py) en
+ * dist/search: manifest.json + un shard por bloque del curso. El worker los
+ * descarga en la primera consulta y responde a cada mensaje
+ *   { type: 'query', id, query, limit, index }
+ * con
+ *   { type: 'results', id, query, total, hits: [{ fileId, anchor, heading, lesson, path, section, score }] }
+ * o { type: 'error', id, message } si el indice no se puede cargar.
+ */
+'use strict';
+
+var MAX_PREFIX_EXPANSIONS = 64;
+var PREFIX_FACTOR = 0.6;
+var MAX_HITS_PER_LESSON = 3;
+
+var indexUrl = '';
+var indexPromise = null;
+
+function normalizeSearchText(value) {
+  return (value || '')
+    .toLowerCase()
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '');
+}
+
+function loadJson(url) {
+  return fetch(url).then(function (response) {
+    if (!response.ok) throw new Error('HTTP ' + response.status + ' ' + url);
+    return response.json();
+  });
+}
+
+function loadIndex() {
+  if (!indexPromise) {
+    indexPromise = loadJson(indexUrl).then(function (manifest) {
+      return Promise.all(manifest.shards.map(function (entry) {
+        return loadJson(new URL(entry.file, indexUrl).href);
+      })).then(function (shards) {
+        shards.forEach(function (shard) {
+          shard.terms = shard.terms ? shard.terms.split(' ') : [];
+        });
+        return {
+          docs: manifest.docs,
+          stopwords: new Set(manifest.stopwords || []),
+          minTermLength: manifest.minTermLength || 2,
+          shards: shards
+        };
+      });
+    });
+    indexPromise.catch(function () {
+      indexPromise = null;
+    });
+  }
+  return indexPromise;
+}
+
+// First index in the sorted terms array that is >= value.
+function lowerBound(terms, value) {
+  var low = 0;
+  var high = terms.length;
+  while (low < high) {
+    var mid = (low + high) >>> 1;
+    if (terms[mid] < value) low = mid + 1;
+    else high = mid;
+  }
+  return low;
+}
+
+function parseQuery(query, index) {
+  var normalized = normalizeSearchText(query);
+  var words = normalized.match(/[a-z0-9]+/g) || [];
+  // The word being typed matches as a prefix; the rest must match whole terms.
+  var typingLast = !/\s$/.test(query);
+  var tokens = [];
+  words.forEach(function (word, position) {
+    if (word.length < index.minTermLength) return;
+    var prefix = typingLast && position === words.length - 1;
+    if (!prefix && index.stopwords.has(word)) return;
+    tokens.push({ word: word, prefix: prefix });
+  });
+  return tokens;
+}
+
+// Every index term matched by token: [{ term, factor, postings: [[shard, postings]] }].
+function expandToken(token, index) {
+  var matches = new Map();
+  index.shards.forEach(function (shard) {
+    var terms = shard.terms;
+    var position = lowerBound(terms, token.word);
+    var expansions = 0;
+    while (position < terms.length && expansions < MAX_PREFIX_EXPANSIONS) {
+      var term = terms[position];
+      if (term !== token.word && !(token.prefix && term.startsWith(token.word))) break;
+      var match = matches.get(term);
+      if (!match) {
+        match = { term: term, factor: term === token.word ? 1 : PREFIX_FACTOR, postings: [] };
+        matches.set(term, match);
+      }
+      match.postings.push([shard, shard.postings[position]]);
+      position += 1;
+      expansions += 1;
+    }
+  });
+  return Array.from(matches.values());
+}
+
+// Map "shard:doc" -> score of the token in that section.
+function scoreToken(token, index, shardIds) {
+  var scores = new Map();
+  expandToken(token, index).forEach(function (match) {
+    var documentFrequency = 0;
+    match.postings.forEach(function (entry) {
+      documentFrequency += entry[1].length / 2;
+    });
+    var idf = Math.log(1 + index.docs / documentFrequency);
+    match.postings.forEach(function (entry) {
+      var shardId = shardIds.get(entry[0]);
+      var postings = entry[1];
+      var doc = 0;
+      for (var i = 0; i < postings.length; i += 2) {
+        doc += postings[i];
+        var key = shardId + ':' + doc;
+        var score = match.factor * idf * (1 + Math.log(postings[i + 1]));
+        scores.set(key, (scores.get(key) || 0) + score);
+      }
+    });
+  });
+  return scores;
+}
+
+function search(query, limit, index) {
+  var tokens = parseQuery(query, index);
+  if (!tokens.length) return { total: 0, hits: [] };
+
+  var shardIds = new Map();
+  index.shards.forEach(function (shard, shardId) {
+    shardIds.set(shard, shardId);
+  });
+
+  // Every token has to appear in the section; scores add up.
+  var combined = null;
+  tokens.forEach(function (token) {
+    var scores = scoreToken(token, index, shardIds);
+    if (combined === null) {
+      combined = scores;
+      return;
+    }
+    var next = new Map();
+    combined.forEach(function (score, key) {
+      var tokenScore = scores.get(key);
+      if (tokenScore !== undefined) next.set(key, score + tokenScore);
+    });
+    combined = next;
+  });
+
+  var ranked = Array.from(combined.entries()).sort(function (a, b) {
+    return b[1] - a[1];
+  });
+  var perLesson = new Map();
+  var hits = [];
+  for (var i = 0; i < ranked.length && hits.length < limit; i += 1) {
+    var parts = ranked[i][0].split(':');
+    var shard = index.shards[Number(parts[0])];
+    var doc = shard.docs[Number(parts[1])];
+    var lesson = shard.lessons[doc[0]];
+    var seen = perLesson.get(lesson[0]) || 0;
+    if (seen >= MAX_HITS_PER_LESSON) continue;
+    perLesson.set(lesson[0], seen + 1);
+    hits.push({
+      fileId: lesson[0],
+      anchor: doc[1] ? lesson[0] + '-' + doc[1] : lesson[0],
+      heading: doc[2],
+      lesson: lesson[1],
+      path: lesson[2],
+      section: shard.label,
+      score: Math.round(ranked[i][1] * 100) / 100
+    });
+  }
+  return { total: ranked.length, hits: hits };
+}
+
+self.addEventListener('message', function (event) {
+  var message = event.data || {};
+  if (message.type !== 'query') return;
+  if (message.index && message.index !== indexUrl) {
+    indexUrl = message.index;
+    indexPromise = null;
+  }
+  loadIndex().then(function (index) {
+    var result = search(message.query || '', message.limit || 20, index);
+    self.postMessage({ type: 'results', id: message.id, query: message.query, total: result.total, hits: result.hits });
+  }).catch(function (error) {
+    self.postMessage({ type: 'error', id: message.id, message: String(error && error.message || error) });
+  });
+});
@@ -47,6 +47,9 @@
     };
   });
 
+  const FRAGMENT_CACHE_SIZE = 12;
+  const fragmentCache = new Map();
+
   const navLinks = Array.from(document.querySelectorAll('a.doc-nav-link'));
   mapLinksToTopics(navLinks, topics);
   const navLinksByTopicId = indexNavLinksByTopicId(navLinks);
@@ -64,7 +67,7 @@
   if (!currentTopic) return;
 
   applyCompactMobileClass();
-  renderTopic(currentTopic.id, false);
+  renderTopic(currentTopic.id, false, innerAnchorId(currentTopic, location.hash));
   markUiHydrated();
   applyZen(localStorage.getItem(keyZen) === '1');
   updateCompletionUi();
@@ -93,7 +96,8 @@
   window.addEventListener('hashchange', function () {
     const next = resolveCurrentTopic(topics, location.hash, null);
     if (!next) return;
-    renderTopic(next.id, true);
+    const anchorId = innerAnchorId(next, location.hash);
+    renderTopic(next.id, !anchorId, anchorId);
   });
 
   window.addEventListener('resize', debounce(function () {
@@ -328,6 +332,17 @@
     if (fromHash) {
       const foundHash = topicList.find((t) => t.id === fromHash);
       if (foundHash) return foundHash;
+      const anchor = findInnerAnchor(fromHash);
+      if (anchor) {
+        const section = anchor.closest('section.lesson');
+        const foundAnchor = topicList.find((t) => t.section === section);
+        if (foundAnchor) return foundAnchor;
+      }
+      // Heading ids are "<topic id>-<slug>", also when the lesson is not loaded yet.
+      const byPrefix = topicList
+        .filter((t) => fromHash.startsWith(`${t.id}-`))
+        .sort((a, b) => b.id.length - a.id.length)[0];
+      if (byPrefix) return byPrefix;
     }
     if (stored) {
       const foundStored = topicList.find((t) => t.id === stored);
@@ -336,6 +351,88 @@
     return topicList[0] || null;
   }
 
+  // Element with this id inside a lesson (e.g. a heading from the full-text search).
+  function findInnerAnchor(id) {
+    let target = null;
+    try {
+      target = document.getElementById(decodeURIComponent(id));
+    } catch (_error) {
+      target = document.getElementById(id);
+    }
+    if (!target || target.matches('section.lesson')) return null;
+    return target.closest('section.lesson') ? target : null;
+  }
+
+  function innerAnchorId(topic, hash) {
+    const fromHash = (hash || '').replace('#', '');
+    return fromHash && fromHash !== topic.id ? fromHash : '';
+  }
+
+  // Split builds (build-html.py --split) leave every lesson as an empty
+  // section with data-fragment; its HTML is fetched when the topic is shown.
+  // Only the visible lesson keeps its DOM, and the last fetched fragments
+  // stay in an in-memory LRU so going back and forth does not refetch.
+  function fetchLessonFragment(url) {
+    let entry = fragmentCache.get(url);
+    if (entry) {
+      fragmentCache.delete(url);
+      fragmentCache.set(url, entry);
+      return entry;
+    }
+    entry = fetch(url).then(function (response) {
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      return response.text();
+    });
+    entry.catch(function () {
+      fragmentCache.delete(url);
+    });
+    fragmentCache.set(url, entry);
+    while (fragmentCache.size > FRAGMENT_CACHE_SIZE) {
+      fragmentCache.delete(fragmentCache.keys().next().value);
+    }
+    return entry;
+  }
+
+  // Promise that resolves once the topic's fragment is in the DOM, or null if there is nothing to load.
+  function loadLessonFragment(topic) {
+    const url = topic.section.dataset.fragment;
+    if (!url) return null;
+    topics.forEach((t) => {
+      if (t !== topic && t.section.dataset.fragmentLoaded === '1') {
+        t.section.replaceChildren();
+        delete t.section.dataset.fragmentLoaded;
+      }
+    });
+    if (topic.section.dataset.fragmentLoaded === '1') return null;
+    return fetchLessonFragment(url).then(function (fragmentHtml) {
+      if (currentTopic !== topic) return;
+      topic.section.innerHTML = fragmentHtml;
+      topic.section.dataset.fragmentLoaded = '1';
+      document.dispatchEvent(new CustomEvent('sma:lesson-loaded', { detail: { section: topic.section } }));
+    }).catch(function (error) {
+      const message = document.createElement('p');
+      message.className = 'lesson-fragment-error';
+      message.textContent = `No se pudo cargar la lección (${error.message}). Abre el curso desde localhost con open-course.command.`;
+      topic.section.replaceChildren(message);
+    });
+  }
+
+  function prefetchNeighbourTopics(topic) {
+    const index = topics.indexOf(topic);
+    const run = function () {
+      [topics[index - 1], topics[index + 1]].forEach((neighbour) => {
+        if (neighbour && neighbour.section.dataset.fragment) {
+          fetchLessonFragment(neighbour.section.dataset.fragment).catch(function () {});
+        }
+      });
+    };
+    if ('requestIdleCallback' in window) {
+      window.requestIdleCallback(run, { timeout: 1500 });
+    } else {
+      setTimeout(run, 200);
+    }
+  }
+
   function markUiHydrated() {
     document.body.classList.add('sma-hydrated');
   }
@@ -382,7 +479,7 @@
     nav.appendChild(nextBtn);
   }
 
-  function renderTopic(topicId, shouldRestoreScroll) {
+  function renderTopic(topicId, shouldRestoreScroll, anchorId) {
     const target = topics.find((t) => t.id === topicId);
     if (!target) return;
 
@@ -414,20 +511,37 @@
       history.replaceState(null, '', `#${currentTopic.id}`);
     }
 
-    ensureTopicNavigation(currentTopic);
     updateCompletionUi();
     updateReviewUi();
     updateProgressUi();
 
-    if (shouldRestoreScroll) {
-      restoreScrollForTopic(currentTopic.id);
+    const pending = loadLessonFragment(target);
+    if (pending) {
+      pending.then(function () {
+        if (currentTopic === target) showTopicContent(target, shouldRestoreScroll, anchorId);
+      });
+    } else {
+      showTopicContent(target, shouldRestoreScroll, anchorId);
+    }
+
+    startTopicTimer(currentTopic.id);
+  }
+
+  function showTopicContent(target, shouldRestoreScroll, anchorId) {
+    ensureTopicNavigation(target);
+
+    const anchor = anchorId ? findInnerAnchor(anchorId) : null;
+    if (anchor) {
+      anchor.scrollIntoView({ block: 'start' });
+    } else if (shouldRestoreScroll) {
+      restoreScrollForTopic(target.id);
     }
 
     if (typeof window.rerenderMermaidSafely === 'function') {
       window.rerenderMermaidSafely({ scope: target.section, visibleOnly: true });
     }
 
-    startTopicTimer(currentTopic.id);
+    if (target.section.dataset.fragment) prefetchNeighbourTopics(target);
   }
 
   function setupButtons() {
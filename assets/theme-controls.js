@@ -387,7 +387,7 @@
 
   function rehighlightAll() {
     if (!window.hljs) return;
-    document.querySelectorAll('pre code[data-highlighted]').forEach(function (block) {
+    document.querySelectorAll('pre code[data-highlighted]:not([data-sma-prehighlighted])').forEach(function (block) {
       block.removeAttribute('data-highlighted');
       window.hljs.highlightElement(block);
     });
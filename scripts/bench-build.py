@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+Benchmarks del generador HTML (scripts/build-html.py) sobre el corpus real.
+Solo stdlib Python 3. No escribe nada en dist/.
+
+  emit   Render + ensamblado del documento con el curso replicado x1..xN y con
+         una leccion unica cada vez mas larga. Tiempo y memoria pico por KB de
+         salida deben mantenerse constantes (crecimiento lineal).
+  write  Escritura en streaming (write_document) del curso replicado x1..xN a
+         un directorio temporal: la memoria pico no debe crecer con la escala.
+  inline inline_format sobre todos los textos reales del corpus (parrafos,
+         titulos, items y celdas) frente a la version previa de seis re.sub.
+  mermaid render_mermaid_block sobre todos los bloques mermaid del corpus, en
+         frio (sin modelos memoizados) y en caliente.
+  highlight highlight_code (course_highlight.py) sobre los bloques de codigo
+         con gramatica, en frio y en caliente.
+  search Extraccion de terminos (iter_search_sections) y codificacion de los
+         shards del indice de busqueda sobre el corpus, con su tamano.
+  links  Posicion (linea y columna) de cada link de una leccion sintetica cada
+         vez mas larga: LineIndex + bisect (course_markdown) frente a contar
+         los saltos de linea del prefijo en cada link, y resolucion de sus
+         anclas #... con el indice de ids de course_checks. Cada medida se
+         calienta y dura al menos MIN_SAMPLE_SECONDS; el exponente del ajuste
+         log-log sobre todas las escalas debe quedar cerca de 1.
+  checks La regla links de course_checks sobre el repo real: sin cache, con
+         la cache por archivo caliente y tras editar una leccion (solo esa se
+         vuelve a parsear y comprobar). Cada medida empieza sin arboles
+         parseados en memoria, como un proceso nuevo.
+  urls   course_urls.check_urls contra un servidor HTTP local que hace de
+         sitio externo (con latencia artificial, ETag y 304, sin HEAD en
+         algunas rutas): en frio, desde la cache y revalidando con TTL 0.
+         Cuenta peticiones y conexiones abiertas para ver la reutilizacion.
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import math
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import course_checks
+import course_markdown
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+BUILD_SCRIPT = SCRIPTS_DIR / "build-html.py"
+BENCHMARKS = ("emit", "write", "inline", "mermaid", "highlight", "search", "links", "checks", "urls")
+# URLs servidas por el sitio local de "urls" y latencia de cada respuesta.
+URLS_BENCH_COUNT = 200
+URLS_BENCH_LATENCY = 0.02
+# Por encima de esta relacion entre el coste unitario mayor y el menor, avisamos.
+LINEAR_TOLERANCE = 1.5
+# Exponente maximo de tiempo ~ n**k (ajuste log-log sobre todas las escalas) que aun
+# damos por lineal: n log n queda por debajo y un coste cuadratico da 2.
+LINEAR_MAX_EXPONENT = 1.3
+# Duracion minima de cada muestra de timed_per_call: por debajo domina el ruido.
+MIN_SAMPLE_SECONDS = 0.05
+
+
+def legacy_inline_format(text):
+    """inline_format anterior (seis re.sub encadenados), como referencia."""
+    text = re.sub(r"`([^`]+)`", lambda m: "<code>" + m.group(1).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;") + "</code>", text)
+    text = re.sub(r"\*\*\*(.+?)\*\*\*", r"<strong><em>\1</em></strong>", text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
+    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+    text = re.sub(
+        r"!\[([^\]]*)\]\(([^)]+)\)",
+        r'<img alt="\1" src="\2" loading="lazy" decoding="async">',
+        text,
+    )
+    return text
+
+
+LEGACY_LINK_RE = re.compile(r"!?\[([^\]]*)\]\(([^)]+)\)")
+# Secciones de la leccion sintetica de "links" por cada unidad de escala.
+LINKS_BENCH_SECTIONS = 250
+LINKS_BENCH_SECTION = """## Seccion {index}
+
+Parrafo con un [link relativo](../modulo/{index}.md) y una frase larga que
+sigue en la [segunda linea](otra-{index}.md#ancla-{index}) del mismo parrafo.
+
+- Item con imagen ![diagrama {index}](img/{index}.png) y vuelta a la [seccion](#bench-links-seccion-{index}).
+
+| Columna | Enlace |
+| --- | --- |
+| fila {index} | [tabla](tabla-{index}.md) |
+
+"""
+
+
+def legacy_link_lines(content):
+    """Linea de cada link contando los saltos del prefijo, como hacia check-links.py antes."""
+    return [content[: match.start()].count("\n") + 1 for match in LEGACY_LINK_RE.finditer(content)]
+
+
+def load_build_module():
+    module = sys.modules.get("build_html")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("build_html", BUILD_SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["build_html"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def read_corpus(build):
+    files_content = []
+    for rel_path in build.FILE_ORDER:
+        full_path = build.COURSE_ROOT / rel_path
+        if full_path.exists():
+            files_content.append((rel_path, full_path.read_text(encoding="utf-8")))
+    return files_content
+
+
+def best_of(repeat, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def timed_per_call(repeat, fn):
+    """Como best_of, pero con una llamada de calentamiento, el GC en pausa y
+    tantas llamadas por muestra como hagan falta para durar MIN_SAMPLE_SECONDS.
+    Devuelve el mejor tiempo por llamada."""
+    result = fn()
+    started = time.perf_counter()
+    fn()
+    once = time.perf_counter() - started
+    calls = max(1, math.ceil(MIN_SAMPLE_SECONDS / max(once, 1e-9)))
+    best = None
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            elapsed = (time.perf_counter() - started) / calls
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best, result
+
+
+def scaling_exponent(sizes, timings):
+    """Pendiente del ajuste por minimos cuadrados de log(tiempo) frente a log(tamano)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(elapsed) for elapsed in timings]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return 1.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def print_scaling(title, rows):
+    print(title)
+    print(f"  {'escala':>6} {'salida KB':>10} {'tiempo ms':>10} {'us/KB':>8} {'pico KB':>9} {'pico/salida':>12}")
+    for scale, out_bytes, elapsed, peak in rows:
+        out_kb = out_bytes / 1024
+        print(
+            f"  {'x' + str(scale):>6} {out_kb:>10.0f} {elapsed * 1000:>10.1f} "
+            f"{elapsed * 1e6 / out_kb:>8.1f} {peak / 1024:>9.0f} {peak / out_bytes:>12.2f}"
+        )
+    time_units = [elapsed / out_bytes for _scale, out_bytes, elapsed, _peak in rows]
+    peak_units = [peak / out_bytes for _scale, out_bytes, _elapsed, peak in rows]
+    time_ratio = max(time_units) / min(time_units)
+    peak_ratio = max(peak_units) / min(peak_units)
+    verdict = "lineal" if max(time_ratio, peak_ratio) <= LINEAR_TOLERANCE else "NO lineal"
+    print(f"  coste/KB max/min: tiempo {time_ratio:.2f}, memoria {peak_ratio:.2f} -> {verdict}")
+    print()
+
+
+def bench_asset_urls(build):
+    # URLs only: the benchmarks never publish assets.
+    return {name: f"assets/{name}" for name in build.PAGE_ASSETS + build.CORE_ASSETS}
+
+
+def bench_emit(build, corpus, scales, repeat):
+    def build_document(files_content):
+        documents = [build.parse_markdown(content, filepath) for filepath, content in files_content]
+        nav = build.build_nav(documents)
+        rendered_lessons = [(document.path, build.render_document_html(document)) for document in documents]
+        return "".join(build.iter_document_parts(rendered_lessons, nav, bench_asset_urls(build)))
+
+    rows = []
+    for scale in scales:
+        files_content = [
+            (f"bench-{copy}/{filepath}", content) for copy in range(scale) for filepath, content in corpus
+        ]
+        elapsed, document = best_of(repeat, lambda: build_document(files_content))
+        peak = peak_memory(lambda: build_document(files_content))
+        rows.append((scale, len(document.encode("utf-8")), elapsed, peak))
+    print_scaling(f"Documento completo ({len(corpus)} lecciones por copia)", rows)
+
+    rows = []
+    for scale in scales:
+        long_lesson = "\n".join(content for _filepath, content in corpus for _copy in range(scale))
+        render = lambda: build.md_to_html(long_lesson, "bench-long", "bench/long.md")
+        elapsed, lesson_html = best_of(repeat, render)
+        peak = peak_memory(render)
+        rows.append((scale, len(lesson_html.encode("utf-8")), elapsed, peak))
+    print_scaling("Leccion unica con todo el corpus concatenado", rows)
+
+
+def bench_write(build, corpus, scales):
+    print("Escritura en streaming (memoria pico independiente del tamano)")
+    print(f"  {'escala':>6} {'salida KB':>10} {'tiempo ms':>10} {'pico KB':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        target = Path(tmp_dir) / "curso.html"
+        for scale in scales:
+            files_content = [
+                (f"bench-{copy}/{filepath}", content) for copy in range(scale) for filepath, content in corpus
+            ]
+            nav = build.build_nav(build.parse_markdown(content, filepath) for filepath, content in files_content)
+
+            def write():
+                rendered_lessons = (
+                    (filepath, build.render_document_html(build.parse_markdown(content, filepath)))
+                    for filepath, content in files_content
+                )
+                build.write_document(
+                    build.iter_document_parts(rendered_lessons, nav, bench_asset_urls(build)),
+                    target,
+                    copies=(Path(tmp_dir) / "index.html",),
+                )
+
+            started = time.perf_counter()
+            write()
+            elapsed = time.perf_counter() - started
+            peak = peak_memory(write)
+            print(
+                f"  {'x' + str(scale):>6} {target.stat().st_size / 1024:>10.0f} "
+                f"{elapsed * 1000:>10.1f} {peak / 1024:>9.0f}"
+            )
+    print()
+
+
+def collect_inline_spans(build, corpus):
+    """Textos que md_to_html pasa a inline_format (sin contar la recursion interna)."""
+    spans = []
+    original = build.inline_format
+    depth = 0
+
+    def recording_inline_format(text):
+        nonlocal depth
+        if depth == 0:
+            spans.append(text)
+        depth += 1
+        try:
+            return original(text)
+        finally:
+            depth -= 1
+
+    build.inline_format = recording_inline_format
+    try:
+        for filepath, content in corpus:
+            build.md_to_html(content, filepath.replace("/", "-").replace(".md", ""), filepath)
+    finally:
+        build.inline_format = original
+    return spans
+
+
+def bench_inline(build, corpus, repeat):
+    spans = collect_inline_spans(build, corpus)
+    with_markup = sum(1 for span in spans if build.course_markdown.has_inline_markup(span))
+    print(f"inline_format sobre {len(spans)} textos del corpus ({with_markup} con marcas inline)")
+    print(f"  {'version':>10} {'total ms':>9} {'us/llamada':>11}")
+    timings = {}
+    for name, fn in (("anterior", legacy_inline_format), ("actual", build.inline_format)):
+        elapsed, _result = best_of(repeat, lambda: [fn(span) for span in spans])
+        timings[name] = elapsed
+        print(f"  {name:>10} {elapsed * 1000:>9.1f} {elapsed * 1e6 / len(spans):>11.2f}")
+    differing = sum(1 for span in spans if legacy_inline_format(span) != build.inline_format(span))
+    print(f"  aceleracion x{timings['anterior'] / timings['actual']:.1f}; salidas distintas: {differing}")
+    print()
+
+
+def bench_mermaid(build, corpus, repeat):
+    blocks = [
+        (node.code, filepath)
+        for filepath, content in corpus
+        for node in build.parse_markdown(content, filepath).children
+        if isinstance(node, build.MermaidBlock)
+    ]
+    unique = len({code for code, _filepath in blocks})
+
+    def render_cold():
+        build.load_mermaid.cache_clear()
+        build.render_layered_architecture_svg.cache_clear()
+        return [build.render_mermaid_block(code, filepath) for code, filepath in blocks]
+
+    print(f"render_mermaid_block sobre {len(blocks)} bloques del corpus ({unique} distintos)")
+    print(f"  {'modo':>10} {'total ms':>9} {'us/bloque':>10}")
+    for name, fn in (
+        ("frio", render_cold),
+        ("caliente", lambda: [build.render_mermaid_block(code, filepath) for code, filepath in blocks]),
+    ):
+        elapsed, _result = best_of(repeat, fn)
+        print(f"  {name:>10} {elapsed * 1000:>9.1f} {elapsed * 1e6 / len(blocks):>10.1f}")
+    print()
+
+
+def bench_highlight(build, corpus, repeat):
+    blocks = [
+        (node.code, node.lang)
+        for filepath, content in corpus
+        for node in build.parse_markdown(content, filepath).children
+        if isinstance(node, build.CodeBlock) and node.lang and build.course_highlight.grammar_for(node.lang)
+    ]
+    code_bytes = sum(len(code) for code, _lang in blocks)
+
+    def highlight_cold():
+        build.highlight_code.cache_clear()
+        return [build.highlight_code(code, lang) for code, lang in blocks]
+
+    print(f"highlight_code sobre {len(blocks)} bloques del corpus ({code_bytes // 1024} KB de codigo)")
+    print(f"  {'modo':>10} {'total ms':>9} {'us/bloque':>10}")
+    for name, fn in (
+        ("frio", highlight_cold),
+        ("caliente", lambda: [build.highlight_code(code, lang) for code, lang in blocks]),
+    ):
+        elapsed, _result = best_of(repeat, fn)
+        print(f"  {name:>10} {elapsed * 1000:>9.1f} {elapsed * 1e6 / len(blocks):>10.1f}")
+    print()
+
+
+def bench_search(build, corpus, repeat):
+    documents = [build.parse_markdown(content, filepath) for filepath, content in corpus]
+    groups = {}
+    for document in documents:
+        groups.setdefault(document.path.split("/")[0], []).append(document)
+
+    def extract():
+        return {key: [section for document in docs for section in build.iter_search_sections(document)] for key, docs in groups.items()}
+
+    def encode(sections_by_key):
+        return [
+            build.encode_shard(key, key, [(doc.file_id, doc.title or "", doc.path) for doc in groups[key]], sections)
+            for key, sections in sections_by_key.items()
+        ]
+
+    extract_time, sections_by_key = best_of(repeat, extract)
+    encode_time, shards = best_of(repeat, lambda: encode(sections_by_key))
+    payload = sum(len(build.json.dumps(shard, ensure_ascii=False, separators=(",", ":")).encode("utf-8")) for shard in shards)
+    corpus_bytes = sum(len(content.encode("utf-8")) for _filepath, content in corpus)
+    sections = sum(len(value) for value in sections_by_key.values())
+    print(f"indice de busqueda sobre {len(documents)} lecciones ({corpus_bytes // 1024} KB de markdown)")
+    print(f"  extraccion  {extract_time * 1000:>7.1f} ms  ({sections} secciones)")
+    print(f"  shards      {encode_time * 1000:>7.1f} ms  ({len(shards)} shards, {payload // 1024} KB)")
+    print()
+
+
+def bench_links(build, scales, repeat):
+    print(f"Posicion de links en una leccion sintetica ({LINKS_BENCH_SECTIONS} secciones por unidad de escala)")
+    print(
+        f"  {'escala':>6} {'KB':>6} {'links':>6} {'prefijo ms':>11} {'us/link':>8} {'indice ms':>10} {'us/link':>8} "
+        f"{'anclas ms':>10} {'us/ancla':>9}"
+    )
+    cases = []
+    broken_anchors = 0
+    mismatches = 0
+    for scale in scales:
+        content = "".join(
+            LINKS_BENCH_SECTION.format(index=index) for index in range(scale * LINKS_BENCH_SECTIONS)
+        )
+        document = build.parse_markdown(content, "bench/links.md")
+
+        def indexed(content=content, document=document):
+            index = build.course_markdown.LineIndex(content)
+            return list(build.course_markdown.iter_link_positions(document, index))
+
+        positions = indexed()
+
+        def resolve_anchors(document=document, positions=positions):
+            anchors = course_checks.build_anchor_index([(document.path, document)])[document.path]
+            return [
+                course_checks.fragment_exists(target[1:], anchors)
+                for _line, _column, _kind, target, _label in positions
+                if target.startswith("#")
+            ]
+
+        resolved = resolve_anchors()
+        broken_anchors += resolved.count(False)
+        legacy_time, legacy_lines = best_of(repeat, lambda: legacy_link_lines(content))
+        mismatches += sum(1 for line, position in zip(legacy_lines, positions) if line != position[0])
+        mismatches += abs(len(legacy_lines) - len(positions))
+        cases.append([scale, len(content), len(positions), len(resolved), legacy_time, indexed, resolve_anchors, None, None])
+
+    # Rounds over every scale, so drift on a busy machine hits all of them alike.
+    for _ in range(repeat):
+        for case in cases:
+            indexed_time, _positions = timed_per_call(1, case[5])
+            anchor_time, _resolved = timed_per_call(1, case[6])
+            case[7] = indexed_time if case[7] is None else min(case[7], indexed_time)
+            case[8] = anchor_time if case[8] is None else min(case[8], anchor_time)
+
+    for scale, content_len, links, anchors, legacy_time, _indexed, _resolve, indexed_time, anchor_time in cases:
+        print(
+            f"  {'x' + str(scale):>6} {content_len // 1024:>6} {links:>6} {legacy_time * 1000:>11.1f} "
+            f"{legacy_time * 1e6 / links:>8.2f} {indexed_time * 1000:>10.1f} {indexed_time * 1e6 / links:>8.2f} "
+            f"{anchor_time * 1000:>10.1f} {anchor_time * 1e6 / anchors:>9.2f}"
+        )
+    # Slope over every scale: a single noisy point cannot flip the verdict.
+    sizes = [case[2] for case in cases]
+    exponent = max(
+        scaling_exponent(sizes, [case[7] for case in cases]),
+        scaling_exponent(sizes, [case[8] for case in cases]),
+    )
+    verdict = "lineal" if exponent <= LINEAR_MAX_EXPONENT else "NO lineal"
+    print(
+        f"  tiempo ~ links^{exponent:.2f} -> {verdict}; lineas distintas: {mismatches}; "
+        f"anclas rotas: {broken_anchors}"
+    )
+    print()
+
+
+def bench_checks(repeat):
+    def run(use_cache):
+        course_markdown._DOCUMENT_CACHE.clear()
+        corpus = course_checks.CourseCorpus(use_cache=use_cache, jobs=1)
+        started = time.perf_counter()
+        course_checks.run_checks(["links"], corpus)
+        return time.perf_counter() - started, corpus
+
+    def forget(rel_path):
+        # Same effect on the cache as editing rel_path.
+        cache_file = course_checks.LINK_CACHE_FILE
+        data = json.loads(cache_file.read_text(encoding="utf-8"))
+        data["files"].pop(rel_path, None)
+        cache_file.write_text(json.dumps(data), encoding="utf-8")
+
+    saved_cache_file = course_checks.LINK_CACHE_FILE
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        course_checks.LINK_CACHE_FILE = Path(tmp_dir) / "links.json"
+        try:
+            no_cache = min(run(False)[0] for _ in range(repeat))
+            _elapsed, corpus = run(True)
+            warm = min(run(True)[0] for _ in range(repeat))
+            edited = []
+            for _ in range(repeat):
+                forget(course_checks.FILE_ORDER[len(course_checks.FILE_ORDER) // 2])
+                edited.append(run(True)[0])
+        finally:
+            course_checks.LINK_CACHE_FILE = saved_cache_file
+    print(f"regla links sobre {len(corpus.paths)} archivos .md ({len(corpus.entries)} rutas descubiertas)")
+    for name, elapsed in (("sin cache", no_cache), ("caliente", warm), ("1 editado", min(edited))):
+        print(f"  {name:<10} {elapsed * 1000:>7.1f} ms")
+    print()
+
+
+class StandInSiteHandler(BaseHTTPRequestHandler):
+    """Sitio "externo" de bench_urls: /page/N con ETag, /get-only/N sin HEAD y el resto 404."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, headers=(), body=b""):
+        time.sleep(URLS_BENCH_LATENCY)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        if self.path.startswith("/page/"):
+            etag = f'"{self.path}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.reply(304, [("ETag", etag)])
+            else:
+                self.reply(200, [("ETag", etag)], b"x" * 2048)
+        elif self.path.startswith("/get-only/"):
+            self.reply(405 if self.command == "HEAD" else 200, body=b"x" * 2048)
+        else:
+            self.reply(404)
+
+    do_GET = do_HEAD
+
+
+def bench_urls():
+    import course_urls
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSiteHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/page/{index}" for index in range(URLS_BENCH_COUNT)]
+    urls += [f"{base}/get-only/{index}" for index in range(10)] + [f"{base}/missing/{index}" for index in range(10)]
+    print(f"check_urls sobre {len(urls)} URLs de un sitio local ({URLS_BENCH_LATENCY * 1000:.0f} ms por respuesta)")
+    print(f"  {'pasada':<12} {'tiempo ms':>10} {'peticiones':>11} {'conexiones':>11} {'cache':>6} {'304':>5} {'rotas':>6}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file = Path(tmp_dir) / "urls.json"
+        for name, ttl in (("frio", course_urls.DEFAULT_TTL), ("cache", course_urls.DEFAULT_TTL), ("revalidar", 0)):
+            StandInSiteHandler.connections = 0
+            started = time.perf_counter()
+            results, stats = course_urls.check_urls(urls, cache_file=cache_file, ttl=ttl)
+            elapsed = time.perf_counter() - started
+            broken = sum(1 for entry in results.values() if not entry["ok"])
+            print(
+                f"  {name:<12} {elapsed * 1000:>10.1f} {stats['requests']:>11} {StandInSiteHandler.connections:>11} "
+                f"{stats['cached']:>6} {stats['revalidated']:>5} {broken:>6}"
+            )
+    server.shutdown()
+    server.server_close()
+    sequential = (len(urls) + 20) * URLS_BENCH_LATENCY
+    print(f"  una peticion detras de otra: ~{sequential * 1000:.0f} ms")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del generador HTML del curso.")
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        metavar="BENCH",
+        help=f"Benchmarks a ejecutar: {', '.join(BENCHMARKS)} (por defecto: todos).",
+    )
+    parser.add_argument("--max-scale", type=int, default=8, help="Mayor factor de replicacion del corpus (potencia de 2).")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medida; se toma la mejor.")
+    args = parser.parse_args()
+    unknown = sorted(set(args.benchmarks) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"benchmark desconocido: {', '.join(unknown)}")
+
+    build = load_build_module()
+    corpus = read_corpus(build)
+    scales = []
+    scale = 1
+    while scale <= args.max_scale:
+        scales.append(scale)
+        scale *= 2
+
+    selected = args.benchmarks or BENCHMARKS
+    if "emit" in selected:
+        bench_emit(build, corpus, scales, args.repeat)
+    if "write" in selected:
+        bench_write(build, corpus, scales)
+    if "inline" in selected:
+        bench_inline(build, corpus, args.repeat)
+    if "mermaid" in selected:
+        bench_mermaid(build, corpus, args.repeat)
+    if "highlight" in selected:
+        bench_highlight(build, corpus, args.repeat)
+    if "search" in selected:
+        bench_search(build, corpus, args.repeat)
+    if "links" in selected:
+        bench_links(build, scales, args.repeat)
+    if "checks" in selected:
+        bench_checks(args.repeat)
+    if "urls" in selected:
+        bench_urls()
+
+
+if __name__ == "__main__":
+    main()
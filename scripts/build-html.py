@@ -1,8 +1,19 @@
 #!/usr/bin/env python3
 """
-Convierte todos los .md del curso a un unico HTML autocontenido.
+Convierte los .md del curso (FILE_ORDER) en el sitio publicado en dist/:
+  - curso-stack-my-architecture-android.html (y su copia index.html): la
+    pagina con todas las lecciones, o solo el indice con --split;
+  - assets/: course-core.css y course-core.js con el hash del contenido en el
+    nombre y el resto de assets enlazados con ?v=<hash>;
+  - search/: manifest.json y un shard JSON por modulo para la busqueda;
+  - lessons/*.html: un fragmento por leccion, solo con --split;
+  - con --optimize, HTML/CSS/JS minificados y un .gz junto a cada artefacto;
+  - asset-manifest.json: URLs de los assets y hash/tamano de cada archivo.
 No requiere dependencias externas (solo Python 3 estandar).
-Mermaid.js y highlight.js se cargan desde CDN.
+El codigo se resalta en build (course_highlight.py); highlight.js solo se
+carga desde CDN si algun bloque quedo sin resaltar (lenguaje sin gramatica o
+sin lenguaje). Mermaid.js se carga desde CDN para los diagramas que no se
+prerenderizan.
 """
 
 import os
@@ -12,99 +23,104 @@ import shutil
 import html
 import time
 import hashlib
+import json
+import argparse
+import cProfile
+import functools
+import pstats
+import runpy
+import threading
+import traceback
+import webbrowser
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import course_highlight
+import course_live
+import course_markdown
+import course_mermaid
+import course_optimize
+import course_profile
+import course_search
+from course_markdown import (
+    CodeBlock,
+    Heading,
+    ListBlock,
+    MermaidBlock,
+    Paragraph,
+    Rule,
+    Table,
+    file_id_for,
+    heading_anchor,
+    inline_format,
+    load_document,
+    parse_markdown,
+)
+from course_highlight import highlight_code
+from course_mermaid import layout_flowchart, load_mermaid
+from course_optimize import format_size_report, gzip_bytes, minify_for, minify_html
+from course_order import FILE_ORDER
+from course_profile import format_profile_summary, stage
+from course_search import (
+    WEIGHT_CODE,
+    WEIGHT_DIAGRAM,
+    WEIGHT_HEADING,
+    WEIGHT_TITLE,
+    SearchSection,
+    encode_shard,
+    write_search_index,
+)
+
 COURSE_ROOT = Path(__file__).parent.parent
 OUTPUT_DIR = COURSE_ROOT / "dist"
 OUTPUT_FILE = OUTPUT_DIR / "curso-stack-my-architecture-android.html"
 OUTPUT_INDEX_FILE = OUTPUT_DIR / "index.html"
 ASSETS_SRC_DIR = COURSE_ROOT / "assets"
 ASSETS_DIST_DIR = OUTPUT_DIR / "assets"
+SEARCH_DIST_DIR = OUTPUT_DIR / "search"
+LESSONS_DIST_DIR = OUTPUT_DIR / "lessons"
+# assets/ files copied as-is and referenced as "assets/<name>?v=<content hash>".
+PAGE_ASSETS = (
+    "study-ux.js",
+    "study-ux.css",
+    "course-switcher.js",
+    "course-switcher.css",
+    "theme-controls.js",
+    "assistant-panel.js",
+    "assistant-panel.css",
+    "assistant-bridge.js",
+    "search-worker.js",
+)
+# Page CSS/JS published under a content-hashed name (see write_fingerprinted_asset).
+CORE_ASSETS = ("course-core.css", "course-core.js")
+ASSET_SYNC_MODES = ("copy", "hardlink", "reflink")
+# ioctl from linux/fs.h: share the source extents instead of copying data.
+FICLONE = 0x40049409
+ASSET_PLACEHOLDER_RE = re.compile(r"__ASSET\[([\w.-]+)\]__")
+ASSET_MANIFEST_FILE = OUTPUT_DIR / "asset-manifest.json"
+ASSET_MANIFEST_VERSION = 1
 VERCEL_CONFIG_SRC = COURSE_ROOT / "vercel.json"
-
-# Orden de los archivos (segun README)
-FILE_ORDER = [
-    "00-informe/INFORME-CURSO.md",
-    "00-informe/AUDITORIA-EQUIVALENCIA-IOS-ANDROID.md",
-    "00-informe/PLAN-REFUERZO-CURSO-ANDROID.md",
-    "00-informe/MEJORAS-POR-MODULO-Y-EVIDENCIAS.md",
-    "00-nivel-cero/00-introduccion.md",
-    "00-nivel-cero/00-setup.md",
-    "00-nivel-cero/01-que-es-software.md",
-    "00-nivel-cero/02-logica-basica.md",
-    "00-nivel-cero/03-primer-kotlin.md",
-    "00-nivel-cero/04-variables-y-tipos.md",
-    "00-nivel-cero/05-condicionales-y-bucles.md",
-    "00-nivel-cero/06-funciones.md",
-    "00-nivel-cero/07-errores-frecuentes.md",
-    "00-nivel-cero/08-android-studio-desde-cero.md",
-    "00-nivel-cero/09-primera-app-compose.md",
-    "00-nivel-cero/10-inputs-y-validacion.md",
-    "00-nivel-cero/11-navegacion-simple.md",
-    "00-nivel-cero/12-proyecto-rutina-diaria.md",
-    "00-nivel-cero/entregables-nivel-cero.md",
-    "01-junior/00-introduccion.md",
-    "01-junior/00-setup-junior.md",
-    "01-junior/01-arquitectura-android-recomendada.md",
-    "01-junior/02-feature-base-practica.md",
-    "01-junior/03-navegacion-moderna-navigation-compose.md",
-    "01-junior/04-hilt-integracion-inicial.md",
-    "01-junior/05-room-offline-first.md",
-    "01-junior/06-datastore-estado-ligero.md",
-    "01-junior/07-workmanager-tareas-persistentes.md",
-    "01-junior/08-compose-ui-testing.md",
-    "01-junior/09-pruebas-unitarias-viewmodel-repositorio.md",
-    "01-junior/entregables-nivel-junior.md",
-    "02-midlevel/00-introduccion.md",
-    "02-midlevel/01-red-robusta-retrofit-okhttp.md",
-    "02-midlevel/02-offline-first-sincronizacion.md",
-    "02-midlevel/03-consistencia-y-resolucion-de-conflictos.md",
-    "02-midlevel/04-observabilidad-y-diagnostico.md",
-    "02-midlevel/05-pruebas-de-integracion-offline-sync.md",
-    "02-midlevel/06-quality-gates-ci-offline-sync.md",
-    "02-midlevel/07-performance-ci-macrobenchmark-baselineprofiles.md",
-    "02-midlevel/08-observabilidad-produccion-metricas-alertas.md",
-    "02-midlevel/09-decisiones-evolutivas-con-metricas.md",
-    "02-midlevel/10-gobernanza-dependencias-entre-features.md",
-    "02-midlevel/11-versionado-contratos-internos.md",
-    "02-midlevel/12-evolucion-navegacion-y-deeplinks-compatibles.md",
-    "02-midlevel/entregables-nivel-midlevel.md",
-    "03-senior/00-introduccion.md",
-    "03-senior/01-release-strategy-y-rollback-seguro.md",
-    "03-senior/02-incident-response-y-runbooks-operativos.md",
-    "03-senior/03-slos-error-budgets-priorizacion-fiabilidad.md",
-    "03-senior/04-tablero-operativo-fiabilidad-y-alertas-accionables.md",
-    "03-senior/05-gobernanza-tecnica-de-sprint-fiabilidad-vs-roadmap.md",
-    "03-senior/06-simulacion-sprint-bajo-presion-roadmap-y-fiabilidad.md",
-    "03-senior/07-cierre-del-bloque-senior-y-transicion-a-maestria.md",
-    "04-maestria/00-introduccion.md",
-    "04-maestria/01-contratos-evolutivos-entre-dominios.md",
-    "04-maestria/02-bounded-contexts-y-ownership-tecnico.md",
-    "04-maestria/03-mapa-de-dependencias-y-acoplamiento-circular.md",
-    "04-maestria/04-migraciones-transversales-sin-bloqueo.md",
-    "04-maestria/05-coordinacion-release-rollback-y-comunicacion-tecnica.md",
-    "04-maestria/06-evolucion-multi-equipo-y-gobernanza-trimestral.md",
-    "04-maestria/07-defensa-tecnica-del-proyecto-android.md",
-    "04-maestria/08-cierre-proyecto-final-y-publicacion-play-store.md",
-    "04-maestria/09-rubrica-final-y-entrevista-tecnica-android.md",
-    "04-maestria/10-plan-de-90-dias-despues-del-curso.md",
-    "04-maestria/11-epilogo-profesional-y-siguientes-retos.md",
-    "04-maestria/12-casos-reales-y-antipatrones-de-equipos-android.md",
-    "04-maestria/13-operacion-largo-plazo-y-deuda-tecnica.md",
-    "04-maestria/14-primer-ano-en-equipo-android-real.md",
-    "04-maestria/15-mapa-de-carrera-android-de-junior-a-senior.md",
-    "04-maestria/16-cierre-definitivo-del-recorrido-android.md",
-    "05-proyecto-final/00-brief.md",
-    "05-proyecto-final/00-brief-ruralgo-fieldops.md",
-    "05-proyecto-final/01-rubrica-empleabilidad.md",
-    "05-proyecto-final/02-evidencias-obligatorias.md",
-    "05-proyecto-final/03-operacion-senior.md",
-    "05-proyecto-final/04-gobernanza-maestria.md",
-    "anexos/glosario.md",
-    "anexos/guia-publicacion-playstore-real.md",
-    "anexos/preguntas-entrevista-android.md",
-    "anexos/proyecto-final-android.md",
-]
+CACHE_DIR = OUTPUT_DIR / ".cache"
+RENDER_CACHE_DIR = CACHE_DIR / "render"
+HIGHLIGHT_CACHE_DIR = CACHE_DIR / "highlight"
+SEARCH_CACHE_DIR = CACHE_DIR / "search"
+OPTIMIZE_CACHE_DIR = CACHE_DIR / "optimize"
+# st_mtime_ns of each published file when its hash was last checked (see is_build_current).
+OUTPUT_STAT_FILE = CACHE_DIR / "output-mtimes.json"
+# Files that get a precompressed .gz sibling with --optimize.
+PRECOMPRESS_SUFFIXES = (".html", ".css", ".js", ".json", ".svg")
+HIGHLIGHT_CACHE_MAX_AGE = 30 * 24 * 3600
+PROFILE_DIR = CACHE_DIR / "profile"
+PROFILE_FILE = PROFILE_DIR / "build-profile.json"
+CPROFILE_FILE = PROFILE_DIR / "build.pstats"
+# Subir si cambia el formato de las entradas de cache.
+RENDER_CACHE_VERSION = "1"
+# Modulos cuyo codigo decide el HTML de una leccion: entran en renderer_stamp().
+RENDERER_MODULES = (course_markdown, course_mermaid, course_highlight)
+# Por debajo de este numero de lecciones pendientes, arrancar el pool cuesta mas que renderizar.
+PARALLEL_MIN_LESSONS = 8
+# --watch: seconds between mtime polls (and to let an editor finish saving).
+WATCH_INTERVAL = 0.25
 
 
 MERMAID_ARROW_LEGEND_KEYWORDS = (
@@ -136,58 +152,32 @@ MERMAID_ARROW_LEGEND_KEYWORDS = (
 )
 
 
-def mermaid_needs_arrow_legend(raw_code_content: str, file_path: str) -> bool:
-    source = f"{file_path}\n{raw_code_content}".lower()
-    relation_tokens = ("-->", "-.->", "==>", "--o", "<|--", "--|>", "..|>", "..>", "o--", "*--")
-    has_relations = any(token in raw_code_content for token in relation_tokens)
-    if not has_relations:
-        return False
+MERMAID_RELATION_TOKENS = ("-->", "-.->", "==>", "--o", "<|--", "--|>", "..|>", "..>", "o--", "*--")
+
+
+def mermaid_needs_arrow_legend(diagram, file_path: str) -> bool:
+    if diagram.kind == "other":
+        # Sin modelo (classDiagram, sequenceDiagram...): buscamos en el texto.
+        if not any(token in diagram.source for token in MERMAID_RELATION_TOKENS):
+            return False
+        source = f"{file_path}\n{diagram.source}".lower()
+    else:
+        if not any(token in edge.token for edge in diagram.edges for token in MERMAID_RELATION_TOKENS):
+            return False
+        terms = [file_path]
+        for node in diagram.nodes.values():
+            terms.append(node.id)
+            if node.label:
+                terms.append(node.label)
+        for subgraph in diagram.subgraphs.values():
+            terms.append(subgraph.id)
+            if subgraph.title:
+                terms.append(subgraph.title)
+        terms.extend(edge.label for edge in diagram.edges if edge.label)
+        source = "\n".join(terms).lower()
     return any(keyword in source for keyword in MERMAID_ARROW_LEGEND_KEYWORDS)
 
 
-def normalize_mermaid_source(raw_code_content: str) -> str:
-    normalized = raw_code_content
-    lines = [line.strip() for line in raw_code_content.splitlines() if line.strip()]
-    if not lines:
-        return normalized
-    is_flowchart = lines[0].startswith("flowchart") or lines[0].startswith("graph")
-    is_state_diagram = lines[0].startswith("stateDiagram")
-    if is_flowchart:
-        normalized = re.sub(r"\.\.\>\|", "-.->|", normalized)
-        normalized = re.sub(r"\.\.\>", "-.->", normalized)
-        normalized = normalized.replace("-.o", "-.->")
-    if is_state_diagram:
-        normalized = re.sub(r"-\.\->", "-->", normalized)
-    return normalized
-
-
-def _clean_mermaid_label(raw_label: str) -> str:
-    label = raw_label.strip()
-    if len(label) >= 2 and ((label[0] == '"' and label[-1] == '"') or (label[0] == "'" and label[-1] == "'")):
-        label = label[1:-1]
-    label = label.replace("<br/>", "\n").replace("<br>", "\n").replace("\\n", "\n")
-    label = re.sub(r"\s*\n\s*", "\n", label)
-    return label.strip()
-
-
-def _extract_mermaid_label(raw_code_content: str, node_id: str, default: str) -> str:
-    pattern = rf"^\s*{re.escape(node_id)}\s*\[(.+?)\]\s*$"
-    match = re.search(pattern, raw_code_content, flags=re.MULTILINE)
-    if not match:
-        return default
-    parsed = _clean_mermaid_label(match.group(1))
-    return parsed if parsed else default
-
-
-def _extract_mermaid_subgraph_title(raw_code_content: str, subgraph_id: str, default: str) -> str:
-    pattern = rf"subgraph\s+{re.escape(subgraph_id)}\s*\[(.+?)\]"
-    match = re.search(pattern, raw_code_content)
-    if not match:
-        return default
-    parsed = _clean_mermaid_label(match.group(1))
-    return parsed if parsed else default
-
-
 def _split_svg_lines(label: str, max_chars: int = 20) -> list[str]:
     lines = []
     for raw_line in label.split("\n"):
@@ -219,21 +209,25 @@ def _svg_text(x: float, y: float, label: str, css_class: str, max_chars: int = 2
     return f'<text x="{x}" y="{base_y}" class="{css_class}" text-anchor="middle">{"".join(tspans)}</text>'
 
 
-def is_layered_architecture_mermaid(raw_code_content: str) -> bool:
-    normalized = raw_code_content.lower()
-    required_tokens = (
-        "flowchart",
-        "subgraph core",
-        "subgraph app",
-        "subgraph ui",
-        "subgraph infra",
-        "vm --> uc",
-        "uc --> ent",
-        "uc ==> port",
-        "boot -.->",
-        "port --o",
+LAYERED_ARCHITECTURE_SUBGRAPHS = ("CORE", "APP", "UI", "INFRA")
+# (origen, destino o None para cualquiera, conector) que definen el diagrama por capas.
+LAYERED_ARCHITECTURE_EDGES = (
+    ("VM", "UC", "-->"),
+    ("UC", "ENT", "-->"),
+    ("UC", "PORT", "==>"),
+    ("BOOT", None, "-.->"),
+    ("PORT", None, "--o"),
+)
+
+
+def is_layered_architecture_mermaid(diagram) -> bool:
+    if diagram.kind != "flowchart":
+        return False
+    if not all(diagram.has_subgraph(subgraph_id) for subgraph_id in LAYERED_ARCHITECTURE_SUBGRAPHS):
+        return False
+    return all(
+        diagram.has_edge(source, target, token) for source, target, token in LAYERED_ARCHITECTURE_EDGES
     )
-    return all(token in normalized for token in required_tokens)
 
 
 def render_mermaid_arrow_legend() -> str:
@@ -262,16 +256,83 @@ def render_mermaid_arrow_legend() -> str:
     )
 
 
-ARROW_SEMANTIC_BLOCK_RE = re.compile(
-    r'(<p>[^<]*lectura[^<]*semantica[^<]*diagrama[^<]*:</p>\s*<(?:ol|ul)>\s*)(.*?)(\s*</(?:ol|ul)>)',
-    flags=re.IGNORECASE | re.DOTALL,
+# Render hooks: funciones registradas por tipo de nodo ("heading", "paragraph",
+# "list", "list_item", "code", "table", "rule") que se ejecutan mientras el
+# nodo se emite. Devuelven el HTML del nodo, o None para dejar paso al
+# siguiente hook y, al final, al render por defecto.
+RENDER_HOOKS = {}
+LOADED_RENDER_PLUGINS = set()
+
+
+class RenderContext:
+    """Lo que un hook ve alrededor del nodo: documento, hermano anterior y lista padre."""
+
+    __slots__ = ("document", "previous", "parent")
+
+    def __init__(self, document):
+        self.document = document
+        self.previous = None
+        self.parent = None
+
+
+def register_render_hook(node_type: str, lang=None):
+    """Decorador: registra hook(node, context) -> str | None para node_type.
+
+    Con node_type "code", lang limita el hook a los bloques de ese lenguaje
+    (sin distinguir mayusculas); esos hooks se prueban antes que los
+    genericos. Los hooks de "list_item" devuelven solo el elemento <li>; el
+    resto, el HTML completo del bloque.
+    """
+
+    def decorator(hook):
+        RENDER_HOOKS.setdefault((node_type, lang.lower() if lang else None), []).append(hook)
+        return hook
+
+    return decorator
+
+
+def run_render_hooks(node, context, lang=None):
+    """HTML del primer hook que acepta el nodo, o None si ninguno lo hace."""
+    if lang:
+        for hook in RENDER_HOOKS.get((node.kind, lang), ()):
+            rendered = hook(node, context)
+            if rendered is not None:
+                return rendered
+    for hook in RENDER_HOOKS.get((node.kind, None), ()):
+        rendered = hook(node, context)
+        if rendered is not None:
+            return rendered
+    return None
+
+
+def load_render_plugins(plugin_paths=()) -> None:
+    """Ejecuta cada plugin .py una vez por proceso.
+
+    El plugin recibe register_render_hook e inline_format en sus globals y
+    registra sus hooks al ejecutarse. Tambien es el initializer del pool de
+    render, para que los procesos hijos vean los mismos hooks.
+    """
+    for plugin_path in plugin_paths:
+        resolved = str(Path(plugin_path).resolve())
+        if resolved in LOADED_RENDER_PLUGINS:
+            continue
+        LOADED_RENDER_PLUGINS.add(resolved)
+        runpy.run_path(
+            resolved,
+            init_globals={"register_render_hook": register_render_hook, "inline_format": inline_format},
+        )
+
+
+ARROW_SEMANTIC_INTRO_RE = re.compile(
+    r"^[^<]*lectura[^<]*semantica[^<]*diagrama[^<]*:$",
+    flags=re.IGNORECASE,
 )
 ARROW_SEMANTIC_ITEM_RE = re.compile(
-    r"<li>\s*(?:<code>[^<]*</code>\s*)?(.*?)\s*</li>",
+    r"^\s*(?:<code>[^<]*</code>\s*)?(.*?)\s*$",
     flags=re.IGNORECASE | re.DOTALL,
 )
 ARROW_CODE_LIST_ITEM_RE = re.compile(
-    r"<li>\s*<code>\s*(--&gt;|-->|-\.\-&gt;|-.->|==&gt;|==>|--o)\s*</code>\s*(.*?)\s*</li>",
+    r"^\s*<code>\s*(--&gt;|-->|-\.\-&gt;|-.->|==&gt;|==>|--o)\s*</code>\s*(.*?)\s*$",
     flags=re.IGNORECASE | re.DOTALL,
 )
 ARROW_SEMANTIC_FALLBACK_VARIANTS = (
@@ -321,58 +382,75 @@ def _render_semantic_arrow_icon(variant: str) -> str:
     )
 
 
-def enhance_semantic_arrow_lists(html_fragment: str) -> str:
-    def replace_block(match: re.Match) -> str:
-        item_markup = []
-        for index, raw_item in enumerate(ARROW_SEMANTIC_ITEM_RE.findall(match.group(2))):
-            item_text = (raw_item or "").strip()
-            if not item_text:
-                continue
-            variant = _arrow_variant_for_semantic_text(item_text, index)
-            icon = _render_semantic_arrow_icon(variant)
-            item_markup.append(
-                f'  <li class="sma-semantic-arrow-item">{icon}<span>{item_text}</span></li>'
-            )
-        if not item_markup:
-            return match.group(0)
-        return f'{match.group(1)}\n' + "\n".join(item_markup) + f'\n{match.group(3)}'
-
-    return ARROW_SEMANTIC_BLOCK_RE.sub(replace_block, html_fragment)
-
-
-def enhance_arrow_code_list_items(html_fragment: str) -> str:
-    def replace_item(match: re.Match) -> str:
-        token = (match.group(1) or "").strip().lower()
-        text = (match.group(2) or "").strip()
-        if not text:
-            return match.group(0)
-        variant = ARROW_CODE_TOKEN_VARIANT.get(token)
-        if not variant:
-            return match.group(0)
+@register_render_hook("list")
+def render_semantic_arrow_list(node, context):
+    """Lista que sigue a 'Lectura semantica del diagrama:' -> cada item con su icono de flecha."""
+    previous = context.previous
+    if type(previous) is not Paragraph or "lectura" not in previous.text.lower():
+        return None
+    with stage("arrows"):
+        return _render_semantic_arrow_items(node, previous)
+
+
+def _render_semantic_arrow_items(node, previous):
+    if not ARROW_SEMANTIC_INTRO_RE.match(inline_format(previous.text)):
+        return None
+    item_markup = []
+    for index, item in enumerate(node.items):
+        item_text = ARROW_SEMANTIC_ITEM_RE.match(render_list_item_content(node, item)).group(1)
+        if not item_text:
+            continue
+        variant = _arrow_variant_for_semantic_text(item_text, index)
         icon = _render_semantic_arrow_icon(variant)
-        return f'<li class="sma-semantic-arrow-item">{icon}<span>{text}</span></li>'
+        item_markup.append(f'  <li class="sma-semantic-arrow-item">{icon}<span>{item_text}</span></li>\n')
+    if not item_markup:
+        return None
+    tag = "ol" if node.ordered else "ul"
+    return f"<{tag}>\n{''.join(item_markup)}</{tag}>\n"
+
 
-    return ARROW_CODE_LIST_ITEM_RE.sub(replace_item, html_fragment)
+@register_render_hook("list_item")
+def render_arrow_code_list_item(node, context):
+    """Item que empieza por una flecha en codigo (`-->` ...) -> icono de flecha + texto."""
+    raw_text = node.text.lstrip()
+    if not raw_text.startswith("`") and not raw_text.startswith("<code>"):
+        return None
+    with stage("arrows"):
+        return _render_arrow_code_item(node, context)
 
 
-def render_layered_architecture_svg(raw_code_content: str) -> str:
+def _render_arrow_code_item(node, context):
+    match = ARROW_CODE_LIST_ITEM_RE.match(render_list_item_content(context.parent, node))
+    if not match:
+        return None
+    token = (match.group(1) or "").strip().lower()
+    text = (match.group(2) or "").strip()
+    variant = ARROW_CODE_TOKEN_VARIANT.get(token)
+    if not text or not variant:
+        return None
+    icon = _render_semantic_arrow_icon(variant)
+    return f'<li class="sma-semantic-arrow-item">{icon}<span>{text}</span></li>'
+
+
+@functools.lru_cache(maxsize=128)
+def render_layered_architecture_svg(diagram) -> str:
     titles = {
-        "CORE": _extract_mermaid_subgraph_title(raw_code_content, "CORE", "Core / Domain"),
-        "APP": _extract_mermaid_subgraph_title(raw_code_content, "APP", "Application"),
-        "UI": _extract_mermaid_subgraph_title(raw_code_content, "UI", "Interface"),
-        "INFRA": _extract_mermaid_subgraph_title(raw_code_content, "INFRA", "Infrastructure"),
+        "CORE": diagram.subgraph_title("CORE", "Core / Domain"),
+        "APP": diagram.subgraph_title("APP", "Application"),
+        "UI": diagram.subgraph_title("UI", "Interface"),
+        "INFRA": diagram.subgraph_title("INFRA", "Infrastructure"),
     }
 
     labels = {
-        "VM": _extract_mermaid_label(raw_code_content, "VM", "ViewModel"),
-        "VIEW": _extract_mermaid_label(raw_code_content, "VIEW", "View"),
-        "ENT": _extract_mermaid_label(raw_code_content, "ENT", "Entity"),
-        "POL": _extract_mermaid_label(raw_code_content, "POL", "Policy"),
-        "BOOT": _extract_mermaid_label(raw_code_content, "BOOT", "Composition Root"),
-        "UC": _extract_mermaid_label(raw_code_content, "UC", "UseCase"),
-        "PORT": _extract_mermaid_label(raw_code_content, "PORT", "FeaturePort"),
-        "API": _extract_mermaid_label(raw_code_content, "API", "API Client"),
-        "STORE": _extract_mermaid_label(raw_code_content, "STORE", "Persistence Adapter"),
+        "VM": diagram.node_label("VM", "ViewModel"),
+        "VIEW": diagram.node_label("VIEW", "View"),
+        "ENT": diagram.node_label("ENT", "Entity"),
+        "POL": diagram.node_label("POL", "Policy"),
+        "BOOT": diagram.node_label("BOOT", "Composition Root"),
+        "UC": diagram.node_label("UC", "UseCase"),
+        "PORT": diagram.node_label("PORT", "FeaturePort"),
+        "API": diagram.node_label("API", "API Client"),
+        "STORE": diagram.node_label("STORE", "Persistence Adapter"),
     }
 
     layer_boxes = {
@@ -407,7 +485,7 @@ def render_layered_architecture_svg(raw_code_content: str) -> str:
         )
         layer_markup.append(_svg_text(x + width / 2, y + 26, titles[layer_id], "sma-arch-layer-label", max_chars=28))
 
-    marker_seed = hashlib.md5(raw_code_content.encode("utf-8")).hexdigest()[:10]
+    marker_seed = hashlib.md5(diagram.source.encode("utf-8")).hexdigest()[:10]
     marker_direct = f"sma-head-direct-{marker_seed}"
     marker_wiring = f"sma-head-wiring-{marker_seed}"
     marker_contract = f"sma-head-contract-{marker_seed}"
@@ -447,294 +525,752 @@ def render_layered_architecture_svg(raw_code_content: str) -> str:
     )
 
 
-def render_mermaid_block(raw_code_content: str, file_path: str) -> str:
-    normalized_code_content = normalize_mermaid_source(raw_code_content)
-    if is_layered_architecture_mermaid(normalized_code_content):
-        return render_layered_architecture_svg(normalized_code_content)
-    escaped_mermaid_code = html.escape(normalized_code_content)
-    legend_html = ""
-    if mermaid_needs_arrow_legend(normalized_code_content, file_path):
-        legend_html = render_mermaid_arrow_legend()
-    return f'<div class="sma-mermaid-block">\n{legend_html}<pre class="mermaid">{escaped_mermaid_code}</pre>\n</div>\n'
+# Flowcharts que se dibujan en build como SVG estatico (render_flowchart_svg):
+# conectores y formas que sabemos pintar, subgraphs de un nivel y directivas
+# style/linkStyle. Cualquier otra cosa se queda en <pre class="mermaid">.
+FLOWCHART_EDGE_VARIANTS = {"-->": "direct", "-.->": "wiring", "==>": "contract", "--o": "open", "---": "plain"}
+FLOWCHART_NODE_SHAPES = (None, "rect", "round", "stadium", "subroutine", "cylinder", "rhombus", "circle")
+FLOWCHART_DIRECTIONS = ("TD", "TB", "BT", "LR", "RL")
+FLOWCHART_STYLE_PROPERTIES = ("fill", "stroke", "stroke-width", "stroke-dasharray", "color")
+FLOWCHART_STYLE_VALUE_RE = re.compile(r"^[#\w.%(), -]+$")
+FLOWCHART_LABEL_CHARS = 22
+FLOWCHART_EDGE_LABEL_CHARS = 18
 
 
-def md_to_html(md_text, file_id, file_path):
-    """Convierte markdown a HTML basico con soporte para Mermaid."""
-    html = ""
-    lines = md_text.split("\n")
-    i = 0
-    in_code = False
-    list_tag = ""
-    in_table = False
-    code_lang = ""
-    code_buffer = []
-    table_buffer = []
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Code blocks
-        if line.strip().startswith("```") and not in_code:
-            if list_tag:
-                html += f"</{list_tag}>\n"
-                list_tag = ""
-            code_lang = line.strip()[3:].strip()
-            in_code = True
-            code_buffer = []
-            i += 1
-            continue
-
-        if line.strip().startswith("```") and in_code:
-            raw_code_content = "\n".join(code_buffer)
-            if code_lang.lower() == "mermaid":
-                html += render_mermaid_block(raw_code_content, file_path)
-            else:
-                code_content = (
-                    raw_code_content.replace("&", "&amp;")
-                    .replace("<", "&lt;")
-                    .replace(">", "&gt;")
+def is_static_flowchart(diagram) -> bool:
+    if diagram.kind != "flowchart" or not diagram.nodes or diagram.skipped:
+        return False
+    if (diagram.direction or "TD").upper() not in FLOWCHART_DIRECTIONS:
+        return False
+    if any(subgraph.parent is not None for subgraph in diagram.subgraphs.values()):
+        return False
+    if any(node.shape not in FLOWCHART_NODE_SHAPES for node in diagram.nodes.values()):
+        return False
+    for edge in diagram.edges:
+        if edge.token not in FLOWCHART_EDGE_VARIANTS or edge.source == edge.target:
+            return False
+        if edge.source not in diagram.nodes or edge.target not in diagram.nodes:
+            return False
+    return all(keyword in ("style", "linkStyle") for keyword, _args in diagram.directives)
+
+
+def _flowchart_styles(diagram):
+    """style/linkStyle -> ({id: {propiedad: valor}}, {indice de arista o 'default': {...}})."""
+    element_styles = {}
+    edge_styles = {}
+    for keyword, args in diagram.directives:
+        target, _space, declarations = args.partition(" ")
+        properties = {}
+        for declaration in declarations.split(","):
+            name, _colon, value = declaration.partition(":")
+            name = name.strip()
+            value = value.strip()
+            if name in FLOWCHART_STYLE_PROPERTIES and value and FLOWCHART_STYLE_VALUE_RE.match(value):
+                properties[name] = value
+        if keyword == "style":
+            element_styles.setdefault(target, {}).update(properties)
+        else:
+            for index in target.split(","):
+                edge_styles.setdefault(index if index == "default" else int(index) if index.isdigit() else None, {}).update(
+                    properties
                 )
-                if code_lang:
-                    html += f'<pre><code class="language-{code_lang}">{code_content}</code></pre>\n'
-                else:
-                    html += f"<pre><code>{code_content}</code></pre>\n"
-            in_code = False
-            code_lang = ""
-            i += 1
-            continue
+    return element_styles, edge_styles
 
-        if in_code:
-            code_buffer.append(line)
-            i += 1
-            continue
 
-        # Tables
-        if "|" in line and line.strip().startswith("|"):
-            if not in_table:
-                if list_tag:
-                    html += f"</{list_tag}>\n"
-                    list_tag = ""
-                in_table = True
-                table_buffer = []
-            table_buffer.append(line)
-            i += 1
-            continue
-        elif in_table:
-            html += render_table(table_buffer)
-            in_table = False
-            table_buffer = []
-            # Don't increment, process current line
-
-        # Headers
-        header_match = re.match(r"^(#{1,6})\s+(.+)$", line)
-        if header_match:
-            if list_tag:
-                html += f"</{list_tag}>\n"
-                list_tag = ""
-            level = len(header_match.group(1))
-            text = inline_format(header_match.group(2))
-            anchor = re.sub(r"[^a-z0-9]+", "-", text.lower().strip())
-            anchor = f"{file_id}-{anchor}"
-            html += f'<h{level} id="{anchor}">{text}</h{level}>\n'
-            i += 1
-            continue
+def _svg_style_attribute(properties, skip=()) -> str:
+    declarations = ";".join(f"{name}:{value}" for name, value in properties.items() if name not in skip)
+    return f' style="{html.escape(declarations)}"' if declarations else ""
 
-        # Horizontal rule
-        if re.match(r"^---+\s*$", line):
-            if list_tag:
-                html += f"</{list_tag}>\n"
-                list_tag = ""
-            html += "<hr>\n"
-            i += 1
-            continue
 
-        # List items
-        if re.match(r"^\s*[-*]\s+", line):
-            if list_tag == "ol":
-                html += "</ol>\n"
-                list_tag = ""
-            if not list_tag:
-                html += "<ul>\n"
-                list_tag = "ul"
-            content = re.sub(r"^\s*[-*]\s+", "", line)
-            # Handle checkbox
-            content = content.replace("[ ]", "&#9744;").replace("[x]", "&#9745;")
-            html += f"  <li>{inline_format(content)}</li>\n"
-            i += 1
-            continue
+def _svg_number(value: float) -> str:
+    return f"{round(value, 1):g}"
 
-        # Numbered list
-        if re.match(r"^\s*\d+[.)]\s+", line):
-            if list_tag == "ul":
-                html += "</ul>\n"
-                list_tag = ""
-            if not list_tag:
-                html += "<ol>\n"
-                list_tag = "ol"
-            content = re.sub(r"^\s*\d+[.)]\s+", "", line)
-            html += f"  <li>{inline_format(content)}</li>\n"
-            i += 1
-            continue
 
-        # Close list if we hit non-list content
-        if list_tag and line.strip():
-            html += f"</{list_tag}>\n"
-            list_tag = ""
+def _flowchart_node_size(node) -> tuple:
+    lines = _split_svg_lines(node.label or node.id, max_chars=FLOWCHART_LABEL_CHARS)
+    width = max(120.0, max(len(line) for line in lines) * 8.6 + 32)
+    height = max(48.0, len(lines) * 20 + 26)
+    if node.shape == "rhombus":
+        return width * 1.4, height * 1.6
+    if node.shape == "circle":
+        side = max(width, height)
+        return side, side
+    if node.shape == "cylinder":
+        return width, height + 16
+    return width, height
 
-        # Empty lines
-        if not line.strip():
-            i += 1
-            continue
 
-        # Remove legacy inline next-topic hints to avoid duplicated navigation UI
-        if re.match(r"^\s*siguiente:\s+", line, flags=re.IGNORECASE):
-            i += 1
+def _flowchart_edge_label_size(label: str) -> tuple:
+    lines = _split_svg_lines(label, max_chars=FLOWCHART_EDGE_LABEL_CHARS)
+    return max(len(line) for line in lines) * 7.2 + 14, len(lines) * 17 + 8
+
+
+def _flowchart_node_shape(node, x, y, width, height, style_attribute) -> str:
+    css_class = "sma-flow-node"
+    if node.shape == "rhombus":
+        points = f"{_svg_number(x + width / 2)},{_svg_number(y)} {_svg_number(x + width)},{_svg_number(y + height / 2)} " \
+            f"{_svg_number(x + width / 2)},{_svg_number(y + height)} {_svg_number(x)},{_svg_number(y + height / 2)}"
+        return f'<polygon points="{points}" class="{css_class}"{style_attribute}></polygon>'
+    if node.shape == "circle":
+        return (
+            f'<circle cx="{_svg_number(x + width / 2)}" cy="{_svg_number(y + height / 2)}" '
+            f'r="{_svg_number(width / 2)}" class="{css_class}"{style_attribute}></circle>'
+        )
+    if node.shape == "cylinder":
+        rx = width / 2
+        left, right, top, bottom = _svg_number(x), _svg_number(x + width), y + 8, y + height - 8
+        path = (
+            f"M{left} {_svg_number(top)} A{_svg_number(rx)} 8 0 0 1 {right} {_svg_number(top)} "
+            f"L{right} {_svg_number(bottom)} A{_svg_number(rx)} 8 0 0 1 {left} {_svg_number(bottom)} Z "
+            f"M{left} {_svg_number(top)} A{_svg_number(rx)} 8 0 0 0 {right} {_svg_number(top)}"
+        )
+        return f'<path d="{path}" class="{css_class}"{style_attribute}></path>'
+    radius = 8
+    if node.shape == "round":
+        radius = 16
+    elif node.shape == "stadium":
+        radius = height / 2
+    shape = (
+        f'<rect x="{_svg_number(x)}" y="{_svg_number(y)}" width="{_svg_number(width)}" height="{_svg_number(height)}" '
+        f'rx="{_svg_number(radius)}" class="{css_class}"{style_attribute}></rect>'
+    )
+    if node.shape == "subroutine":
+        shape += (
+            f'<path d="M{_svg_number(x + 8)} {_svg_number(y)} V{_svg_number(y + height)} '
+            f'M{_svg_number(x + width - 8)} {_svg_number(y)} V{_svg_number(y + height)}" class="sma-flow-node-inner"></path>'
+        )
+    return shape
+
+
+def _flowchart_aria_label(diagram) -> str:
+    relations = []
+    for edge in diagram.edges:
+        source = diagram.node_label(edge.source, edge.source).replace("\n", " ")
+        target = diagram.node_label(edge.target, edge.target).replace("\n", " ")
+        relation = f"{source} hacia {target}"
+        if edge.label:
+            relation += f" ({edge.label})"
+        relations.append(relation)
+    if not relations:
+        return "Diagrama de flujo"
+    return "Diagrama de flujo: " + "; ".join(relations)
+
+
+@functools.lru_cache(maxsize=256)
+def render_flowchart_svg(diagram) -> str:
+    """SVG estatico de un flowchart (ver is_static_flowchart) con layout por capas.
+
+    Colores y tipografia salen de las variables --mermaid-* del tema, asi que
+    el diagrama sigue al tema sin volver a renderizarse en el navegador.
+    """
+    node_sizes = {node_id: _flowchart_node_size(node) for node_id, node in diagram.nodes.items()}
+    label_sizes = {index: _flowchart_edge_label_size(edge.label) for index, edge in enumerate(diagram.edges) if edge.label}
+    layout = layout_flowchart(diagram, node_sizes, label_sizes.values())
+    element_styles, edge_styles = _flowchart_styles(diagram)
+    marker_seed = hashlib.md5(diagram.source.encode("utf-8")).hexdigest()[:10]
+
+    cluster_markup = []
+    for subgraph_id, (x, y, width, height) in layout.clusters.items():
+        properties = element_styles.get(subgraph_id, {})
+        cluster_markup.append(
+            f'<rect x="{_svg_number(x)}" y="{_svg_number(y)}" width="{_svg_number(width)}" height="{_svg_number(height)}" '
+            f'rx="14" class="sma-flow-cluster"{_svg_style_attribute(properties, skip=("color",))}></rect>'
+        )
+        title = diagram.subgraph_title(subgraph_id, subgraph_id)
+        title_markup = _svg_text(round(x + width / 2, 1), round(y + 24, 1), title, "sma-flow-cluster-label", max_chars=40)
+        if "color" in properties:
+            title_markup = title_markup.replace("<text ", f'<text style="fill:{html.escape(properties["color"])}" ', 1)
+        cluster_markup.append(title_markup)
+
+    edge_markup = []
+    label_markup = []
+    used_variants = []
+    for index, (edge, (start, control_1, control_2, end)) in enumerate(layout.edges):
+        variant = FLOWCHART_EDGE_VARIANTS[edge.token]
+        if variant not in used_variants:
+            used_variants.append(variant)
+        path = "M{} {} C{} {} {} {} {} {}".format(
+            *(_svg_number(value) for point in (start, control_1, control_2, end) for value in point)
+        )
+        properties = dict(edge_styles.get("default", {}))
+        properties.update(edge_styles.get(index, {}))
+        marker = "" if variant == "plain" else f' marker-end="url(#sma-flow-head-{variant}-{marker_seed})"'
+        edge_markup.append(
+            f'<path d="{path}" class="sma-flow-edge sma-flow-edge-{variant}"{marker}'
+            f'{_svg_style_attribute(properties, skip=("color", "fill"))}></path>'
+        )
+        if edge.label:
+            mid_x = (start[0] + 3 * control_1[0] + 3 * control_2[0] + end[0]) / 8
+            mid_y = (start[1] + 3 * control_1[1] + 3 * control_2[1] + end[1]) / 8
+            label_width, label_height = label_sizes[index]
+            label_markup.append(
+                f'<rect x="{_svg_number(mid_x - label_width / 2)}" y="{_svg_number(mid_y - label_height / 2)}" '
+                f'width="{_svg_number(label_width)}" height="{_svg_number(label_height)}" rx="6" class="sma-flow-edge-label-bg"></rect>'
+            )
+            label_markup.append(
+                _svg_text(round(mid_x, 1), round(mid_y + 4, 1), edge.label, "sma-flow-edge-label", FLOWCHART_EDGE_LABEL_CHARS)
+            )
+
+    node_markup = []
+    for node_id, (x, y, width, height) in layout.nodes.items():
+        node = diagram.nodes[node_id]
+        properties = element_styles.get(node_id, {})
+        node_markup.append(
+            _flowchart_node_shape(node, x, y, width, height, _svg_style_attribute(properties, skip=("color",)))
+        )
+        text_markup = _svg_text(
+            round(x + width / 2, 1),
+            round(y + height / 2 + 5, 1),
+            node.label or node.id,
+            "sma-flow-node-label",
+            max_chars=FLOWCHART_LABEL_CHARS,
+        )
+        if "color" in properties:
+            text_markup = text_markup.replace("<text ", f'<text style="fill:{html.escape(properties["color"])}" ', 1)
+        node_markup.append(text_markup)
+
+    marker_markup = []
+    for variant in used_variants:
+        if variant == "plain":
             continue
+        head = "M0,0 L10,5 L0,10" if variant == "open" else "M0,0 L10,5 L0,10 z"
+        marker_markup.append(
+            f'<marker id="sma-flow-head-{variant}-{marker_seed}" markerWidth="10" markerHeight="10" refX="9" refY="5" '
+            f'orient="auto" markerUnits="strokeWidth"><path d="{head}" class="sma-flow-head sma-flow-head-{variant}"></path></marker>'
+        )
+
+    width = _svg_number(layout.width)
+    height = _svg_number(layout.height)
+    return (
+        f'<div class="sma-flowchart-svg-wrap" role="img" aria-label="{html.escape(_flowchart_aria_label(diagram))}">'
+        f'<svg class="sma-flowchart-svg" viewBox="0 0 {width} {height}" width="{width}" height="{height}" '
+        'preserveAspectRatio="xMidYMid meet" xmlns="http://www.w3.org/2000/svg">'
+        f'<defs>{"".join(marker_markup)}</defs>'
+        f'{"".join(cluster_markup)}'
+        f'{"".join(edge_markup)}'
+        f'{"".join(node_markup)}'
+        f'{"".join(label_markup)}'
+        "</svg>"
+        "</div>\n"
+    )
+
+
+def render_mermaid_block(raw_code_content: str, file_path: str) -> str:
+    diagram = load_mermaid(raw_code_content)
+    if is_layered_architecture_mermaid(diagram):
+        return render_layered_architecture_svg(diagram)
+    if is_static_flowchart(diagram):
+        legend_html = render_mermaid_arrow_legend() if mermaid_needs_arrow_legend(diagram, file_path) else ""
+        return (
+            '<div class="sma-mermaid-block sma-flowchart-block">\n'
+            f"{legend_html}{render_flowchart_svg(diagram)}"
+            "</div>\n"
+        )
+    escaped_mermaid_code = html.escape(diagram.source)
+    legend_html = ""
+    if mermaid_needs_arrow_legend(diagram, file_path):
+        legend_html = render_mermaid_arrow_legend()
+    return f'<div class="sma-mermaid-block">\n{legend_html}<pre class="mermaid">{escaped_mermaid_code}</pre>\n</div>\n'
 
-        # Paragraphs
-        html += f"<p>{inline_format(line)}</p>\n"
-        i += 1
 
-    if list_tag:
-        html += f"</{list_tag}>\n"
-    if in_table:
-        html += render_table(table_buffer)
+@register_render_hook("code", lang="mermaid")
+def render_mermaid_code(node, context):
+    with stage("mermaid", item=f"{context.document.path}:{node.line}"):
+        return render_mermaid_block(node.code, context.document.path)
+
+
+# Set per process by build_html / _init_render_worker (see iter_rendered_lessons).
+HIGHLIGHT_CACHE_SETTINGS = {"enabled": False, "rebuild": False}
+
+
+@functools.lru_cache(maxsize=1)
+def highlighter_stamp() -> str:
+    return hashlib.sha256(Path(course_highlight.__file__).read_bytes()).hexdigest()
+
+
+def cached_highlight(code: str, lang: str):
+    """highlight_code con cache en disco por bloque (clave: hash de gramatica, lenguaje y codigo).
+
+    La cache de lecciones ya evita re-renderizar lecciones sin cambios; esta
+    evita re-tokenizar los bloques que no cambian dentro de una leccion
+    editada o tras cambiar el generador sin tocar el resaltador.
+    """
+    if not HIGHLIGHT_CACHE_SETTINGS["enabled"]:
+        return highlight_code(code, lang)
+    digest = hashlib.sha256()
+    for part in (highlighter_stamp(), lang, code):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    target = HIGHLIGHT_CACHE_DIR / f"{digest.hexdigest()}.html"
+    if not HIGHLIGHT_CACHE_SETTINGS["rebuild"]:
+        try:
+            canonical, _separator, highlighted = target.read_text(encoding="utf-8").partition("\n")
+            os.utime(target)
+            return canonical, highlighted
+        except (OSError, UnicodeDecodeError):
+            pass
+    result = highlight_code(code, lang)
+    if result is not None:
+        HIGHLIGHT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(f"{result[0]}\n{result[1]}", encoding="utf-8")
+        os.replace(tmp_path, target)
+    return result
+
+
+def evict_highlight_cache(max_age: float = HIGHLIGHT_CACHE_MAX_AGE) -> int:
+    """Elimina bloques resaltados que ningun build ha usado en max_age segundos."""
+    if not HIGHLIGHT_CACHE_DIR.is_dir():
+        return 0
+    cutoff = time.time() - max_age
+    evicted = 0
+    for entry in HIGHLIGHT_CACHE_DIR.iterdir():
+        try:
+            if entry.stat().st_mtime < cutoff:
+                entry.unlink()
+                evicted += 1
+        except OSError:
+            pass
+    return evicted
+
+
+@register_render_hook("code")
+def render_highlighted_code(node, context):
+    """Bloques de codigo ya resaltados en build; el navegador no necesita highlight.js para ellos."""
+    if not node.lang:
+        return None
+    with stage("highlight"):
+        result = cached_highlight(node.code, node.lang)
+    if result is None:
+        return None
+    canonical, highlighted = result
+    classes = f"language-{node.lang} hljs"
+    if canonical != node.lang:
+        classes += f" language-{canonical}"
+    return (
+        f'<pre><code class="{classes}" data-highlighted="1" data-sma-prehighlighted="1">'
+        f"{highlighted}</code></pre>\n"
+    )
+
 
-    html = enhance_semantic_arrow_lists(html)
-    html = enhance_arrow_code_list_items(html)
-    return html
+HTML_TAG_RE = re.compile(r"<[^>]+>")
 
 
-def render_table(rows):
+def md_to_html(md_text, file_id, file_path):
+    """Convierte markdown a HTML basico con soporte para Mermaid."""
+    return render_document_html(parse_markdown(md_text, file_path, file_id))
+
+
+def render_document_html(document):
+    """Renderiza el arbol de una leccion (parse_markdown) a HTML, pasando cada nodo por los render hooks."""
+    context = RenderContext(document)
+    parts = []
+
+    for node in document.children:
+        rendered = run_render_hooks(node, context, node.lang.lower() if node.kind == "code" else None)
+        if rendered is None:
+            rendered = render_node_default(node, context)
+        parts.append(rendered)
+        context.previous = node
+
+    return "".join(parts)
+
+
+def render_list_item_content(list_node, item):
+    content = item.text
+    if not list_node.ordered:
+        # Handle checkbox
+        content = content.replace("[ ]", "&#9744;").replace("[x]", "&#9745;")
+    return inline_format(content)
+
+
+def render_node_default(node, context):
+    """HTML de un nodo cuando ningun hook lo reclama."""
+    node_type = type(node)
+    if node_type is Paragraph:
+        return f"<p>{inline_format(node.text)}</p>\n"
+    if node_type is ListBlock:
+        tag = "ol" if node.ordered else "ul"
+        parts = [f"<{tag}>\n"]
+        previous_parent = context.parent
+        context.parent = node
+        for item in node.items:
+            item_html = run_render_hooks(item, context)
+            if item_html is None:
+                item_html = f"<li>{render_list_item_content(node, item)}</li>"
+            parts.append(f"  {item_html}\n")
+        context.parent = previous_parent
+        parts.append(f"</{tag}>\n")
+        return "".join(parts)
+    if node_type is Heading:
+        text = inline_format(node.text)
+        anchor = heading_anchor(context.document.file_id, text)
+        return f'<h{node.level} id="{anchor}">{text}</h{node.level}>\n'
+    if node_type is CodeBlock or node_type is MermaidBlock:
+        code_content = node.code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        if node.lang:
+            return f'<pre><code class="language-{node.lang}">{code_content}</code></pre>\n'
+        return f"<pre><code>{code_content}</code></pre>\n"
+    if node_type is Table:
+        return render_table(node)
+    if node_type is Rule:
+        return "<hr>\n"
+    return ""
+
+
+def render_table(table):
     """Renderiza una tabla markdown a HTML."""
-    if len(rows) < 2:
+    if not table.header:
         return ""
-    html = '<table>\n<thead>\n<tr>\n'
-    headers = [c.strip() for c in rows[0].strip().strip("|").split("|")]
-    for h in headers:
-        html += f"  <th>{inline_format(h)}</th>\n"
-    html += "</tr>\n</thead>\n<tbody>\n"
-
-    for row in rows[2:]:  # Skip header separator
-        cells = [c.strip() for c in row.strip().strip("|").split("|")]
-        html += "<tr>\n"
+    parts = ['<table>\n<thead>\n<tr>\n']
+    for h in table.header:
+        parts.append(f"  <th>{inline_format(h)}</th>\n")
+    parts.append("</tr>\n</thead>\n<tbody>\n")
+
+    for cells in table.rows:
+        parts.append("<tr>\n")
         for c in cells:
-            html += f"  <td>{inline_format(c)}</td>\n"
-        html += "</tr>\n"
-
-    html += "</tbody>\n</table>\n"
-    return html
-
-
-def inline_format(text):
-    """Aplica formato inline: bold, italic, code, links."""
-    # Inline code (before other formatting to avoid conflicts)
-    text = re.sub(r"`([^`]+)`", lambda m: "<code>" + m.group(1).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;") + "</code>", text)
-    # Bold + italic
-    text = re.sub(r"\*\*\*(.+?)\*\*\*", r"<strong><em>\1</em></strong>", text)
-    # Bold
-    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
-    # Italic
-    text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
-    # Links
-    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
-    # Images
-    text = re.sub(
-        r"!\[([^\]]*)\]\(([^)]+)\)",
-        r'<img alt="\1" src="\2" loading="lazy" decoding="async">',
-        text,
-    )
-    return text
+            parts.append(f"  <td>{inline_format(c)}</td>\n")
+        parts.append("</tr>\n")
+
+    parts.append("</tbody>\n</table>\n")
+    return "".join(parts)
+
+
+NAV_SECTIONS = {
+    "00-informe": "Informe fundacional",
+    "00-nivel-cero": "Nivel Cero: Fundamentos",
+    "01-junior": "Nivel Junior",
+    "02-midlevel": "Nivel Midlevel",
+    "03-senior": "Nivel Senior",
+    "04-maestria": "Nivel Maestria",
+    "05-proyecto-final": "Proyecto Final",
+    "anexos": "Anexos",
+}
+
 
+def build_nav(documents, search_index_url: str = ""):
+    """Construye la barra de navegacion con anchors.
 
-def build_nav(files_content):
-    """Construye la barra de navegacion con anchors."""
-    nav = (
+    search_index_url es el manifest del indice de texto completo; sin el, el
+    buscador solo filtra por titulo y ruta.
+    """
+    search_index_attr = f' data-search-index="{search_index_url}"' if search_index_url else ""
+    parts = [
         '<nav id="sidebar">\n'
         '<div class="sidebar-top">\n'
         '<h2>Indice</h2>\n'
         '<div class="sidebar-search-wrap">\n'
-        '  <input id="sidebar-search" type="search" placeholder="Buscar leccion..." '
-        'aria-label="Buscar leccion en el curso" autocomplete="off">\n'
+        '  <input id="sidebar-search" type="search" placeholder="Buscar en el curso..." '
+        f'aria-label="Buscar en el curso" autocomplete="off"{search_index_attr}>\n'
         '  <div id="sidebar-search-count" aria-live="polite"></div>\n'
+        '  <div id="sidebar-search-results" hidden>\n'
+        '    <div class="sidebar-search-results-title">En el contenido</div>\n'
+        '    <ol></ol>\n'
+        '  </div>\n'
         '</div>\n'
         '</div>\n'
         '<ul>\n'
-    )
-
-    sections = {
-        "00-informe": "Informe fundacional",
-        "00-nivel-cero": "Nivel Cero: Fundamentos",
-        "01-junior": "Nivel Junior",
-        "02-midlevel": "Nivel Midlevel",
-        "03-senior": "Nivel Senior",
-        "04-maestria": "Nivel Maestria",
-        "05-proyecto-final": "Proyecto Final",
-        "anexos": "Anexos",
-    }
+    ]
 
     current_section = ""
-    for filepath, content in files_content:
+    for document in documents:
+        filepath = document.path
         section_key = filepath.split("/")[0]
-        section_name = sections.get(section_key, section_key)
+        section_name = NAV_SECTIONS.get(section_key, section_key)
 
         if section_name != current_section:
             if current_section:
-                nav += "</ul></li>\n"
+                parts.append("</ul></li>\n")
             current_section = section_name
-            nav += f'<li class="nav-section"><strong>{section_name}</strong>\n<ul>\n'
-
-        # Extract first h1 or filename
-        h1_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-        title = h1_match.group(1) if h1_match else Path(filepath).stem
-        file_id = filepath.replace("/", "-").replace(".md", "")
-        nav += f'  <li><a class="doc-nav-link" data-lesson-path="{filepath}" href="#{file_id}">{title}</a></li>\n'
-
-    nav += "</ul></li>\n</ul>\n</nav>\n"
-    return nav
-
-
-def build_html():
-    """Construye el HTML completo."""
-    files_content = []
-    for rel_path in FILE_ORDER:
-        full_path = COURSE_ROOT / rel_path
-        if full_path.exists():
-            content = full_path.read_text(encoding="utf-8")
-            files_content.append((rel_path, content))
-        else:
-            print(f"  [SKIP] {rel_path} (no encontrado)")
-
-    print(f"  Procesando {len(files_content)} archivos...")
-
-    nav = build_nav(files_content)
-
-    version_sources = [
-        "study-ux.js",
-        "study-ux.css",
-        "course-switcher.js",
-        "course-switcher.css",
-        "theme-controls.js",
-        "assistant-panel.js",
-        "assistant-panel.css",
-        "assistant-bridge.js",
-    ]
-    version_marks = [
-        int((ASSETS_SRC_DIR / name).stat().st_mtime)
-        for name in version_sources
-        if (ASSETS_SRC_DIR / name).exists()
+            parts.append(f'<li class="nav-section"><strong>{section_name}</strong>\n<ul>\n')
+
+        # First h1 or filename
+        title = document.title or Path(filepath).stem
+        file_id = document.file_id
+        parts.append(f'  <li><a class="doc-nav-link" data-lesson-path="{filepath}" href="#{file_id}">{title}</a></li>\n')
+
+    parts.append("</ul></li>\n</ul>\n</nav>\n")
+    return "".join(parts)
+
+
+def iter_search_sections(document):
+    """SearchSection de cada tramo de la leccion bajo un titulo, en orden de lectura."""
+    section = SearchSection(document.file_id, document.file_id, document.title or Path(document.path).stem)
+    for node in document.children:
+        node_type = type(node)
+        if node_type is Heading:
+            if section.weights:
+                yield section
+            formatted = inline_format(node.text)
+            heading = html.unescape(HTML_TAG_RE.sub("", formatted))
+            section = SearchSection(document.file_id, heading_anchor(document.file_id, formatted), heading)
+            section.add_text(node.text, WEIGHT_TITLE if node.level == 1 else WEIGHT_HEADING)
+        elif node_type is Paragraph:
+            section.add_text(node.text)
+        elif node_type is ListBlock:
+            for item in node.items:
+                section.add_text(item.text)
+        elif node_type is Table:
+            for cell in node.header:
+                section.add_text(cell)
+            for row in node.rows:
+                for cell in row:
+                    section.add_text(cell)
+        elif node_type is MermaidBlock:
+            diagram = load_mermaid(node.code)
+            if diagram.kind == "other":
+                section.add_code(node.code, WEIGHT_DIAGRAM)
+                continue
+            for mermaid_node in diagram.nodes.values():
+                section.add_text(mermaid_node.label or mermaid_node.id, WEIGHT_DIAGRAM)
+            for subgraph in diagram.subgraphs.values():
+                section.add_text(subgraph.title or subgraph.id, WEIGHT_DIAGRAM)
+            for edge in diagram.edges:
+                if edge.label:
+                    section.add_text(edge.label, WEIGHT_DIAGRAM)
+        elif node_type is CodeBlock:
+            section.add_code(node.code, WEIGHT_CODE)
+    if section.weights:
+        yield section
+
+
+def load_search_sections(document, stamp: str, use_cache: bool, rebuild: bool) -> tuple:
+    """(clave de cache, secciones) de la leccion, desde dist/.cache/search si no cambio."""
+    digest = hashlib.sha256()
+    for part in (stamp, document.path, document.digest):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    cache_key = digest.hexdigest()
+    cache_path = SEARCH_CACHE_DIR / f"{cache_key}.json"
+    if use_cache and not rebuild:
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            return cache_key, [SearchSection.from_json(document.file_id, entry) for entry in data]
+        except (OSError, ValueError):
+            pass
+    sections = list(iter_search_sections(document))
+    if use_cache:
+        SEARCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps([section.to_json() for section in sections], ensure_ascii=False, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, cache_path)
+    return cache_key, sections
+
+
+def build_search_index(documents, use_cache: bool = True, rebuild: bool = False) -> str:
+    """Escribe el indice de busqueda (un shard por bloque del NAV_SECTIONS) y devuelve la URL del manifest.
+
+    Los terminos de cada leccion se guardan en dist/.cache/search con la
+    misma politica que la cache de render: solo se re-extraen las lecciones
+    que cambiaron.
+    """
+    stamp = hashlib.sha256(
+        (renderer_stamp() + hashlib.sha256(Path(course_search.__file__).read_bytes()).hexdigest()).encode("utf-8")
+    ).hexdigest()
+    groups = {}
+    live_keys = set()
+    for document in documents:
+        section_key = document.path.split("/")[0]
+        lessons, sections = groups.setdefault(section_key, ([], []))
+        lessons.append((document.file_id, document.title or Path(document.path).stem, document.path))
+        cache_key, document_sections = load_search_sections(document, stamp, use_cache, rebuild)
+        live_keys.add(cache_key)
+        sections.extend(document_sections)
+    if use_cache:
+        evict_cache_entries(SEARCH_CACHE_DIR, live_keys, ".json")
+    shards = [
+        encode_shard(key, NAV_SECTIONS.get(key, key), lessons, sections)
+        for key, (lessons, sections) in groups.items()
     ]
-    asset_version = str(max(version_marks + [int(time.time())]))
-
-    body_html = ""
-    for filepath, content in files_content:
-        file_id = filepath.replace("/", "-").replace(".md", "")
-        body_html += f'<section id="{file_id}" class="lesson" data-topic-id="{file_id}" data-lesson-path="{filepath}">\n'
-        body_html += f'<div class="lesson-path">{filepath}</div>\n'
-        body_html += md_to_html(content, file_id, filepath)
-        body_html += "</section>\n"
-
-    html_template = """<!DOCTYPE html>
+    manifest = write_search_index(shards, SEARCH_DIST_DIR)
+    index_bytes = sum(shard["bytes"] for shard in manifest["shards"])
+    print(
+        f"  Busqueda: {manifest['docs']} secciones, {sum(shard['terms'] for shard in manifest['shards'])} terminos, "
+        f"{index_bytes / 1024:.0f} KB en {len(manifest['shards'])} shards"
+    )
+    return f"{SEARCH_DIST_DIR.name}/manifest.json?v={manifest['digest']}"
+
+
+def renderer_stamp(plugins=()) -> str:
+    """Version del renderer: cambia con RENDER_CACHE_VERSION o al editar este script, sus modulos o sus plugins."""
+    digest = hashlib.sha256(f"v{RENDER_CACHE_VERSION}\n".encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+    for module in RENDERER_MODULES:
+        digest.update(Path(module.__file__).read_bytes())
+    for plugin_path in plugins:
+        digest.update(Path(plugin_path).read_bytes())
+    return digest.hexdigest()
+
+
+def render_cache_key(document, stamp: str) -> str:
+    digest = hashlib.sha256()
+    for part in (stamp, document.file_id, document.path, document.digest):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+# cache_key -> lesson HTML already read or rendered by this process. Long-lived
+# processes (--watch, course-daemon.py) skip the disk cache for these.
+RENDER_MEMO = {}
+
+
+def load_cached_render(cache_key: str):
+    lesson_html = RENDER_MEMO.get(cache_key)
+    if lesson_html is not None:
+        return lesson_html
+    try:
+        lesson_html = (RENDER_CACHE_DIR / f"{cache_key}.html").read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    RENDER_MEMO[cache_key] = lesson_html
+    return lesson_html
+
+
+def store_cached_render(cache_key: str, lesson_html: str) -> None:
+    RENDER_MEMO[cache_key] = lesson_html
+    RENDER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    target = RENDER_CACHE_DIR / f"{cache_key}.html"
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(lesson_html, encoding="utf-8")
+    os.replace(tmp_path, target)
+
+
+def evict_cache_entries(cache_dir: Path, live_keys: set, suffix: str) -> int:
+    """Elimina entradas de cache_dir que ya no corresponden a ninguna leccion actual."""
+    if not cache_dir.is_dir():
+        return 0
+    evicted = 0
+    for entry in cache_dir.iterdir():
+        if entry.name.endswith(suffix) and entry.name[: len(entry.name) - len(suffix)] in live_keys:
+            continue
+        try:
+            entry.unlink()
+            evicted += 1
+        except OSError:
+            pass
+    return evicted
+
+
+def _render_lesson(document):
+    return render_document_html(document)
+
+
+def _init_render_worker(plugin_paths, highlight_cache_settings) -> None:
+    """Initializer del pool: mismos plugins y misma cache de resaltado que el proceso padre."""
+    load_render_plugins(plugin_paths)
+    HIGHLIGHT_CACHE_SETTINGS.update(highlight_cache_settings)
+
+
+def iter_rendered_lessons(documents, jobs: int = 1, use_cache: bool = True, rebuild: bool = False, plugins=()):
+    """Genera (ruta, html) de cada leccion (cache primero) en el orden de documents.
+
+    Las lecciones que no estan en cache se renderizan en un pool de procesos
+    cuando jobs > 1 (el arbol ya parseado viaja al proceso, no se reparsea);
+    el render es puro, asi que el resultado es identico al del camino
+    secuencial. Las entradas de cache se leen de una en una al consumir el
+    generador, para no retener el curso entero en memoria. plugins son los
+    .py de render hooks ya cargados en este proceso; se recargan en el pool.
+    """
+    stamp = renderer_stamp(plugins)
+    lessons = []
+    live_keys = set()
+    pending = []
+    for document in documents:
+        cache_key = render_cache_key(document, stamp)
+        live_keys.add(cache_key)
+        is_cached = (
+            use_cache and not rebuild and (cache_key in RENDER_MEMO or (RENDER_CACHE_DIR / f"{cache_key}.html").is_file())
+        )
+        if not is_cached:
+            pending.append(document)
+        lessons.append((document, cache_key, is_cached))
+
+    executor = None
+    results = None
+    workers = min(jobs, len(pending))
+    if workers > 1 and len(pending) >= PARALLEL_MIN_LESSONS:
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_render_worker,
+                initargs=(tuple(plugins), dict(HIGHLIGHT_CACHE_SETTINGS)),
+            )
+            chunksize = max(1, len(pending) // (workers * 4))
+            results = executor.map(_render_lesson, pending, chunksize=chunksize)
+        except (OSError, NotImplementedError) as error:
+            print(f"  [WARN] Render paralelo no disponible ({error}); se usa modo secuencial")
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            executor = None
+    if results is None:
+        workers = 1
+        results = map(_render_lesson, pending)
+
+    # Counted as they happen: a cache entry that fails to load is rendered too.
+    rendered = 0
+    try:
+        for document, cache_key, is_cached in lessons:
+            with stage("render-cache"):
+                lesson_html = load_cached_render(cache_key) if is_cached else None
+            if lesson_html is None:
+                # Under --profile rendering is sequential, so the lesson renders inside this stage.
+                with stage("render", item=document.path):
+                    lesson_html = next(results) if not is_cached else _render_lesson(document)
+                rendered += 1
+                if use_cache:
+                    store_cached_render(cache_key, lesson_html)
+            yield document.path, lesson_html
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    mode = f"{workers} procesos" if workers > 1 else "secuencial"
+    for cache_key in RENDER_MEMO.keys() - live_keys:
+        del RENDER_MEMO[cache_key]
+    if use_cache:
+        evicted = evict_cache_entries(RENDER_CACHE_DIR, live_keys, ".html") + evict_highlight_cache()
+        print(
+            f"  Cache: {len(lessons) - rendered} reutilizadas, {rendered} renderizadas ({mode}), "
+            f"{evicted} obsoletas eliminadas"
+        )
+    else:
+        print(f"  Render: {rendered} lecciones ({mode})")
+
+
+def write_document(parts, target: Path, copies=()) -> None:
+    """Escribe los trozos en un temporal y lo renombra de forma atomica sobre target.
+
+    Cada ruta de copies se crea como hardlink del mismo temporal (o con una
+    unica copia si el sistema de archivos no lo permite), asi que nadie que lea
+    dist/ ve un archivo a medio escribir y el HTML se serializa una sola vez.
+    """
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    staged = [(tmp_path, target)]
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            for part in parts:
+                handle.write(part)
+        for copy_target in copies:
+            copy_tmp = copy_target.with_name(f".{copy_target.name}.{os.getpid()}.tmp")
+            staged.append((copy_tmp, copy_target))
+            try:
+                os.link(tmp_path, copy_tmp)
+            except OSError:
+                shutil.copyfile(tmp_path, copy_tmp)
+        for staged_path, final_path in staged:
+            os.replace(staged_path, final_path)
+    finally:
+        for staged_path, _final_path in staged:
+            if staged_path.exists():
+                staged_path.unlink()
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="es">
 <head>
 <meta charset="UTF-8">
@@ -742,17 +1278,16 @@ def build_html():
 <meta name="darkreader-lock">
 <meta name="course-id" content="stack-my-architecture-android">
 <title>Stack: My Architecture Android</title>
-<link rel="stylesheet" href="assets/study-ux.css?v=__ASSET_VERSION__">
-<link rel="stylesheet" href="assets/course-switcher.css?v=__ASSET_VERSION__">
-<link rel="stylesheet" href="assets/assistant-panel.css?v=__ASSET_VERSION__">
-<script>window.__SMA_ASSISTANT_PANEL_SRC = "assets/assistant-panel.js?v=__ASSET_VERSION__";</script>
+<link rel="stylesheet" href="__ASSET[study-ux.css]__">
+<link rel="stylesheet" href="__ASSET[course-switcher.css]__">
+<link rel="stylesheet" href="__ASSET[assistant-panel.css]__">
+<script>window.__SMA_ASSISTANT_PANEL_SRC = "__ASSET[assistant-panel.js]__";</script>
 <script>window.__SMA_MERMAID_SRC = "https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js";</script>
-<script>window.__SMA_HLJS_CORE_SRC = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js";</script>
-<script>window.__SMA_HLJS_LANG_SRC = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/languages/kotlin.min.js";</script>
-<script defer src="assets/study-ux.js?v=__ASSET_VERSION__"></script>
-<script defer src="assets/course-switcher.js?v=__ASSET_VERSION__"></script>
-<script defer src="assets/theme-controls.js?v=__ASSET_VERSION__"></script>
-<script defer src="assets/assistant-bridge.js?v=__ASSET_VERSION__"></script>
+<script>window.__SMA_SEARCH_WORKER_SRC = "__ASSET[search-worker.js]__";</script>
+<script defer src="__ASSET[study-ux.js]__"></script>
+<script defer src="__ASSET[course-switcher.js]__"></script>
+<script defer src="__ASSET[theme-controls.js]__"></script>
+<script defer src="__ASSET[assistant-bridge.js]__"></script>
 
 <!-- Google Fonts - Inter -->
 <link rel="preconnect" href="https://fonts.googleapis.com">
@@ -762,1170 +1297,7 @@ def build_html():
 <!-- Mermaid.js para diagramas -->
 <link id="hljs-theme" rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/monokai.min.css">
 
-<style>
-/* ============================================
-   SISTEMA DE DISEÑO: Stack My Architecture iOS
-   ============================================ */
-
-:root {{
-    /* ============================================
-       VISUAL STYLES: enterprise, bold, paper
-       ============================================ */
-    --visual-style: 'enterprise';
-}}
-
-/* ============================================
-   STYLE: ENTERPRISE (Default)
-   Profesional, limpio, corporativo
-   ============================================ */
-[data-style="enterprise"] {{
-    /* Paleta de colores */
-    --bg: #ffffff;
-    --bg-elevated: #fafbfc;
-    --bg-surface: #f6f8fa;
-    
-    --text: #1a1a2e;
-    --text-secondary: #4a4a5a;
-    --text-muted: #6a6a7a;
-    
-    --accent: #2563eb;
-    --accent-light: #3b82f6;
-    --accent-dark: #1d4ed8;
-    --accent-soft: rgba(37, 99, 235, 0.1);
-    
-    --success: #10b981;
-    --success-soft: rgba(16, 185, 129, 0.1);
-    --warning: #f59e0b;
-    --warning-soft: rgba(245, 158, 11, 0.1);
-    --danger: #ef4444;
-    --danger-soft: rgba(239, 68, 68, 0.1);
-    --info: #06b6d4;
-    --info-soft: rgba(6, 182, 212, 0.1);
-    
-    --sidebar-bg: #f8fafc;
-    --code-bg: #f1f5f9;
-    --border: #e2e8f0;
-    --border-light: #f1f5f9;
-    
-    --shadow-sm: 0 1px 2px rgba(0,0,0,0.05);
-    --shadow: 0 4px 6px -1px rgba(0,0,0,0.1);
-    --shadow-lg: 0 10px 15px -3px rgba(0,0,0,0.1);
-    
-    --font-weight-body: 500;
-    --font-weight-heading: 700;
-    --heading-letter-spacing: -0.02em;
-    --border-radius: 8px;
-}}
-
-/* ============================================
-   STYLE: ENTERPRISE - Dark Mode overrides
-   Profesional, azul corporativo
-   ============================================ */
-[data-theme="dark"][data-style="enterprise"] {{
-    --bg: #0c1821;
-    --bg-elevated: #152a3d;
-    --bg-surface: #1e3a5f;
-    
-    --text: #e8f4ff;
-    --text-secondary: #a8c5e0;
-    --text-muted: #6b8fb0;
-    
-    --accent: #60a5fa;
-    --accent-light: #93c5fd;
-    --accent-dark: #3b82f6;
-    --accent-soft: rgba(96, 165, 250, 0.15);
-    
-    --sidebar-bg: #0f2335;
-    --code-bg: #152a3d;
-    --border: #2a4a6d;
-    --border-light: #1e3a5f;
-}}
-
-/* ============================================
-   STYLE: BOLD
-   Alto contraste, impactante, moderno
-   ============================================ */
-[data-style="bold"] {{
-    --bg: #0a0a0f;
-    --bg-elevated: #141419;
-    --bg-surface: #1e1e24;
-    
-    --text: #ffffff;
-    --text-secondary: #d0d0e0;
-    --text-muted: #a0a0b0;
-    
-    --accent: #ff6b35;
-    --accent-light: #ff8c5a;
-    --accent-dark: #e55a2b;
-    --accent-soft: rgba(255, 107, 53, 0.15);
-    
-    --success: #00d9a3;
-    --success-soft: rgba(0, 217, 163, 0.15);
-    --warning: #ffc107;
-    --warning-soft: rgba(255, 193, 7, 0.15);
-    --danger: #ff4757;
-    --danger-soft: rgba(255, 71, 87, 0.15);
-    --info: #00d4ff;
-    --info-soft: rgba(0, 212, 255, 0.15);
-    
-    --sidebar-bg: #0f0f14;
-    --code-bg: #1a1a22;
-    --border: #3a3a45;
-    --border-light: #2a2a35;
-    
-    --shadow-sm: 0 1px 2px rgba(0,0,0,0.3);
-    --shadow: 0 4px 6px -1px rgba(0,0,0,0.4);
-    --shadow-lg: 0 10px 15px -3px rgba(0,0,0,0.5);
-    
-    --font-weight-body: 500;
-    --font-weight-heading: 800;
-    --heading-letter-spacing: -0.03em;
-    --border-radius: 12px;
-}}
-
-/* ============================================
-   STYLE: BOLD - Dark Mode overrides
-   Alto contraste, manteniendo la identidad naranja
-   ============================================ */
-[data-theme="dark"][data-style="bold"] {{
-    --bg: #0a0a0f;
-    --bg-elevated: #141419;
-    --bg-surface: #1e1e24;
-    
-    --text: #ffffff;
-    --text-secondary: #d0d0e0;
-    --text-muted: #a0a0b0;
-    
-    --accent: #ff6b35;
-    --accent-light: #ff8c5a;
-    --accent-dark: #e55a2b;
-    --accent-soft: rgba(255, 107, 53, 0.15);
-    
-    --sidebar-bg: #0f0f14;
-    --code-bg: #1a1a22;
-    --border: #3a3a45;
-    --border-light: #2a2a35;
-}}
-
-/* ============================================
-   STYLE: PAPER
-   Cálido, orgánico, académico
-   ============================================ */
-[data-style="paper"] {{
-    --bg: #fdfbf7;
-    --bg-elevated: #f5f1e8;
-    --bg-surface: #f0ebe0;
-    
-    --text: #2c241b;
-    --text-secondary: #5a5045;
-    --text-muted: #8a8075;
-    
-    --accent: #8b4513;
-    --accent-light: #a0522d;
-    --accent-dark: #654321;
-    --accent-soft: rgba(139, 69, 19, 0.08);
-    
-    --success: #2e7d32;
-    --success-soft: rgba(46, 125, 50, 0.1);
-    --warning: #ed6c02;
-    --warning-soft: rgba(237, 108, 2, 0.1);
-    --danger: #c62828;
-    --danger-soft: rgba(198, 40, 40, 0.1);
-    --info: #1565c0;
-    --info-soft: rgba(21, 101, 192, 0.1);
-    
-    --sidebar-bg: #f7f3ec;
-    --code-bg: #f5f0e6;
-    --border: #e0d5c5;
-    --border-light: #ebe5d8;
-    
-    --shadow-sm: 0 1px 3px rgba(44, 36, 27, 0.08);
-    --shadow: 0 4px 8px rgba(44, 36, 27, 0.12);
-    --shadow-lg: 0 8px 16px rgba(44, 36, 27, 0.15);
-    
-    --font-weight-body: 400;
-    --font-weight-heading: 600;
-    --heading-letter-spacing: -0.01em;
-    --border-radius: 4px;
-}}
-
-/* ============================================
-   STYLE: PAPER - Dark Mode overrides
-   Marrón cálido, estilo parchment
-   ============================================ */
-[data-theme="dark"][data-style="paper"] {{
-    --bg: #2d2419;
-    --bg-elevated: #3d3124;
-    --bg-surface: #4a3d2e;
-    
-    --text: #f5e6d3;
-    --text-secondary: #d4c4b0;
-    --text-muted: #a89080;
-    
-    --accent: #c4956a;
-    --accent-light: #d4a87a;
-    --accent-dark: #a87b5a;
-    --accent-soft: rgba(196, 149, 106, 0.15);
-    
-    --sidebar-bg: #3d3124;
-    --code-bg: #4a3d2e;
-    --border: #5a4d3e;
-    --border-light: #4a3d2e;
-}}
-
-/* ============================================
-   COMMON VARIABLES (No cambian entre estilos)
-   ============================================ */
-:root {{
-    --sidebar-width: 300px;
-    
-    /* Tipografía */
-    --font-sans: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-    --font-mono: 'SF Mono', 'Fira Code', 'JetBrains Mono', Menlo, Consolas, monospace;
-    
-    /* Espaciado */
-    --space-xs: 0.25rem;
-    --space-sm: 0.5rem;
-    --space-md: 1rem;
-    --space-lg: 1.5rem;
-    --space-xl: 2rem;
-    --space-2xl: 3rem;
-    --space-3xl: 4rem;
-    
-    /* Radios */
-    --radius-sm: calc(var(--border-radius) / 2);
-    --radius-md: var(--border-radius);
-    --radius-lg: calc(var(--border-radius) * 1.5);
-    --radius-xl: calc(var(--border-radius) * 2);
-}}
-
-* {{ margin: 0; padding: 0; box-sizing: border-box; }}
-
-html {{ scroll-behavior: smooth; }}
-
-body {{
-    font-family: var(--font-sans);
-    color: var(--text);
-    background: var(--bg);
-    line-height: 1.75;
-    font-size: 16px;
-    font-weight: var(--font-weight-body);
-    display: flex;
-    -webkit-font-smoothing: antialiased;
-    -moz-osx-font-smoothing: grayscale;
-}}
-
-/* ============================================
-   SIDEBAR NAVEGACIÓN
-   ============================================ */
-#sidebar {{
-    position: fixed;
-    top: 0;
-    left: 0;
-    width: var(--sidebar-width);
-    height: 100vh;
-    overflow-y: auto;
-    background: var(--sidebar-bg);
-    border-right: 1px solid var(--border);
-    padding: calc(var(--space-lg) + 8px) var(--space-md) var(--space-lg);
-    font-size: 0.875rem;
-    z-index: 100;
-    scrollbar-width: thin;
-}}
-
-#sidebar::-webkit-scrollbar {{
-    width: 6px;
-}}
-
-#sidebar::-webkit-scrollbar-thumb {{
-    background: var(--border);
-    border-radius: 3px;
-}}
-
-#sidebar .sidebar-top {{
-    position: sticky;
-    top: 0;
-    z-index: 5;
-    background: var(--sidebar-bg);
-    padding-top: var(--space-xs);
-}}
-
-#sidebar h2 {{
-    font-size: 1rem;
-    font-weight: 700;
-    margin-bottom: var(--space-sm);
-    color: var(--accent);
-    letter-spacing: -0.02em;
-    text-transform: uppercase;
-    font-size: 0.75rem;
-    line-height: 1.25;
-}}
-
-#sidebar .sidebar-search-wrap {{
-    margin-bottom: var(--space-sm);
-    padding-bottom: var(--space-sm);
-    border-bottom: 1px solid color-mix(in srgb, var(--border) 80%, transparent);
-}}
-
-#sidebar #sidebar-search {{
-    width: 100%;
-    border: 1px solid var(--border);
-    border-radius: var(--radius-sm);
-    background: var(--bg-surface);
-    color: var(--text);
-    padding: 8px 10px;
-    font-size: 0.82rem;
-    transition: border-color 0.2s ease, box-shadow 0.2s ease;
-}}
-
-#sidebar #sidebar-search::placeholder {{
-    color: var(--text-muted);
-}}
-
-#sidebar #sidebar-search:focus {{
-    outline: none;
-    border-color: var(--accent);
-    box-shadow: 0 0 0 3px color-mix(in srgb, var(--accent) 20%, transparent);
-}}
-
-#sidebar #sidebar-search-count {{
-    margin-top: 6px;
-    min-height: 1em;
-    font-size: 0.72rem;
-    color: var(--text-muted);
-}}
-
-#sidebar ul {{ list-style: none; padding-left: 0; }}
-
-#sidebar li {{ margin-bottom: 2px; }}
-
-#sidebar li.nav-section {{
-    margin-top: var(--space-lg);
-}}
-
-#sidebar li.nav-section:first-child {{
-    margin-top: 0;
-}}
-
-#sidebar li.nav-section > strong {{
-    color: var(--text);
-    font-size: 0.8rem;
-    font-weight: 600;
-    display: block;
-    padding: var(--space-xs) var(--space-sm);
-    text-transform: uppercase;
-    letter-spacing: 0.05em;
-    color: var(--text-muted);
-}}
-
-#sidebar a {{
-    color: var(--text-secondary);
-    text-decoration: none;
-    display: block;
-    padding: 6px 10px;
-    border-radius: var(--radius-sm);
-    transition: all 0.2s ease;
-    font-weight: 450;
-    border-left: 2px solid transparent;
-}}
-
-#sidebar a:hover {{
-    background: var(--accent-soft);
-    color: var(--accent);
-    border-left-color: var(--accent);
-}}
-
-/* ============================================
-   CONTENIDO PRINCIPAL
-   ============================================ */
-#content {{
-    margin-left: var(--sidebar-width);
-    max-width: none;
-    padding: var(--space-3xl) var(--space-2xl);
-    width: calc(100% - var(--sidebar-width));
-    min-height: 100vh;
-}}
-
-section.lesson {{
-    overflow-x: hidden;
-    max-width: 100%;
-    box-sizing: border-box;
-    word-wrap: break-word;
-    overflow-wrap: break-word;
-    content-visibility: auto;
-    contain-intrinsic-size: 1200px;
-}}
-
-body:not(.sma-hydrated) section.lesson {{
-    display: none;
-}}
-
-body:not(.sma-hydrated) section.lesson:first-of-type {{
-    display: block;
-}}
-
-section.lesson > * {{
-    max-width: 100%;
-    box-sizing: border-box;
-}}
-
-/* ============================================
-   TIPOGRAFÍA - JERARQUÍA VISUAL
-   ============================================ */
-h1, h2, h3, h4 {{
-    font-weight: var(--font-weight-heading);
-    line-height: 1.3;
-    letter-spacing: var(--heading-letter-spacing);
-    color: var(--text);
-}}
-
-h1 {{
-    font-size: 2.5em;
-    margin: 0 0 var(--space-lg);
-    padding-bottom: var(--space-md);
-    border-bottom: 3px solid var(--accent);
-    color: var(--text);
-    position: relative;
-}}
-
-h1::after {{
-    content: '';
-    position: absolute;
-    bottom: -3px;
-    left: 0;
-    width: 120px;
-    height: 3px;
-    background: linear-gradient(90deg, var(--accent) 0%, var(--accent-light) 100%);
-}}
-
-h2 {{
-    font-size: 1.75em;
-    margin: var(--space-2xl) 0 var(--space-md);
-    color: var(--text);
-    display: flex;
-    align-items: center;
-    gap: var(--space-sm);
-}}
-
-h2::before {{
-    content: '';
-    width: 4px;
-    height: 28px;
-    background: var(--accent);
-    border-radius: 2px;
-}}
-
-h3 {{
-    font-size: 1.375em;
-    margin: var(--space-xl) 0 var(--space-sm);
-    color: var(--text);
-    font-weight: 600;
-}}
-
-h4 {{
-    font-size: 1.125em;
-    margin: var(--space-lg) 0 var(--space-sm);
-    color: var(--text-secondary);
-    font-weight: 600;
-}}
-
-p {{
-    margin: var(--space-md) 0;
-    color: var(--text-secondary);
-    line-height: 1.8;
-    font-weight: var(--font-weight-body);
-}}
-
-/* ============================================
-   SEPARADORES Y SECCIONES
-   ============================================ */
-hr {{
-    border: none;
-    border-top: 1px solid var(--border);
-    margin: var(--space-2xl) 0;
-}}
-
-hr.lesson-separator {{
-    border: none;
-    height: 4px;
-    background: linear-gradient(90deg, var(--accent) 0%, var(--info) 50%, var(--success) 100%);
-    margin: var(--space-3xl) 0;
-    border-radius: 2px;
-}}
-
-/* ============================================
-   BLOQUES DE CÓDIGO
-   ============================================ */
-pre {{
-    background: transparent;
-    border: 1px solid var(--border);
-    border-radius: var(--radius-md);
-    padding: 0;
-    overflow-x: auto;
-    margin: var(--space-lg) 0;
-    font-size: 0.875em;
-    line-height: 1.6;
-    box-shadow: var(--shadow-sm);
-}}
-
-pre > code {{
-    display: block;
-    padding: var(--space-lg);
-    border-radius: var(--radius-md);
-    background: var(--code-bg);
-}}
-
-pre.sma-code-enhanced {{
-    position: relative;
-}}
-
-pre.sma-code-enhanced > code {{
-    padding-top: calc(var(--space-lg) + 1.2rem);
-}}
-
-.sma-code-tools {{
-    position: absolute;
-    top: 8px;
-    right: 10px;
-    display: inline-flex;
-    align-items: center;
-    gap: 8px;
-    z-index: 2;
-}}
-
-.sma-code-lang {{
-    font-size: 0.7rem;
-    font-weight: 700;
-    letter-spacing: 0.04em;
-    text-transform: uppercase;
-    color: var(--text-muted);
-    background: var(--bg-elevated);
-    border: 1px solid var(--border);
-    border-radius: 999px;
-    padding: 2px 8px;
-}}
-
-.sma-code-copy-btn {{
-    font-size: 0.72rem;
-    font-weight: 600;
-    color: var(--text);
-    background: var(--bg-elevated);
-    border: 1px solid var(--border);
-    border-radius: 999px;
-    padding: 3px 10px;
-    cursor: pointer;
-}}
-
-.sma-code-copy-btn:hover {{
-    border-color: var(--accent);
-    color: var(--accent);
-}}
-
-code {{
-    font-family: var(--font-mono);
-    font-size: 0.9em;
-}}
-
-p code, li code, td code {{
-    background: var(--code-bg);
-    padding: 3px 8px;
-    border-radius: var(--radius-sm);
-    border: 1px solid var(--border-light);
-    color: var(--danger);
-    font-weight: 500;
-    font-size: 0.85em;
-}}
-
-/* Mermaid diagrams */
-:root {{
-    --mermaid-bg: #ffffff;
-    --mermaid-text: #0f172a;
-    --mermaid-node-bg: #f8fafc;
-    --mermaid-node-border: #1d4ed8;
-    --mermaid-line: #1e40af;
-    --mermaid-label-bg: #eef2ff;
-    --mermaid-legend-direct: #cbd5e1;
-    --mermaid-legend-dashed-closed: #cbd5e1;
-    --mermaid-legend-contract: #cbd5e1;
-    --mermaid-legend-solid-open: #cbd5e1;
-}}
-
-.sma-mermaid-block {{
-    margin: var(--space-lg) 0;
-}}
-
-.sma-mermaid-legend {{
-    border: 1px solid var(--border);
-    background: var(--bg-surface);
-    border-radius: var(--radius-md);
-    padding: 10px 12px;
-    margin: 0 0 var(--space-sm);
-}}
-
-.sma-mermaid-legend-title {{
-    margin: 0 0 8px;
-    font-size: 0.78rem;
-    font-weight: 700;
-    letter-spacing: 0.03em;
-    text-transform: uppercase;
-    color: var(--text-secondary);
-}}
-
-.sma-mermaid-legend-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
-    gap: 6px 12px;
-}}
-
-.sma-mermaid-legend-item {{
-    display: inline-flex;
-    align-items: center;
-    gap: 8px;
-    font-size: 0.78rem;
-    color: var(--text);
-}}
-
-.sma-legend-arrow {{
-    width: 40px;
-    height: 12px;
-    flex: 0 0 40px;
-    overflow: visible;
-}}
-
-.sma-legend-arrow line,
-.sma-legend-arrow polygon,
-.sma-legend-arrow polyline {{
-    stroke: currentColor;
-    fill: currentColor;
-    stroke-width: 2.3;
-    stroke-linecap: round;
-    stroke-linejoin: round;
-}}
-
-.sma-legend-arrow polyline {{
-    fill: none;
-}}
-
-.sma-legend-arrow.dashed-closed line,
-.sma-legend-arrow.contract-open line {{
-    stroke-dasharray: 6 4;
-}}
-
-.sma-legend-arrow.direct-closed {{ color: var(--mermaid-legend-direct); }}
-.sma-legend-arrow.dashed-closed {{ color: var(--mermaid-legend-dashed-closed); }}
-.sma-legend-arrow.contract-open {{ color: var(--mermaid-legend-contract); }}
-.sma-legend-arrow.solid-open {{ color: var(--mermaid-legend-solid-open); }}
-
-.sma-semantic-arrow-item .sma-semantic-arrow-icon {{
-    width: 42px;
-    height: 12px;
-    margin-right: 8px;
-    vertical-align: middle;
-}}
-
-.sma-semantic-arrow-item > span {{
-    vertical-align: middle;
-}}
-
-.sma-architecture-block {{
-    margin-top: var(--space-md);
-}}
-
-.sma-architecture-svg-wrap {{
-    border: 1px solid rgba(148, 163, 184, 0.4);
-    border-radius: 16px;
-    background: radial-gradient(circle at 20% 10%, rgba(59, 130, 246, 0.16), transparent 42%), #0b1220;
-    box-shadow: inset 0 1px 0 rgba(148, 163, 184, 0.25), 0 8px 28px rgba(15, 23, 42, 0.32);
-    padding: 12px;
-    overflow-x: auto;
-}}
-
-.sma-architecture-svg {{
-    display: block;
-    width: 100%;
-    min-width: 960px;
-    height: auto;
-}}
-
-.sma-arch-board {{
-    fill: rgba(15, 23, 42, 0.92);
-    stroke: rgba(148, 163, 184, 0.32);
-    stroke-width: 1.5;
-}}
-
-.sma-arch-layer {{
-    stroke-width: 2;
-}}
-
-.sma-arch-layer-ui {{
-    fill: rgba(29, 78, 216, 0.14);
-    stroke: #7dd3fc;
-}}
-
-.sma-arch-layer-core {{
-    fill: rgba(14, 116, 144, 0.12);
-    stroke: #67e8f9;
-}}
-
-.sma-arch-layer-app {{
-    fill: rgba(124, 58, 237, 0.1);
-    stroke: #f97316;
-}}
-
-.sma-arch-layer-infra {{
-    fill: rgba(168, 85, 247, 0.11);
-    stroke: #d8b4fe;
-}}
-
-.sma-arch-layer-label {{
-    font-family: var(--font-display);
-    font-size: 21px;
-    font-weight: 700;
-    letter-spacing: 0.02em;
-    fill: #e2e8f0;
-}}
-
-.sma-arch-node {{
-    stroke-width: 1.6;
-    fill: rgba(15, 23, 42, 0.72);
-}}
-
-.sma-arch-node-ui {{ stroke: #93c5fd; }}
-.sma-arch-node-core {{ stroke: #67e8f9; }}
-.sma-arch-node-app {{ stroke: #fb923c; }}
-.sma-arch-node-infra {{ stroke: #d8b4fe; }}
-
-.sma-arch-node-label {{
-    font-family: var(--font-body);
-    font-size: 17px;
-    font-weight: 600;
-    fill: #f8fafc;
-}}
-
-.sma-arch-edge {{
-    fill: none;
-    stroke-width: 3;
-    stroke-linecap: round;
-}}
-
-.sma-arch-edge-direct {{ stroke: #f472b6; }}
-
-.sma-arch-edge-wiring {{
-    stroke: #94a3b8;
-    stroke-dasharray: 8 6;
-}}
-
-.sma-arch-edge-contract {{
-    stroke: #60a5fa;
-    stroke-dasharray: 8 5;
-}}
-
-.sma-arch-edge-open {{ stroke: #86efac; }}
-
-.sma-arch-head-direct {{ fill: #f472b6; stroke: #f472b6; }}
-.sma-arch-head-wiring {{ fill: #94a3b8; stroke: #94a3b8; }}
-.sma-arch-head-contract {{ fill: #60a5fa; stroke: #60a5fa; }}
-.sma-arch-head-open {{
-    fill: none;
-    stroke: #86efac;
-    stroke-width: 2.2;
-    stroke-linecap: round;
-    stroke-linejoin: round;
-}}
-
-pre.mermaid {{
-    background: var(--mermaid-bg);
-    border: 1px solid var(--border);
-    border-radius: var(--radius-lg);
-    text-align: center;
-    padding: var(--space-xl);
-    box-shadow: var(--shadow);
-    overflow-x: auto;
-    overflow-y: hidden;
-}}
-
-pre.mermaid svg {{
-    max-width: 100%;
-    height: auto;
-}}
-
-html[data-theme][data-style] pre.mermaid .label,
-html[data-theme][data-style] pre.mermaid .nodeLabel,
-html[data-theme][data-style] pre.mermaid .edgeLabel,
-html[data-theme][data-style] pre.mermaid .cluster-label,
-html[data-theme][data-style] pre.mermaid text,
-html[data-theme][data-style] pre.mermaid tspan {{
-    fill: var(--mermaid-text) !important;
-    color: var(--mermaid-text) !important;
-}}
-
-html[data-theme][data-style] pre.mermaid .node rect,
-html[data-theme][data-style] pre.mermaid .node polygon,
-html[data-theme][data-style] pre.mermaid .node circle,
-html[data-theme][data-style] pre.mermaid .node ellipse,
-html[data-theme][data-style] pre.mermaid .cluster rect,
-html[data-theme][data-style] pre.mermaid .actor,
-html[data-theme][data-style] pre.mermaid .labelBox {{
-    fill: var(--mermaid-node-bg) !important;
-    stroke: var(--mermaid-node-border) !important;
-}}
-
-html[data-theme][data-style] pre.mermaid .edgePath .path,
-html[data-theme][data-style] pre.mermaid path.relation,
-html[data-theme][data-style] pre.mermaid line {{
-    stroke: var(--mermaid-line) !important;
-}}
-
-html[data-theme][data-style] pre.mermaid .messageLine0,
-html[data-theme][data-style] pre.mermaid .messageLine1,
-html[data-theme][data-style] pre.mermaid .messageLine2 {{
-    stroke: var(--mermaid-line) !important;
-    stroke-width: 2px !important;
-    opacity: 1 !important;
-}}
-
-html[data-theme][data-style] pre.mermaid .arrowheadPath,
-html[data-theme][data-style] pre.mermaid marker path,
-html[data-theme][data-style] pre.mermaid marker polygon,
-html[data-theme][data-style] pre.mermaid marker polyline {{
-    fill: var(--mermaid-line) !important;
-    stroke: var(--mermaid-line) !important;
-    opacity: 1 !important;
-}}
-
-html[data-theme][data-style] pre.mermaid .edgeLabel rect,
-html[data-theme][data-style] pre.mermaid .labelBkg {{
-    fill: var(--mermaid-label-bg) !important;
-    opacity: 1 !important;
-}}
-
-/* ============================================
-   TABLAS MODERNAS
-   ============================================ */
-table {{
-    border-collapse: separate;
-    border-spacing: 0;
-    width: 100%;
-    margin: var(--space-lg) 0;
-    font-size: 0.9rem;
-    border-radius: var(--radius-md);
-    overflow: hidden;
-    box-shadow: var(--shadow-sm);
-}}
-
-th, td {{
-    border-bottom: 1px solid var(--border);
-    padding: 12px 16px;
-    text-align: left;
-}}
-
-th {{
-    background: linear-gradient(180deg, var(--bg-surface) 0%, var(--sidebar-bg) 100%);
-    font-weight: 600;
-    color: var(--text);
-    text-transform: uppercase;
-    font-size: 0.75rem;
-    letter-spacing: 0.05em;
-    border-bottom: 2px solid var(--accent);
-}}
-
-tr:hover {{
-    background: var(--bg-surface);
-}}
-
-tr:last-child td {{
-    border-bottom: none;
-}}
-
-/* ============================================
-   LISTAS
-   ============================================ */
-ul, ol {{
-    margin: var(--space-md) 0;
-    padding-left: var(--space-xl);
-}}
-
-li {{
-    margin: var(--space-sm) 0;
-    color: var(--text-secondary);
-}}
-
-li strong {{
-    color: var(--text);
-    font-weight: 600;
-}}
-
-/* Checkboxes en listas */
-li:has(> input[type="checkbox"]) {{
-    list-style: none;
-    margin-left: -1.5em;
-}}
-
-/* ============================================
-   LINKS
-   ============================================ */
-a {{
-    color: var(--accent);
-    text-decoration: none;
-    font-weight: 500;
-    transition: color 0.15s ease;
-}}
-
-a:hover {{
-    color: var(--accent-dark);
-    text-decoration: underline;
-    text-underline-offset: 2px;
-}}
-
-/* ============================================
-   BADGE DE RUTA DE LECCIÓN
-   ============================================ */
-.lesson-path {{
-    font-size: 0.75rem;
-    color: var(--text-muted);
-    background: var(--bg-surface);
-    padding: 6px 14px;
-    border-radius: 999px;
-    display: inline-flex;
-    align-items: center;
-    gap: 6px;
-    margin-bottom: var(--space-md);
-    font-family: var(--font-mono);
-    border: 1px solid var(--border-light);
-    font-weight: 500;
-}}
-
-.lesson-path::before {{
-    content: '📁';
-    font-size: 0.9em;
-}}
-
-/* ============================================
-   CALLOUTS / BLOQUES DESTACADOS
-   ============================================ */
-/* Notas con > blockquote */
-blockquote {{
-    margin: var(--space-lg) 0;
-    padding: var(--space-md) var(--space-lg);
-    border-left: 4px solid var(--accent);
-    background: var(--accent-soft);
-    border-radius: 0 var(--radius-md) var(--radius-md) 0;
-    font-style: italic;
-    color: var(--text-secondary);
-}}
-
-blockquote p {{
-    margin: 0;
-}}
-
-/* ============================================
-   Responsive - MOBILE FIRST
-   ============================================ */
-@media (max-width: 1024px) {{
-    :root {{ --sidebar-width: 260px; }}
-    #content {{ padding: 32px 28px; }}
-}}
-
-@media (max-width: 768px) {{
-    :root {{ --sidebar-width: 0; }}
-    #sidebar {{
-        display: block;
-        width: min(86vw, 320px);
-        max-width: 320px;
-        transform: translateX(-105%);
-        transition: transform 0.22s ease;
-        box-shadow: 0 12px 36px rgba(0, 0, 0, 0.35);
-        z-index: 400;
-    }}
-    body.sidebar-open #sidebar {{
-        transform: translateX(0);
-    }}
-    #sidebar-backdrop {{
-        display: none;
-        position: fixed;
-        inset: 0;
-        background: rgba(2, 8, 23, 0.52);
-        z-index: 360;
-    }}
-    body.sidebar-open #sidebar-backdrop {{
-        display: block;
-    }}
-    body.sidebar-open {{
-        overflow: hidden;
-    }}
-    #content {{ 
-        margin-left: 0; 
-        padding: 20px 16px;
-        width: 100%;
-    }}
-    h1 {{ font-size: 1.6em; margin: 32px 0 12px; }}
-    h2 {{ font-size: 1.3em; margin: 28px 0 10px; }}
-    h3 {{ font-size: 1.1em; margin: 20px 0 8px; }}
-    h4 {{ font-size: 1em; margin: 16px 0 6px; }}
-    pre {{ padding: 0; font-size: 0.82em; }}
-    th, td {{ padding: 8px 10px; font-size: 0.85rem; }}
-}}
-
-@media (max-width: 480px) {{
-    #content {{ padding: 16px 12px; }}
-    h1 {{ font-size: 1.4em; }}
-    h2 {{ font-size: 1.2em; }}
-    pre {{ padding: 0; font-size: 0.78em; overflow-x: scroll; }}
-}}
-
-/* Dark theme */
-[data-theme="dark"] {{
-    --bg: #0d1117;
-    --text: #c9d1d9;
-    --sidebar-bg: #161b22;
-    --accent: #58a6ff;
-    --code-bg: #161b22;
-    --border: #30363d;
-}}
-
-[data-theme="dark"] h1 {{ color: #f0f6fc; }}
-[data-theme="dark"] h2 {{ color: #c9d1d9; }}
-[data-theme="dark"] h3 {{ color: #c9d1d9; }}
-[data-theme="dark"] th {{ background: #21262d; }}
-[data-theme="dark"] tr:nth-child(even) {{ background: #161b22; }}
-[data-theme="dark"] li strong {{ color: #f0f6fc; }}
-[data-theme="dark"] #sidebar a {{ color: #8b949e; }}
-[data-theme="dark"] #sidebar a:hover {{ background: #21262d; color: var(--accent); }}
-[data-theme="dark"] #sidebar li.nav-section > strong {{ color: #f0f6fc; }}
-[data-theme="dark"] .lesson-path {{ color: #8b949e; }}
-
-/* Back to top */
-#back-to-top {{
-    position: fixed;
-    bottom: 24px;
-    right: 24px;
-    background: var(--accent);
-    color: white;
-    border: none;
-    border-radius: 50%;
-    width: 44px;
-    height: 44px;
-    font-size: 1.2rem;
-    cursor: pointer;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-    display: none;
-    z-index: 200;
-}}
-
-/* Theme controls container */
-#theme-controls {{
-    position: fixed;
-    top: 16px;
-    right: 16px;
-    z-index: 9999;
-    display: flex;
-    gap: 12px;
-    align-items: center;
-}}
-
-#theme-controls button {{
-    border-radius: 8px;
-    padding: 10px 16px;
-    font-size: 0.85rem;
-    font-weight: 600;
-    cursor: pointer;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-    transition: all 0.2s ease;
-    white-space: nowrap;
-    border: 2px solid transparent;
-}}
-
-#theme-controls button:hover {{
-    transform: translateY(-1px);
-    box-shadow: 0 4px 12px rgba(0,0,0,0.4);
-}}
-
-/* Style cycle button - dynamic colors set by JS */
-#style-cycle-btn {{
-    background: #2563eb;
-    color: white;
-    border-color: #3b82f6;
-}}
-
-/* Code theme button */
-#code-theme-cycle-btn {{
-    background: var(--bg-elevated);
-    color: var(--text);
-    border-color: var(--border);
-}}
-
-/* Theme toggle button */
-#theme-toggle {{
-    background: var(--accent);
-    color: white;
-    border-color: var(--accent-light);
-}}
-
-/* Mobile responsive */
-@media (max-width: 768px) {{
-    #theme-controls {{
-        top: 12px;
-        right: 12px;
-        gap: 8px;
-    }}
-    
-    #theme-controls button {{
-        padding: 8px 12px;
-        font-size: 0.75rem;
-    }}
-}}
-
-@media (max-width: 600px) {{
-    #theme-controls {{
-        flex-direction: row;
-        align-items: center;
-        flex-wrap: nowrap;
-        gap: 6px;
-    }}
-    
-    #theme-controls button {{
-        width: auto;
-        padding: 6px 10px;
-        font-size: 0.7rem;
-    }}
-}}
-
-/* Style selector dropdowns - ensure they inherit theme colors */
-#style-selector select {{
-    background-color: var(--bg-elevated) !important;
-    color: var(--text) !important;
-    border-color: var(--border) !important;
-}}
-
-#style-selector select option {{
-    background-color: var(--bg-elevated);
-    color: var(--text);
-}}
-
-#sidebar-backdrop {{
-    display: none;
-}}
-
-#menu-toggle {{
-    display: none;
-    position: fixed;
-    top: 10px;
-    left: 10px;
-    background: var(--sidebar-bg);
-    color: var(--text);
-    border: 1px solid var(--border);
-    border-radius: 6px;
-    padding: 8px 12px;
-    font-size: 1.1rem;
-    cursor: pointer;
-    z-index: 13050;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-}}
-
-@media (max-width: 768px) {{
-    #menu-toggle {{ display: block; }}
-}}
-</style>
+<link rel="stylesheet" href="__ASSET[course-core.css]__">
 </head>
 <body>
 
@@ -1961,546 +1333,784 @@ blockquote p {{
 {body_html}
 </main>
 
-<button id="back-to-top" onclick="window.scrollTo({{top:0, behavior:'smooth'}})">&#8593;</button>
-
-<script>
-// Theme management
-function getPreferredTheme() {{
-    const saved = localStorage.getItem('course-theme');
-    if (saved) return saved;
-    return window.matchMedia('(prefers-color-scheme: dark)').matches ? 'dark' : 'light';
-}}
-
-function getPreferredStyle() {{
-    return localStorage.getItem('course-style') || 'enterprise';
-}}
-
-function getPreferredCodeTheme() {{
-    return localStorage.getItem('course-code-theme') || 'monokai';
-}}
-
-function applyStyle(style) {{
-    document.documentElement.setAttribute('data-style', style);
-    localStorage.setItem('course-style', style);
-    
-    const btn = document.getElementById('style-cycle-btn');
-    if (btn) {{
-        btn.textContent = 'Estilo: ' + style.charAt(0).toUpperCase() + style.slice(1);
-        
-        // Set button colors based on style
-        const styleColors = {{
-            'enterprise': {{ bg: '#2563eb', border: '#3b82f6', text: '#ffffff' }},
-            'bold': {{ bg: '#ff6b35', border: '#ff8c5a', text: '#ffffff' }},
-            'paper': {{ bg: '#c4956a', border: '#d4a87a', text: '#2d2419' }}
-        }};
-        
-        const colors = styleColors[style] || styleColors['enterprise'];
-        btn.style.backgroundColor = colors.bg;
-        btn.style.borderColor = colors.border;
-        btn.style.color = colors.text;
-    }}
-}}
-
-function cycleStyle() {{
-    const styles = ['enterprise', 'bold', 'paper'];
-    const current = document.documentElement.getAttribute('data-style') || 'enterprise';
-    const currentIndex = styles.indexOf(current);
-    const nextIndex = (currentIndex + 1) % styles.length;
-    const nextStyle = styles[nextIndex];
-    applyStyle(nextStyle);
-    renderMermaid();
-}}
-
-function applyCodeTheme(theme) {{
-    localStorage.setItem('course-code-theme', theme);
-    const btn = document.getElementById('code-theme-cycle-btn');
-    if (btn) {{
-        btn.textContent = 'Codigo: ' + theme.charAt(0).toUpperCase() + theme.slice(1).replace(/-/g, ' ');
-    }}
-    
-    const hljsLink = document.getElementById('hljs-theme');
-    const themeMap = {{
-        'monokai': 'monokai.min.css',
-        'github': 'github.min.css',
-        'github-dark': 'github-dark.min.css',
-        'atom-one-dark': 'atom-one-dark.min.css'
-    }};
-    hljsLink.href = `https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/styles/${{themeMap[theme] || 'monokai.min.css'}}`;
-    
-    const highlightedBlocks = document.querySelectorAll('pre code[data-highlighted]');
-    if (typeof hljs !== 'undefined') {{
-        highlightedBlocks.forEach(block => {{
-            block.removeAttribute('data-highlighted');
-            hljs.highlightElement(block);
-        }});
-    }}
-    enhanceCodeBlocksFrom(highlightedBlocks);
-}}
-
-let mermaidLoadPromise = null;
-let highlightLoadPromise = null;
-
-function loadExternalScript(src) {{
-    return new Promise((resolve, reject) => {{
-        if (!src) {{
-            reject(new Error('missing-script-src'));
-            return;
-        }}
-
-        const selector = `script[data-sma-src="${{src}}"]`;
-        const existing = document.querySelector(selector);
-        if (existing) {{
-            if (existing.dataset.loaded === '1') {{
-                resolve();
-                return;
-            }}
-            existing.addEventListener('load', () => resolve(), {{ once: true }});
-            existing.addEventListener('error', () => reject(new Error(`script-load-failed:${{src}}`)), {{ once: true }});
-            return;
-        }}
-
-        const script = document.createElement('script');
-        script.src = src;
-        script.async = true;
-        script.dataset.smaSrc = src;
-        script.addEventListener('load', () => {{
-            script.dataset.loaded = '1';
-            resolve();
-        }}, {{ once: true }});
-        script.addEventListener('error', () => reject(new Error(`script-load-failed:${{src}}`)), {{ once: true }});
-        document.head.appendChild(script);
-    }});
-}}
-
-function ensureMermaidLoaded() {{
-    if (typeof mermaid !== 'undefined') return Promise.resolve();
-    if (!mermaidLoadPromise) {{
-        mermaidLoadPromise = loadExternalScript(window.__SMA_MERMAID_SRC).then(() => {{
-            if (typeof mermaid === 'undefined') {{
-                throw new Error('mermaid-unavailable');
-            }}
-        }});
-    }}
-    return mermaidLoadPromise;
-}}
-
-function ensureHighlightLoaded() {{
-    if (typeof hljs !== 'undefined') return Promise.resolve();
-    if (!highlightLoadPromise) {{
-        highlightLoadPromise = loadExternalScript(window.__SMA_HLJS_CORE_SRC)
-            .then(() => loadExternalScript(window.__SMA_HLJS_LANG_SRC))
-            .then(() => {{
-                if (typeof hljs === 'undefined') {{
-                    throw new Error('hljs-unavailable');
-                }}
-            }});
-    }}
-    return highlightLoadPromise;
-}}
-
-function detectSnippetLang(codeEl) {{
-    const className = (codeEl.className || '').toLowerCase();
-    if (className.includes('language-kotlin') || className.includes('language-kt')) return 'KT';
-    if (className.includes('language-swift')) return 'Swift';
-    if (className.includes('language-js') || className.includes('language-javascript')) return 'JS';
-    if (className.includes('language-ts') || className.includes('language-typescript')) return 'TS';
-    if (className.includes('language-json')) return 'JSON';
-    if (className.includes('language-bash') || className.includes('language-shell')) return 'SH';
-    if (className.includes('language-yaml') || className.includes('language-yml')) return 'YAML';
-    if (className.includes('language-python') || className.includes('language-py')) return 'PY';
-    if (className.includes('language-mermaid')) return 'Mermaid';
-    if (className.includes('language-xml') || className.includes('language-html')) return 'XML';
-    if (className.includes('language-sql')) return 'SQL';
-    if (className.includes('language-markdown') || className.includes('language-md')) return 'MD';
-    if (className.includes('language-gherkin') || className.includes('language-feature')) return 'Gherkin';
-
-    const content = (codeEl.textContent || '').trim();
-    if (!content) return 'TXT';
-
-    if (
-        content.startsWith('flowchart') ||
-        content.startsWith('sequenceDiagram') ||
-        content.startsWith('classDiagram') ||
-        content.startsWith('stateDiagram') ||
-        content.startsWith('erDiagram')
-    ) return 'Mermaid';
-
-    if (/^(\\$\\s*)?(gradlew|adb|emulator|kotlin|ktlint|detekt|git|npm|node|python3|bash|sh)\\b/m.test(content)) return 'SH';
-    if (/^\\s*(package\\s+[a-zA-Z0-9_.]+|import\\s+[a-zA-Z0-9_.]+|data\\s+class\\s+\\w+|sealed\\s+(class|interface)\\s+\\w+|@Composable|class\\s+\\w+)/m.test(content)) return 'KT';
-    if (/^\\s*(\\{{|\\[\\s*\\{{|\"[^\"]+\"\\s*:)/m.test(content)) return 'JSON';
-    if (/^\\s*[a-zA-Z0-9_-]+\\s*:\\s*.+$/m.test(content) && !/;\\s*$/m.test(content)) return 'YAML';
-    if (/^\\s*SELECT\\b|^\\s*INSERT\\b|^\\s*UPDATE\\b|^\\s*DELETE\\b|^\\s*CREATE\\s+TABLE\\b/im.test(content)) return 'SQL';
-    if (/^\\s*<[^>]+>/m.test(content)) return 'XML';
-
-    return 'TXT';
-}}
-
-function copyCodeToClipboard(text) {{
-    if (navigator.clipboard && navigator.clipboard.writeText) {{
-        return navigator.clipboard.writeText(text);
-    }}
-    return new Promise((resolve, reject) => {{
-        try {{
-            const ta = document.createElement('textarea');
-            ta.value = text;
-            ta.setAttribute('readonly', 'readonly');
-            ta.style.position = 'fixed';
-            ta.style.left = '-9999px';
-            document.body.appendChild(ta);
-            ta.select();
-            const ok = document.execCommand('copy');
-            document.body.removeChild(ta);
-            if (ok) resolve();
-            else reject(new Error('copy-failed'));
-        }} catch (err) {{
-            reject(err);
-        }}
-    }});
-}}
-
-function enhanceCodeBlocks() {{
-    enhanceCodeBlocksFrom(document.querySelectorAll('pre code'));
-}}
-
-function enhanceCodeBlocksFrom(codes) {{
-    Array.from(codes || []).forEach(code => {{
-        const pre = code.closest('pre');
-        if (!pre || pre.classList.contains('mermaid')) return;
-        if (pre.dataset.codeEnhanced === '1') return;
-        pre.dataset.codeEnhanced = '1';
-        pre.classList.add('sma-code-enhanced');
-
-        const tools = document.createElement('div');
-        tools.className = 'sma-code-tools';
-
-        const lang = document.createElement('span');
-        lang.className = 'sma-code-lang';
-        lang.textContent = detectSnippetLang(code);
-
-        const copyBtn = document.createElement('button');
-        copyBtn.type = 'button';
-        copyBtn.className = 'sma-code-copy-btn';
-        copyBtn.textContent = 'Copiar';
-        copyBtn.setAttribute('aria-label', `Copiar snippet ${lang.textContent}`);
-        copyBtn.addEventListener('click', () => {{
-            const originalText = copyBtn.textContent;
-            copyCodeToClipboard(code.textContent || '')
-                .then(() => {{
-                    copyBtn.textContent = 'Copiado';
-                    setTimeout(() => {{ copyBtn.textContent = originalText; }}, 1200);
-                }})
-                .catch(() => {{
-                    copyBtn.textContent = 'Error';
-                    setTimeout(() => {{ copyBtn.textContent = originalText; }}, 1200);
-                }});
-        }});
-
-        tools.appendChild(lang);
-        tools.appendChild(copyBtn);
-        pre.appendChild(tools);
-    }});
-}}
-
-function highlightCodeBlock(block) {{
-    if (!block || block.dataset.highlighted === '1') return;
-    if (typeof hljs === 'undefined') {{
-        enhanceCodeBlocksFrom([block]);
-        return;
-    }}
-    hljs.highlightElement(block);
-    block.dataset.highlighted = '1';
-    enhanceCodeBlocksFrom([block]);
-}}
-
-async function initCodeHighlighting() {{
-    const blocks = Array.from(document.querySelectorAll('pre code'));
-    if (!blocks.length) return;
-
-    try {{
-        await ensureHighlightLoaded();
-    }} catch (error) {{
-        console.warn('Highlight.js no cargado.', error);
-        enhanceCodeBlocksFrom(blocks);
-        return;
-    }}
-
-    const warmup = blocks.slice(0, 16);
-    warmup.forEach(highlightCodeBlock);
-
-    if (!('IntersectionObserver' in window)) {{
-        blocks.forEach(highlightCodeBlock);
-        return;
-    }}
-
-    const codeObserver = new IntersectionObserver((entries, observerRef) => {{
-        entries.forEach(entry => {{
-            if (!entry.isIntersecting) return;
-            highlightCodeBlock(entry.target);
-            observerRef.unobserve(entry.target);
-        }});
-    }}, {{ rootMargin: '360px 0px' }});
-
-    blocks.forEach(block => {{
-        if (block.dataset.highlighted === '1') return;
-        codeObserver.observe(block);
-    }});
-}}
-
-function cycleCodeTheme() {{
-    const themes = ['monokai', 'github', 'github-dark', 'atom-one-dark'];
-    const current = localStorage.getItem('course-code-theme') || 'monokai';
-    const currentIndex = themes.indexOf(current);
-    const nextIndex = (currentIndex + 1) % themes.length;
-    const nextTheme = themes[nextIndex];
-    applyCodeTheme(nextTheme);
-}}
-
-function applyTheme(theme) {{
-    document.documentElement.setAttribute('data-theme', theme);
-    localStorage.setItem('course-theme', theme);
-    const btn = document.getElementById('theme-toggle');
-    btn.textContent = theme === 'dark' ? 'Tema: Oscuro' : 'Tema: Claro';
-    btn.title = theme === 'dark' ? 'Cambiar a tema claro' : 'Cambiar a tema oscuro';
-    // Keep code theme as selected, don't override
-}}
-
-function toggleTheme() {{
-    const current = document.documentElement.getAttribute('data-theme') || 'light';
-    applyTheme(current === 'dark' ? 'light' : 'dark');
-    renderMermaid();
-}}
-
-// Apply saved preferences immediately
-applyStyle(getPreferredStyle());
-applyCodeTheme(getPreferredCodeTheme());
-applyTheme(getPreferredTheme());
-
-function currentMermaidTheme() {{
-    const theme = document.documentElement.getAttribute('data-theme') || 'light';
-    return theme === 'dark' ? 'dark' : 'default';
-}}
-
-async function renderMermaid() {{
-    try {{
-        await ensureMermaidLoaded();
-    }} catch (error) {{
-        console.warn('Mermaid no cargado. Revisa conexión a internet/CDN.', error);
-        return;
-    }}
-
-    const blocks = Array.from(document.querySelectorAll('pre.mermaid'));
-    if (!blocks.length) return;
-
-    blocks.forEach(function(el) {{
-        if (!el.dataset.originalMermaid) {{
-            el.dataset.originalMermaid = (el.textContent || '').trimEnd();
-        }}
-        if (el.dataset.originalMermaid) {{
-            el.innerHTML = '';
-            el.textContent = el.dataset.originalMermaid;
-        }}
-        el.dataset.mermaidRendered = '0';
-        el.removeAttribute('data-processed');
-    }});
-
-    mermaid.initialize({{
-        startOnLoad: false,
-        theme: currentMermaidTheme(),
-        securityLevel: 'loose'
-    }});
-
-    function renderNode(el) {{
-        if (!el || el.dataset.mermaidRendered === '1') return;
-        mermaid.run({{ nodes: [el] }})
-            .then(function() {{
-                el.dataset.mermaidRendered = '1';
-            }})
-            .catch(function() {{}});
-    }}
-
-    blocks.slice(0, 3).forEach(renderNode);
-
-    if (!('IntersectionObserver' in window)) {{
-        blocks.forEach(renderNode);
-        return;
-    }}
-
-    const mermaidObserver = new IntersectionObserver((entries, observerRef) => {{
-        entries.forEach(entry => {{
-            if (!entry.isIntersecting) return;
-            renderNode(entry.target);
-            observerRef.unobserve(entry.target);
-        }});
-    }}, {{ rootMargin: '420px 0px' }});
-
-    blocks.forEach(el => {{
-        if (el.dataset.mermaidRendered === '1') return;
-        mermaidObserver.observe(el);
-    }});
-}}
-
-function bootCourseRenderers() {{
-    renderMermaid();
-    initCodeHighlighting();
-    document.body.classList.add('sma-hydrated');
-}}
-
-if (document.readyState === 'loading') {{
-    document.addEventListener('DOMContentLoaded', bootCourseRenderers, {{ once: true }});
-}} else {{
-    bootCourseRenderers();
-}}
-
-// Back to top button
-window.addEventListener('scroll', () => {{
-    const btn = document.getElementById('back-to-top');
-    btn.style.display = window.scrollY > 400 ? 'block' : 'none';
-}});
-
-// Active nav highlight
-const sections = document.querySelectorAll('section.lesson');
-const navLinks = document.querySelectorAll('#sidebar a');
-
-const observer = new IntersectionObserver(entries => {{
-    entries.forEach(entry => {{
-        if (entry.isIntersecting) {{
-            navLinks.forEach(link => link.style.fontWeight = 'normal');
-            const active = document.querySelector(`#sidebar a[href="#${{entry.target.id}}"]`);
-            if (active) active.style.fontWeight = '700';
-        }}
-    }});
-}}, {{ rootMargin: '-20% 0px -70% 0px' }});
-
-sections.forEach(s => observer.observe(s));
-
-// Mobile sidebar toggle
-function toggleSidebar() {{
-    if (window.innerWidth > 768) return;
-    document.body.classList.toggle('sidebar-open');
-}}
-
-function closeSidebar() {{
-    document.body.classList.remove('sidebar-open');
-}}
-
-// Close sidebar when clicking a link on mobile
-document.querySelectorAll('#sidebar a').forEach(link => {{
-    link.addEventListener('click', () => {{
-        if (window.innerWidth <= 768) {{
-            closeSidebar();
-        }}
-    }});
-}});
-
-document.addEventListener('keydown', event => {{
-    if (event.key === 'Escape') closeSidebar();
-}});
-
-window.addEventListener('resize', () => {{
-    if (window.innerWidth > 768) closeSidebar();
-}});
-
-// Sidebar search/filter
-const sidebarSearchInput = document.getElementById('sidebar-search');
-const sidebarSearchCount = document.getElementById('sidebar-search-count');
-
-function normalizeSearchText(value) {{
-    return (value || '')
-        .toLowerCase()
-        .normalize('NFD')
-        .replace(/[\u0300-\u036f]/g, '');
-}}
-
-function applySidebarSearch() {{
-    if (!sidebarSearchInput) return;
-    const query = normalizeSearchText(sidebarSearchInput.value.trim());
-    const sections = document.querySelectorAll('#sidebar li.nav-section');
-    let visibleLessons = 0;
-
-    sections.forEach(section => {{
-        const sectionTitle = section.querySelector(':scope > strong');
-        const sectionLabel = normalizeSearchText(sectionTitle ? sectionTitle.textContent : '');
-        const links = section.querySelectorAll('a.doc-nav-link');
-        let sectionHasVisible = false;
-
-        links.forEach(link => {{
-            const item = link.closest('li');
-            if (!item) return;
-            const lessonPath = normalizeSearchText(link.dataset.lessonPath || '');
-            const lessonTitle = normalizeSearchText(link.textContent || '');
-            const match = !query || lessonTitle.includes(query) || lessonPath.includes(query) || sectionLabel.includes(query);
-            item.style.display = match ? '' : 'none';
-            if (match) {{
-                sectionHasVisible = true;
-                visibleLessons += 1;
-            }}
-        }});
-
-        section.style.display = sectionHasVisible ? '' : 'none';
-    }});
-
-    if (sidebarSearchCount) {{
-        if (!query) {{
-            sidebarSearchCount.textContent = '';
-        }} else if (visibleLessons === 1) {{
-            sidebarSearchCount.textContent = '1 resultado';
-        }} else {{
-            sidebarSearchCount.textContent = `${{visibleLessons}} resultados`;
-        }}
-    }}
-}}
-
-if (sidebarSearchInput) {{
-    sidebarSearchInput.addEventListener('input', applySidebarSearch);
-    sidebarSearchInput.addEventListener('keydown', event => {{
-        if (event.key === 'Escape') {{
-            sidebarSearchInput.value = '';
-            applySidebarSearch();
-            sidebarSearchInput.blur();
-        }}
-    }});
-    applySidebarSearch();
-}}
-</script>
+<button id="back-to-top" onclick="window.scrollTo({top:0, behavior:'smooth'})">&#8593;</button>
+
+{highlight_loader}<script src="__ASSET[course-core.js]__"></script>
 
 </body>
 </html>"""
 
-    # This template includes lots of CSS/JS braces. We keep the template as a
-    # plain string, unescape doubled braces from previous formatting, then inject
-    # dynamic sections explicitly.
-    html = html_template.replace("{{", "{").replace("}}", "}")
-    html = html.replace("__ASSET_VERSION__", asset_version)
-    html = html.replace("{nav}", nav).replace("{body_html}", body_html)
 
+# Only emitted when some code block was left for highlight.js (see iter_document_parts).
+HIGHLIGHT_LOADER = """<script>window.__SMA_HLJS_CORE_SRC = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/highlight.min.js";</script>
+<script>window.__SMA_HLJS_LANG_SRC = "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.9.0/languages/kotlin.min.js";</script>
+"""
+UNHIGHLIGHTED_CODE_RE = re.compile(r"<pre><code(?![^>]*\bdata-highlighted=)")
+
+
+def fingerprinted_name(name: str, payload: bytes) -> str:
+    """<stem>.<hash><ext>: el nombre cambia solo si cambia el contenido (se puede servir como inmutable)."""
+    stem, suffix = Path(name).stem, Path(name).suffix
+    return f"{stem}.{hashlib.sha256(payload).hexdigest()[:12]}{suffix}"
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src: Path, target: Path) -> bool:
+    """Clona src en target sin copiar datos (FICLONE, btrfs/XFS en Linux); False si no se puede."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with src.open("rb") as source, target.open("wb") as destination:
+            fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+    except OSError:
+        target.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, target)
+    return True
+
+
+def file_in_sync(src: Path, target: Path, mode: str = "copy") -> bool:
+    """True si target ya tiene el contenido de src.
+
+    Primero tamano y mtime (copy2 conserva el mtime); si solo difiere el mtime
+    se comparan los hashes y, si coinciden, se alinea el mtime para que el
+    siguiente build no vuelva a leerlos. En modo hardlink target tiene que ser
+    el mismo archivo que src; en los demas modos, justo lo contrario.
+    """
+    try:
+        target_stat = target.stat()
+    except OSError:
+        return False
+    src_stat = src.stat()
+    # A hardlink left by a previous --asset-sync hardlink build is replaced by a real copy.
+    if (src_stat.st_dev, src_stat.st_ino) == (target_stat.st_dev, target_stat.st_ino):
+        return mode == "hardlink"
+    if mode == "hardlink" or src_stat.st_size != target_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == target_stat.st_mtime_ns:
+        return True
+    if _file_sha256(src) != _file_sha256(target):
+        return False
+    os.utime(target, ns=(target_stat.st_atime_ns, src_stat.st_mtime_ns))
+    return True
+
+
+def place_file(src: Path, target: Path, mode: str = "copy") -> None:
+    """Pone src en target (copia, hardlink o reflink) de forma atomica.
+
+    hardlink y reflink caen a una copia normal si el sistema de archivos no
+    los admite (otro volumen, macOS, ext4...).
+    """
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        placed = False
+        if mode == "hardlink":
+            try:
+                os.link(src, tmp_path)
+                placed = True
+            except OSError:
+                pass
+        elif mode == "reflink":
+            placed = _reflink(src, tmp_path)
+        if not placed:
+            shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def sync_files(plan: dict, target_dir: Path, mode: str = "copy", prune: bool = True) -> dict:
+    """Sincroniza target_dir con plan ({nombre en target_dir: Path de origen}).
+
+    Solo escribe los archivos que cambiaron y, con prune, borra de target_dir
+    lo que no esta en el plan (ni es el .gz de algo del plan). Devuelve {"copied": [...], "unchanged": [...],
+    "removed": [...]} con nombres ordenados.
+    """
+    report = {"copied": [], "unchanged": [], "removed": []}
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for name in sorted(plan):
+        target = target_dir / name
+        if file_in_sync(plan[name], target, mode):
+            report["unchanged"].append(name)
+        else:
+            place_file(plan[name], target, mode)
+            report["copied"].append(name)
+    if prune:
+        for entry in sorted(target_dir.iterdir()):
+            if entry.name not in plan and entry.name.removesuffix(".gz") not in plan and entry.is_file():
+                entry.unlink()
+                report["removed"].append(entry.name)
+    return report
+
+
+def read_asset_sources() -> dict:
+    """{nombre: bytes} de los assets de PAGE_ASSETS y CORE_ASSETS que existen en assets/."""
+    sources = {}
+    for name in PAGE_ASSETS + CORE_ASSETS:
+        try:
+            sources[name] = (ASSETS_SRC_DIR / name).read_bytes()
+        except OSError:
+            pass
+    return sources
+
+
+def optimized_asset(name: str, payload: bytes) -> Path:
+    """Version minificada de un asset, guardada en dist/.cache/optimize por hash del contenido.
+
+    dist/assets se sincroniza desde esa copia: mientras el asset no cambie es
+    el mismo archivo (mismo mtime) y el build no lo vuelve a escribir.
+    """
+    stamp = hashlib.sha256(Path(course_optimize.__file__).read_bytes() + payload).hexdigest()[:16]
+    target = OPTIMIZE_CACHE_DIR / f"{stamp}-{name}"
+    if not target.is_file():
+        minify = minify_for(name)
+        minified = minify(payload.decode("utf-8")).encode("utf-8") if minify else payload
+        OPTIMIZE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(minified)
+        os.replace(tmp_path, target)
+    return target
+
+
+def publish_assets(sources: dict, mode: str = "copy", optimize: bool = False, sizes=None) -> dict:
+    """Sincroniza dist/assets con assets/ y devuelve {nombre: URL} con el hash de cada uno.
+
+    Cada asset lleva la version de su propio contenido: editar study-ux.js no
+    cambia la URL de los demas. Los CORE_ASSETS van con el hash en el nombre;
+    el resto conserva su nombre (el hub y los enlaces externos lo usan) con
+    ?v=<hash>. Solo se copian los archivos que cambiaron y se borra de
+    dist/assets todo lo que ya no se publica (versiones viejas incluidas).
+
+    Con optimize se publica la version minificada (ver optimized_asset) y, si
+    se pasa sizes, se anota {ruta en dist: [bytes originales, bytes publicados]}.
+    El hash sale siempre de los bytes publicados: la misma URL nunca sirve dos
+    contenidos, aunque cambie el flag o el minificador.
+    """
+    plan = {}
+    urls = {}
+    for name, payload in sources.items():
+        source = optimized_asset(name, payload) if optimize else ASSETS_SRC_DIR / name
+        published_payload = source.read_bytes() if optimize else payload
+        if name in CORE_ASSETS:
+            published = fingerprinted_name(name, published_payload)
+            urls[name] = f"{ASSETS_DIST_DIR.name}/{published}"
+        else:
+            published = name
+            urls[name] = f"{ASSETS_DIST_DIR.name}/{name}?v={hashlib.sha256(published_payload).hexdigest()[:12]}"
+        plan[published] = source
+        if sizes is not None:
+            sizes[f"{ASSETS_DIST_DIR.name}/{published}"] = [len(payload), len(published_payload)]
+    if optimize:
+        evict_cache_entries(OPTIMIZE_CACHE_DIR, {path.name for path in plan.values()}, "")
+    report = sync_files(plan, ASSETS_DIST_DIR, mode)
+    print(
+        f"  Assets: {len(report['copied'])} copiados, {len(report['unchanged'])} sin cambios, "
+        f"{len(report['removed'])} eliminados"
+        + (f" ({', '.join(report['copied'] + report['removed'])})" if report["copied"] or report["removed"] else "")
+    )
+    return urls
+
+
+def split_html_template(asset_urls: dict) -> tuple[str, str, str]:
+    """Devuelve la plantilla partida alrededor de {nav} y {body_html}: (cabecera, medio, cola).
+
+    asset_urls da la URL versionada de cada asset (ver publish_assets); un
+    asset que no existe en assets/ se enlaza sin version.
+    """
+    # The template is a plain string (no str.format): dynamic parts are
+    # placeholders replaced here or split on below.
+    template = ASSET_PLACEHOLDER_RE.sub(
+        lambda match: asset_urls.get(match.group(1), f"{ASSETS_DIST_DIR.name}/{match.group(1)}"),
+        HTML_TEMPLATE,
+    )
+    head, rest = template.split("{nav}", 1)
+    middle, tail = rest.split("{body_html}", 1)
+    return head, middle, tail
+
+
+def write_lesson_fragment(file_id: str, fragment_html: str) -> str:
+    """Escribe dist/lessons/<file_id>.<hash>.html si no existe y devuelve su nombre.
+
+    El hash es del contenido, asi que un fragmento publicado nunca cambia y se
+    puede cachear sin limite.
+    """
+    payload = fragment_html.encode("utf-8")
+    name = f"{file_id}.{hashlib.sha256(payload).hexdigest()[:12]}.html"
+    target = LESSONS_DIST_DIR / name
+    if not target.is_file():
+        LESSONS_DIST_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, target)
+    return name
+
+
+def prune_lesson_fragments(live_names) -> int:
+    """Borra de dist/lessons los fragmentos que no estan en live_names (todos, fuera de --split)."""
+    if not LESSONS_DIST_DIR.is_dir():
+        return 0
+    pruned = 0
+    for entry in LESSONS_DIST_DIR.iterdir():
+        if entry.name.removesuffix(".gz") in live_names:
+            continue
+        try:
+            entry.unlink()
+            pruned += 1
+        except OSError:
+            pass
+    if not live_names:
+        try:
+            LESSONS_DIST_DIR.rmdir()
+        except OSError:
+            pass
+    return pruned
+
+
+def iter_document_parts(rendered_lessons, nav: str, asset_urls: dict, fragment_names=None, minify=None):
+    """Genera el documento final por trozos, en orden, sin copiar nunca el HTML completo.
+
+    rendered_lessons es un iterable de (ruta, html de la leccion). Si se pasa
+    fragment_names (un set), cada leccion se escribe como fragmento en
+    dist/lessons, su nombre se anade al set y el documento solo lleva la
+    <section> vacia con data-fragment: study-ux.js la carga al abrirla.
+    minify (p. ej. minify_html) se aplica a cada trozo y a cada fragmento.
+    La cola lleva HIGHLIGHT_LOADER solo si alguna leccion tiene bloques de
+    codigo sin resaltar en build.
+    """
+    if minify is None:
+        minify = str
+    needs_highlight_js = False
+    with stage("template"):
+        head, middle, tail = split_html_template(asset_urls)
+    yield minify(head)
+    yield minify(nav)
+    yield minify(middle)
+    for filepath, lesson_html in rendered_lessons:
+        file_id = file_id_for(filepath)
+        section_attrs = f'id="{file_id}" class="lesson" data-topic-id="{file_id}" data-lesson-path="{filepath}"'
+        lesson_path = f'<div class="lesson-path">{filepath}</div>\n'
+        if not needs_highlight_js and UNHIGHLIGHTED_CODE_RE.search(lesson_html):
+            needs_highlight_js = True
+        if fragment_names is not None:
+            name = write_lesson_fragment(file_id, minify(lesson_path + lesson_html))
+            fragment_names.add(name)
+            yield f'<section {section_attrs} data-fragment="{LESSONS_DIST_DIR.name}/{name}"></section>\n'
+            continue
+        yield f"<section {section_attrs}>\n{lesson_path}"
+        yield minify(lesson_html)
+        yield "</section>\n"
+    yield minify(tail.replace("{highlight_loader}", HIGHLIGHT_LOADER if needs_highlight_js else "", 1))
+
+
+def precompress_outputs(enabled: bool) -> dict:
+    """Escribe <archivo>.gz junto a cada HTML/CSS/JS/JSON/SVG de dist/ y devuelve {ruta: bytes del .gz}.
+
+    Cada .gz lleva el mtime de su archivo, asi que solo se recomprime lo que
+    cambio desde el build anterior. Los .gz huerfanos se borran, y todos si
+    enabled es False: un .gz viejo junto a un archivo nuevo serviria el
+    contenido equivocado.
+    """
+    compressed = {}
+    for path in sorted(OUTPUT_DIR.rglob("*.gz")):
+        if CACHE_DIR in path.parents:
+            continue
+        if not enabled or not path.with_suffix("").is_file():
+            path.unlink()
+    if not enabled:
+        return compressed
+    for relative, path in iter_output_files():
+        if not relative.endswith(PRECOMPRESS_SUFFIXES) or path.name == VERCEL_CONFIG_SRC.name:
+            continue
+        target = path.with_name(f"{path.name}.gz")
+        source_stat = path.stat()
+        try:
+            target_stat = target.stat()
+        except OSError:
+            target_stat = None
+        if target_stat is None or target_stat.st_mtime_ns != source_stat.st_mtime_ns:
+            tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(gzip_bytes(path.read_bytes()))
+            os.utime(tmp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+            os.replace(tmp_path, target)
+        compressed[relative] = target.stat().st_size
+    return compressed
+
+
+def print_size_report(sizes: dict, compressed: dict, labels: dict) -> None:
+    """Tabla por artefacto: bytes originales, minificados y en .gz.
+
+    sizes: {etiqueta: [original, minificado]}; compressed: {ruta: bytes .gz}
+    (ver precompress_outputs); labels agrupa rutas bajo una etiqueta (todos los
+    shards del indice en una fila, por ejemplo). Lo que no esta en sizes no se
+    minifica: original y minificado son su tamano en dist/.
+    """
+    rows = {}
+    for relative, compressed_bytes in compressed.items():
+        label = labels.get(relative, relative)
+        if label is None:
+            continue
+        row = rows.setdefault(label, [0, 0, 0])
+        if label not in sizes:
+            size = (OUTPUT_DIR / relative).stat().st_size
+            row[0] += size
+            row[1] += size
+        row[2] += compressed_bytes
+    for label, (original, minified) in sizes.items():
+        if label in rows:
+            rows[label][:2] = [original, minified]
+    print("  Tamanos (--optimize):")
+    for line in format_size_report([(label, *row) for label, row in sorted(rows.items())]):
+        print(line)
+
+
+def build_inputs_key(
+    documents, asset_sources: dict, plugins=(), split: bool = False, optimize: bool = False, asset_sync: str = "copy"
+) -> str:
+    """Huella de todo lo que determina dist/: mismas entradas, mismos bytes de salida.
+
+    Incluye asset_sync: los bytes son los mismos, pero cambiar de copia a
+    hardlink/reflink tiene que volver a sincronizar los assets.
+    """
+    digest = hashlib.sha256(
+        f"manifest-v{ASSET_MANIFEST_VERSION}\nsplit={int(split)}\noptimize={int(optimize)}\n"
+        f"asset_sync={asset_sync}\n".encode("utf-8")
+    )
+    digest.update(renderer_stamp(plugins).encode("utf-8"))
+    digest.update(Path(course_search.__file__).read_bytes())
+    digest.update(Path(course_optimize.__file__).read_bytes())
+    for document in documents:
+        digest.update(f"{document.path}\0{document.digest}\0".encode("utf-8"))
+    for name in sorted(asset_sources):
+        digest.update(f"{name}\0{hashlib.sha256(asset_sources[name]).hexdigest()}\0".encode("utf-8"))
+    if VERCEL_CONFIG_SRC.exists():
+        digest.update(VERCEL_CONFIG_SRC.read_bytes())
+    return digest.hexdigest()
+
+
+def iter_output_files():
+    """Archivos publicados en dist/ (sin la cache ni el propio manifest), en orden estable."""
+    for path in sorted(OUTPUT_DIR.rglob("*")):
+        relative = path.relative_to(OUTPUT_DIR)
+        if relative.parts[0] == CACHE_DIR.name or path == ASSET_MANIFEST_FILE or not path.is_file():
+            continue
+        yield relative.as_posix(), path
+
+
+def write_asset_manifest(build_key: str, asset_urls: dict) -> None:
+    """Escribe dist/asset-manifest.json: URL de cada asset y hash/tamano de cada archivo publicado.
+
+    Un deploy puede comparar "files" con el del deploy anterior y subir solo
+    lo que cambio; "build" es la huella de las entradas (build_inputs_key).
+    """
+    files = {}
+    mtimes = {}
+    for relative, path in iter_output_files():
+        mtimes[relative] = path.stat().st_mtime_ns
+        payload = path.read_bytes()
+        files[relative] = {"sha256": hashlib.sha256(payload).hexdigest(), "bytes": len(payload)}
+    store_output_mtimes(mtimes)
+    manifest = {
+        "version": ASSET_MANIFEST_VERSION,
+        "build": build_key,
+        "assets": dict(sorted(asset_urls.items())),
+        "files": files,
+    }
+    payload = (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8")
+    try:
+        if ASSET_MANIFEST_FILE.read_bytes() == payload:
+            return
+    except OSError:
+        pass
+    ASSET_MANIFEST_FILE.write_bytes(payload)
+
+
+def load_output_mtimes() -> dict:
+    try:
+        mtimes = json.loads(OUTPUT_STAT_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return mtimes if isinstance(mtimes, dict) else {}
+
+
+def store_output_mtimes(mtimes: dict) -> None:
+    # Kept out of the manifest: mtimes differ between machines, the manifest must not.
+    OUTPUT_STAT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_STAT_FILE.write_text(json.dumps(mtimes, sort_keys=True), encoding="utf-8")
+
+
+def is_build_current(build_key: str) -> bool:
+    """dist/ ya es la salida de estas entradas: mismo build_key y ningun archivo publicado falta o cambio.
+
+    Un archivo con el mismo tamano y el mismo st_mtime_ns que cuando se
+    comprobo su hash se da por bueno; si el mtime cambio, se compara su
+    sha256 con el del manifest (una edicion a mano del mismo tamano no pasa).
+    """
+    try:
+        manifest = json.loads(ASSET_MANIFEST_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if manifest.get("version") != ASSET_MANIFEST_VERSION or manifest.get("build") != build_key:
+        return False
+    mtimes = load_output_mtimes()
+    rehashed = False
+    for relative, entry in manifest.get("files", {}).items():
+        path = OUTPUT_DIR / relative
+        try:
+            stat = path.stat()
+            if stat.st_size != entry["bytes"]:
+                return False
+            if mtimes.get(relative) == stat.st_mtime_ns:
+                continue
+            if hashlib.sha256(path.read_bytes()).hexdigest() != entry["sha256"]:
+                return False
+        except (OSError, KeyError, TypeError):
+            return False
+        mtimes[relative] = stat.st_mtime_ns
+        rehashed = True
+    if rehashed:
+        store_output_mtimes(mtimes)
+    return True
+
+
+def build_html(
+    use_cache: bool = True,
+    rebuild: bool = False,
+    jobs: int = 1,
+    plugins=(),
+    split: bool = False,
+    asset_sync: str = "copy",
+    optimize: bool = False,
+    skip_unchanged: bool = True,
+):
+    """Construye el HTML completo.
+
+    use_cache=False desactiva la cache de render en disco; rebuild=True ignora
+    las entradas existentes y las regenera. jobs > 1 renderiza en paralelo las
+    lecciones que no estan en cache. plugins son archivos .py que registran
+    render hooks propios (ver register_render_hook). split=True escribe una
+    pagina con el indice y un fragmento por leccion en dist/lessons.
+    asset_sync ("copy", "hardlink" o "reflink") dice como se llevan los
+    assets que cambiaron a dist/assets (ver sync_files). optimize=True
+    minifica HTML, CSS y JS, escribe un .gz junto a cada artefacto y muestra
+    una tabla de tamanos antes/despues.
+
+    Si dist/asset-manifest.json dice que dist/ ya es la salida de estas
+    mismas entradas (ver build_inputs_key), no se escribe nada (salvo con
+    skip_unchanged=False). Devuelve esa huella: cambia si y solo si cambia
+    dist/.
+    """
+    load_render_plugins(plugins)
+    HIGHLIGHT_CACHE_SETTINGS.update(enabled=use_cache, rebuild=rebuild)
+
+    documents = []
+    with stage("load"):
+        for rel_path in FILE_ORDER:
+            document = load_document(COURSE_ROOT, rel_path)
+            if document is not None:
+                documents.append(document)
+            else:
+                print(f"  [SKIP] {rel_path} (no encontrado)")
+
+    print(f"  Procesando {len(documents)} archivos...")
+
+    asset_sources = read_asset_sources()
+    build_key = build_inputs_key(documents, asset_sources, plugins, split, optimize, asset_sync)
+    if skip_unchanged and use_cache and not rebuild and is_build_current(build_key):
+        print(f"  Sin cambios: {OUTPUT_DIR.name}/ ya corresponde a estas entradas (--rebuild para forzar)")
+        return build_key
+
+    with stage("search"):
+        search_index_url = build_search_index(documents, use_cache=use_cache, rebuild=rebuild)
+    with stage("nav"):
+        nav = build_nav(documents, search_index_url)
+    sizes = {}
+    with stage("assets"):
+        asset_urls = publish_assets(asset_sources, asset_sync, optimize=optimize, sizes=sizes)
+
+    rendered_lessons = iter_rendered_lessons(
+        documents, jobs=jobs, use_cache=use_cache, rebuild=rebuild, plugins=plugins
+    )
     OUTPUT_DIR.mkdir(exist_ok=True)
-    OUTPUT_FILE.write_text(html, encoding="utf-8")
-    OUTPUT_INDEX_FILE.write_text(html, encoding="utf-8")
-
-    ASSETS_DIST_DIR.mkdir(parents=True, exist_ok=True)
-    for asset_name in [
-        "study-ux.js",
-        "study-ux.css",
-        "course-switcher.js",
-        "course-switcher.css",
-        "theme-controls.js",
-        "assistant-panel.js",
-        "assistant-panel.css",
-        "assistant-bridge.js",
-    ]:
-        src = ASSETS_SRC_DIR / asset_name
-        if src.exists():
-            shutil.copy2(src, ASSETS_DIST_DIR / asset_name)
+    fragment_names = set() if split else None
+    html_label = OUTPUT_FILE.name + (f" + {LESSONS_DIST_DIR.name}/*.html" if split else "")
+    html_sizes = sizes.setdefault(html_label, [0, 0])
+
+    def minify_part(part: str) -> str:
+        with stage("minify"):
+            minified = minify_html(part)
+        html_sizes[0] += len(part.encode("utf-8"))
+        html_sizes[1] += len(minified.encode("utf-8"))
+        return minified
+
+    with stage("write"):
+        write_document(
+            iter_document_parts(rendered_lessons, nav, asset_urls, fragment_names, minify_part if optimize else None),
+            OUTPUT_FILE,
+            copies=(OUTPUT_INDEX_FILE,),
+        )
+        pruned = prune_lesson_fragments(fragment_names or set())
+    if split:
+        print(f"  Fragmentos: {len(fragment_names)} lecciones en {LESSONS_DIST_DIR}, {pruned} obsoletos eliminados")
 
     if VERCEL_CONFIG_SRC.exists():
-        shutil.copy2(VERCEL_CONFIG_SRC, OUTPUT_DIR / "vercel.json")
+        with stage("assets"):
+            sync_files({"vercel.json": VERCEL_CONFIG_SRC}, OUTPUT_DIR, asset_sync, prune=False)
+
+    with stage("precompress"):
+        compressed = precompress_outputs(optimize)
+    if optimize:
+        labels = {OUTPUT_INDEX_FILE.name: None, OUTPUT_FILE.name: html_label}
+        for relative in compressed:
+            if relative.startswith(f"{LESSONS_DIST_DIR.name}/"):
+                labels[relative] = html_label
+            elif relative.startswith(f"{SEARCH_DIST_DIR.name}/"):
+                labels[relative] = f"{SEARCH_DIST_DIR.name}/*.json"
+        print_size_report(sizes, compressed, labels)
+
+    with stage("manifest"):
+        write_asset_manifest(build_key, asset_urls)
 
     print(f"  HTML generado: {OUTPUT_FILE}")
     print(f"  HTML index generado: {OUTPUT_INDEX_FILE}")
     print(f"  Tamano: {OUTPUT_FILE.stat().st_size / 1024:.0f} KB")
+    return build_key
+
+
+def profile_build(build_options: dict, top: int = 10, use_cprofile: bool = False) -> dict:
+    """build_html con telemetria por etapas; escribe dist/.cache/profile/build-profile.json.
+
+    Mide cada etapa (carga = lectura + parseo, busqueda, assets, render por
+    leccion con mermaid/flechas/resaltado dentro, plantilla, escritura...),
+    el pico de memoria con tracemalloc y las top lecciones y diagramas mas
+    lentos. El render es secuencial (el pool de procesos esconderia el
+    tiempo de cada leccion) y el build nunca se salta por "sin cambios":
+    con la cache de render activa solo se mide lo que cambio; --rebuild mide
+    el curso entero. use_cprofile guarda ademas build.pstats para pstats y
+    muestra las funciones con mas tiempo acumulado (con su sobrecoste
+    incluido en los tiempos de etapa).
+    """
+    options = dict(build_options, jobs=1, skip_unchanged=False)
+    profiler = cProfile.Profile() if use_cprofile else None
+    course_profile.start_profile(memory=True)
+    if profiler is not None:
+        profiler.enable()
+    try:
+        build_html(**options)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        profile = course_profile.stop_profile()
+    report = profile.report(
+        top,
+        extra={
+            "options": {
+                key: value for key, value in options.items() if key in ("use_cache", "rebuild", "split", "optimize")
+            },
+            "cprofile": CPROFILE_FILE.relative_to(COURSE_ROOT).as_posix() if profiler is not None else None,
+        },
+    )
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    PROFILE_FILE.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    for line in format_profile_summary(report):
+        print(line)
+    print(f"  Informe: {PROFILE_FILE}")
+    if profiler is not None:
+        profiler.dump_stats(CPROFILE_FILE)
+        print(f"  cProfile: {CPROFILE_FILE} (funciones con mas tiempo acumulado)")
+        pstats.Stats(profiler, stream=sys.stdout).strip_dirs().sort_stats("cumulative").print_stats(top)
+    return report
+
+
+def watched_paths() -> list:
+    """Fuentes que --watch vigila: lecciones de FILE_ORDER, assets y vercel.json."""
+    paths = [COURSE_ROOT / rel_path for rel_path in FILE_ORDER]
+    paths += [ASSETS_SRC_DIR / name for name in PAGE_ASSETS + CORE_ASSETS]
+    paths.append(VERCEL_CONFIG_SRC)
+    return paths
+
+
+def snapshot_paths(paths) -> dict:
+    """{ruta: (mtime_ns, tamano)} o None si no existe."""
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            snapshot[path] = None
+        else:
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def watch(build_options: dict, host: str = "127.0.0.1", port: int = 4183, open_browser: bool = False) -> None:
+    """Build inicial, servidor con recarga en vivo y rebuild en proceso de lo que cambie.
+
+    Sondea el mtime de las fuentes cada WATCH_INTERVAL segundos (sin
+    dependencias de inotify/FSEvents). El proceso conserva los arboles ya
+    parseados (load_document) y la cache de render, asi que un cambio en una
+    leccion solo re-renderiza esa leccion; dist/ se reescribe de forma
+    atomica y las paginas abiertas recargan por SSE (ver course_live). Los
+    cambios en scripts/ o en los plugins requieren reiniciar --watch.
+    """
+    paths = watched_paths()
+    signature = snapshot_paths(paths)
+    build_key = build_html(**build_options)
+    build_options = dict(build_options, rebuild=False)
+
+    server = course_live.bind_live_server(COURSE_ROOT, host, port)
+    server.notify_build(build_key)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{host}:{server.server_address[1]}/{OUTPUT_DIR.name}/{OUTPUT_FILE.name}"
+    print(f"Servidor local activo en {url} (recarga en vivo)")
+    print("Vigilando cambios. Pulsa Ctrl+C para detener.")
+    if open_browser:
+        webbrowser.open(url)
+
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = snapshot_paths(paths)
+            if current == signature:
+                continue
+            # Editors often save in several writes: wait until the files settle.
+            while True:
+                time.sleep(WATCH_INTERVAL)
+                settled = snapshot_paths(paths)
+                if settled == current:
+                    break
+                current = settled
+            changed = [path.relative_to(COURSE_ROOT).as_posix() for path in paths if current[path] != signature[path]]
+            signature = current
+            print(f"Cambios: {', '.join(changed[:3])}{f' (+{len(changed) - 3})' if len(changed) > 3 else ''}")
+            started = time.perf_counter()
+            try:
+                build_key = build_html(**build_options)
+            except Exception:
+                traceback.print_exc()
+                print("  [ERROR] Build fallido; se reintenta con el siguiente cambio")
+                continue
+            print(f"  Rebuild en {(time.perf_counter() - started) * 1000:.0f} ms")
+            server.notify_build(build_key)
+    except KeyboardInterrupt:
+        print("\nWatch detenido.")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Genera el HTML del curso a partir de los .md.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"No lee ni escribe la cache de render ({RENDER_CACHE_DIR.relative_to(COURSE_ROOT)}).",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignora la cache existente, re-renderiza todas las lecciones y la regenera.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="Procesos para renderizar lecciones en paralelo (por defecto: nucleos de CPU; 1 = secuencial).",
+    )
+    parser.add_argument(
+        "--plugin",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Archivo .py que registra render hooks con register_render_hook (repetible).",
+    )
+    parser.add_argument(
+        "--split",
+        action="store_true",
+        help=(
+            f"Escribe el indice como pagina ligera y cada leccion como fragmento en "
+            f"{LESSONS_DIST_DIR.relative_to(COURSE_ROOT)}/ que se carga al abrirla (requiere servir por http)."
+        ),
+    )
+    parser.add_argument(
+        "--asset-sync",
+        choices=ASSET_SYNC_MODES,
+        default="copy",
+        help=(
+            "Como se llevan a dist/ los assets que cambiaron: copia, hardlink o reflink "
+            "(los dos ultimos caen a copia si el sistema de archivos no los admite)."
+        ),
+    )
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Minifica HTML/CSS/JS, escribe variantes .gz precomprimidas y muestra los tamanos antes/despues.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Tras el build, sirve el repo con recarga en vivo y reconstruye en proceso al cambiar una fuente.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Host del servidor de --watch (por defecto: 127.0.0.1).")
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=4183,
+        help="Primer puerto a probar para --watch; si esta ocupado se usa el siguiente libre (por defecto: 4183).",
+    )
+    parser.add_argument("--open", action="store_true", help="Con --watch, abre el curso en el navegador.")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Mide cada etapa del build, el pico de memoria y las lecciones/diagramas mas lentos "
+            f"({PROFILE_FILE.relative_to(COURSE_ROOT)} y resumen en consola)."
+        ),
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=10, metavar="N", help="Cuantas lecciones/diagramas/funciones listar (10)."
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help=f"Con --profile, guarda tambien un cProfile en {CPROFILE_FILE.relative_to(COURSE_ROOT)}.",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs debe ser >= 1")
+    return args
 
 
-if __name__ == "__main__":
+def main(argv=None) -> None:
+    args = parse_args(argv)
     print("Construyendo HTML del curso...")
-    build_html()
-    print("Listo.")
+    build_options = dict(
+        use_cache=not args.no_cache,
+        rebuild=args.rebuild,
+        jobs=args.jobs,
+        plugins=args.plugin,
+        split=args.split,
+        asset_sync=args.asset_sync,
+        optimize=args.optimize,
+    )
+    if args.watch:
+        watch(build_options, host=args.host, port=args.port, open_browser=args.open)
+    elif args.profile or args.cprofile:
+        profile_build(build_options, top=args.profile_top, use_cprofile=args.cprofile)
+        print("Listo.")
+    else:
+        build_html(**build_options)
+        print("Listo.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Ejecuta todas las comprobaciones del curso en una sola pasada (course_checks.py).
+Solo stdlib Python 3.
+Exit 0 si todo OK, exit 1 si alguna regla falla.
+
+    python3 scripts/check-course.py                      # todas las reglas
+    python3 scripts/check-course.py --only links,gates   # solo esas
+    python3 scripts/check-course.py --skip links
+    python3 scripts/check-course.py --external           # ademas, las URLs http(s)
+    python3 scripts/check-course.py --list
+
+La regla links guarda su resultado por archivo en dist/.cache/checks/ y
+comprueba en un pool de hilos solo los archivos que cambiaron. La regla
+external (opt-in) guarda el resultado de cada URL en
+dist/.cache/checks/urls.json y no vuelve a pedirla hasta que caduca.
+"""
+
+import argparse
+import os
+import sys
+
+from course_checks import CHECKS, DISCOVERY_SKIP_DIRS, CourseCorpus, default_checks, print_report, run_checks
+
+
+def check_names(value: str) -> list:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"regla desconocida: {', '.join(unknown)} (ver --list)")
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comprobaciones del curso sobre un unico recorrido de los .md.")
+    parser.add_argument("--only", type=check_names, metavar="REGLAS", help="Reglas a ejecutar, separadas por comas.")
+    parser.add_argument("--skip", type=check_names, default=[], metavar="REGLAS", help="Reglas a omitir.")
+    parser.add_argument("--list", action="store_true", help="Lista las reglas disponibles y sale.")
+    parser.add_argument(
+        "--external", action="store_true", help="Comprueba tambien las URLs http(s) (regla external, sale a la red)."
+    )
+    parser.add_argument(
+        "--url-ttl",
+        type=float,
+        metavar="HORAS",
+        help="Horas que vale un resultado de URL en cache antes de revalidarlo (por defecto: una semana).",
+    )
+    parser.add_argument(
+        "--ignore",
+        action="append",
+        default=[],
+        metavar="CARPETA",
+        help=f"Carpeta (por nombre) que no se recorre, ademas de {', '.join(sorted(DISCOVERY_SKIP_DIRS))}.",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Comprueba todo sin leer ni escribir la cache.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="Hilos para comprobar archivos en paralelo (por defecto: nucleos de CPU; 1 = secuencial).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        width = max(len(name) for name in CHECKS)
+        for name, (_check, description, default) in CHECKS.items():
+            print(f"  {name:<{width}}  {description}{'' if default else ' (opt-in)'}")
+        return
+
+    names = [name for name in (args.only or default_checks()) if name not in args.skip]
+    if args.external and "external" not in names:
+        names.append("external")
+    corpus = CourseCorpus(
+        skip_dirs=DISCOVERY_SKIP_DIRS | set(args.ignore),
+        use_cache=not args.no_cache,
+        jobs=max(1, args.jobs),
+        url_ttl=args.url_ttl * 3600 if args.url_ttl is not None else None,
+    )
+    sys.exit(print_report(run_checks(names, corpus), corpus))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Daemon de build del curso: build, validaciones y check de links con caches calientes.
+Solo stdlib Python 3.
+
+Cada script del curso arranca un Python nuevo que vuelve a importar, leer y
+parsear todos los .md. El daemon es un proceso que se queda vivo escuchando
+en un socket Unix y ejecuta esos mismos scripts dentro de si mismo, asi que
+entre una orden y la siguiente conserva los arboles parseados
+(course_markdown.load_document), los modelos mermaid (load_mermaid), el
+resaltado (highlight_code) y las lecciones ya renderizadas (RENDER_MEMO de
+build-html.py).
+
+    python3 scripts/course-daemon.py start            # arranca en segundo plano
+    python3 scripts/course-daemon.py run build [args] # cliente: build-html.py [args]
+    python3 scripts/course-daemon.py run check        # check-course.py: todas las reglas
+    python3 scripts/course-daemon.py run validate     # todas menos links (los validate-*.py)
+    python3 scripts/course-daemon.py run check-links
+    python3 scripts/course-daemon.py status | stop
+
+`run` es un cliente fino: si no hay daemon (o el sistema no tiene sockets
+Unix) ejecuta la orden en su propio proceso, con el mismo resultado y el
+mismo codigo de salida. Si algun .py de scripts/ (o un --plugin) cambia, el
+daemon responde que esta obsoleto, el cliente ejecuta la orden el mismo y el
+daemon se reinicia con el codigo nuevo.
+
+Protocolo: una linea JSON por mensaje. El cliente envia
+{"command", "argv", "cwd"}; el daemon responde con {"stream": "out"|"err", "data"}
+por cada escritura y termina con {"exit": codigo} (o {"stale": true}).
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+COURSE_ROOT = SCRIPTS_DIR.parent
+LOG_FILE = COURSE_ROOT / "dist" / ".cache" / "daemon.log"
+# AF_UNIX paths are limited to ~100 bytes: keep the socket in the temp dir, one per checkout.
+SOCKET_PATH = Path(tempfile.gettempdir()) / (
+    f"sma-course-{os.getuid() if hasattr(os, 'getuid') else 0}-"
+    f"{hashlib.sha256(str(COURSE_ROOT).encode('utf-8')).hexdigest()[:10]}.sock"
+)
+IDLE_TIMEOUT = 30 * 60
+START_TIMEOUT = 10
+
+# command -> (script, fixed arguments placed before the client's own).
+COMMANDS = {
+    "build": ("build-html.py", ()),
+    "check": ("check-course.py", ()),
+    "validate": ("check-course.py", ("--skip", "links")),
+    "check-links": ("check-course.py", ("--only", "links")),
+}
+
+# Scripts that define main(): loaded once and kept (with their module state) while unchanged.
+_SCRIPT_MODULES = {}
+
+
+def load_script(path: Path):
+    """Importa un script de scripts/ como modulo (su bloque __main__ no se ejecuta)."""
+    name = f"_course_script_{path.stem.replace('-', '_')}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so the build's process pool can unpickle its functions.
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        if not hasattr(module, "main"):
+            sys.modules.pop(name, None)
+    return module
+
+
+def run_script(path: Path, argv=()) -> int:
+    """Ejecuta un script como `python3 path argv...` en este proceso y devuelve su codigo de salida.
+
+    Los scripts con main() se importan una vez y despues solo se llama a
+    main(); los que validan a nivel de modulo se vuelven a ejecutar enteros
+    (sus lecturas de .md salen igualmente de la cache de load_document).
+    """
+    saved_argv = sys.argv
+    sys.argv = [str(path), *argv]
+    try:
+        module = _SCRIPT_MODULES.get(path)
+        if module is None:
+            module = load_script(path)
+            if not hasattr(module, "main"):
+                return 0
+            _SCRIPT_MODULES[path] = module
+        module.main()
+        return 0
+    except SystemExit as exit_request:
+        if exit_request.code is None or isinstance(exit_request.code, int):
+            return exit_request.code or 0
+        print(exit_request.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv = saved_argv
+
+
+def run_command(command: str, argv=()) -> int:
+    """Ejecuta una orden de COMMANDS y devuelve su codigo de salida."""
+    script, fixed_args = COMMANDS[command]
+    return run_script(SCRIPTS_DIR / script, [*fixed_args, *argv])
+
+
+def plugin_paths(argv, cwd: Path) -> list:
+    """Rutas de --plugin en los argumentos de build (relativas a cwd)."""
+    paths = []
+    for index, arg in enumerate(argv):
+        if arg == "--plugin" and index + 1 < len(argv):
+            paths.append(argv[index + 1])
+        elif arg.startswith("--plugin="):
+            paths.append(arg.partition("=")[2])
+    return [(cwd / path).resolve() for path in paths]
+
+
+def file_signature(paths) -> dict:
+    """{ruta: mtime_ns} (None si no existe): los .py de scripts/ y los plugins que cargo el daemon."""
+    signature = {}
+    for path in paths:
+        try:
+            signature[path] = path.stat().st_mtime_ns
+        except OSError:
+            signature[path] = None
+    return signature
+
+
+def send_message(connection, message: dict) -> None:
+    connection.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class _StreamWriter(io.TextIOBase):
+    """stdout/stderr de una orden: cada escritura viaja al cliente como mensaje."""
+
+    def __init__(self, connection, stream: str):
+        self.connection = connection
+        self.stream = stream
+        self.disconnected = False
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text and not self.disconnected:
+            try:
+                send_message(self.connection, {"stream": self.stream, "data": text})
+            except OSError:
+                # The client went away (Ctrl+C): let the command finish, drop its output.
+                self.disconnected = True
+        return len(text)
+
+
+def serve(idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """Bucle del daemon: una orden cada vez, hasta stop, idle_timeout o un cambio de codigo."""
+    # Imported here so the `run` client stays a bare socket client.
+    import multiprocessing
+
+    import course_markdown
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        # The build's worker pool must see the scripts loaded here by file path,
+        # which a spawned interpreter could not import.
+        multiprocessing.set_start_method("fork", force=True)
+    SOCKET_PATH.unlink(missing_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous_umask = os.umask(0o077)
+    try:
+        server.bind(str(SOCKET_PATH))
+    finally:
+        os.umask(previous_umask)
+    server.listen(8)
+    server.settimeout(idle_timeout)
+    started = time.time()
+    handled = 0
+    build_plugins = None
+    signature = file_signature(SCRIPTS_DIR.glob("*.py"))
+    restart = False
+    print(f"Daemon escuchando en {SOCKET_PATH} (pid {os.getpid()})", flush=True)
+    try:
+        while True:
+            try:
+                connection, _address = server.accept()
+            except socket.timeout:
+                print(f"Sin ordenes en {idle_timeout:.0f} s; daemon detenido.", flush=True)
+                break
+            with connection, connection.makefile("r", encoding="utf-8") as reader:
+                try:
+                    request = json.loads(reader.readline() or "{}")
+                except ValueError:
+                    continue
+                command = request.get("command")
+                argv = [str(arg) for arg in request.get("argv", ())]
+                cwd = Path(request.get("cwd") or COURSE_ROOT)
+                if command == "status":
+                    send_message(
+                        connection,
+                        {
+                            "pid": os.getpid(),
+                            "uptime": round(time.time() - started, 1),
+                            "handled": handled,
+                            "documents": len(course_markdown._DOCUMENT_CACHE),
+                        },
+                    )
+                    continue
+                if command == "stop":
+                    send_message(connection, {"exit": 0})
+                    break
+                if command not in COMMANDS:
+                    send_message(connection, {"stream": "err", "data": f"Orden desconocida: {command}\n"})
+                    send_message(connection, {"exit": 2})
+                    continue
+                if file_signature(signature) != signature:
+                    send_message(connection, {"stale": True})
+                    restart = True
+                    break
+                if command == "build":
+                    plugins = plugin_paths(argv, cwd)
+                    signature.update(file_signature(path for path in plugins if path not in signature))
+                    if build_plugins is not None and set(plugins) != build_plugins:
+                        # Render hooks stay registered in a loaded build module: start a fresh one.
+                        _SCRIPT_MODULES.pop(SCRIPTS_DIR / COMMANDS["build"][0], None)
+                    build_plugins = set(plugins)
+                stdout = _StreamWriter(connection, "out")
+                stderr = _StreamWriter(connection, "err")
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    try:
+                        # Same working directory as the client, for relative paths in argv.
+                        os.chdir(cwd)
+                        code = run_command(command, argv)
+                    except Exception:
+                        traceback.print_exc()
+                        code = 1
+                    finally:
+                        os.chdir(COURSE_ROOT)
+                handled += 1
+                if not stdout.disconnected:
+                    try:
+                        send_message(connection, {"exit": code})
+                    except OSError:
+                        pass
+                print(f"{command} {' '.join(argv)} -> {code}", flush=True)
+    finally:
+        server.close()
+        SOCKET_PATH.unlink(missing_ok=True)
+    if restart:
+        print("Codigo de scripts/ modificado; reiniciando daemon.", flush=True)
+        os.execv(sys.executable, [sys.executable, str(Path(__file__).resolve()), "serve", "--idle-timeout", str(idle_timeout)])
+
+
+def request_daemon(message: dict):
+    """Envia message al daemon y devuelve un iterador de respuestas, o None si no hay daemon."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(SOCKET_PATH))
+        send_message(client, message)
+    except OSError:
+        client.close()
+        return None
+
+    def responses():
+        with client, client.makefile("r", encoding="utf-8") as reader:
+            for line in reader:
+                yield json.loads(line)
+
+    return responses()
+
+
+def run_client(command: str, argv) -> int:
+    """Ejecuta la orden en el daemon si esta vivo y si no (o si esta obsoleto) en este proceso."""
+    if not (command == "build" and "--watch" in argv):
+        responses = request_daemon({"command": command, "argv": list(argv), "cwd": os.getcwd()})
+        if responses is not None:
+            try:
+                for response in responses:
+                    if "stream" in response:
+                        target = sys.stdout if response["stream"] == "out" else sys.stderr
+                        target.write(response["data"])
+                        target.flush()
+                    elif "exit" in response:
+                        return response["exit"]
+                    elif response.get("stale"):
+                        break
+            except (OSError, ValueError):
+                print("[WARN] El daemon cerro la conexion; se ejecuta en este proceso", file=sys.stderr)
+    return run_command(command, argv)
+
+
+def start_daemon(idle_timeout: float) -> int:
+    responses = request_daemon({"command": "status"})
+    if responses is not None:
+        status = next(responses, {})
+        print(f"El daemon ya esta activo (pid {status.get('pid')}).")
+        return 0
+    if not hasattr(socket, "AF_UNIX"):
+        print("Este sistema no tiene sockets Unix; usa `run` (ejecuta en proceso).")
+        return 1
+    import subprocess
+
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_FILE, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "serve", "--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            cwd=COURSE_ROOT,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        responses = request_daemon({"command": "status"})
+        if responses is not None:
+            status = next(responses, {})
+            print(f"Daemon activo (pid {status.get('pid')}) en {SOCKET_PATH}; log en {LOG_FILE}")
+            return 0
+        time.sleep(0.05)
+    print(f"El daemon no respondio en {START_TIMEOUT} s; revisa {LOG_FILE}")
+    return 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Daemon de build del curso con caches calientes.")
+    subcommands = parser.add_subparsers(dest="action", required=True)
+    for action, help_text in (
+        ("start", "Arranca el daemon en segundo plano."),
+        ("serve", "Ejecuta el daemon en primer plano."),
+    ):
+        subparser = subcommands.add_parser(action, help=help_text)
+        subparser.add_argument(
+            "--idle-timeout",
+            type=float,
+            default=IDLE_TIMEOUT,
+            metavar="SEG",
+            help=f"Se detiene tras SEG segundos sin ordenes (por defecto: {IDLE_TIMEOUT}).",
+        )
+    subcommands.add_parser("stop", help="Detiene el daemon.")
+    subcommands.add_parser("status", help="Muestra si el daemon esta activo y que tiene en cache.")
+    run_parser = subcommands.add_parser("run", help="Ejecuta una orden (en el daemon si esta activo).")
+    run_parser.add_argument("command", choices=sorted(COMMANDS))
+    run_parser.add_argument("args", nargs=argparse.REMAINDER, help="Argumentos del script.")
+    args = parser.parse_args(argv)
+
+    if args.action == "run":
+        return run_client(args.command, args.args)
+    if args.action == "serve":
+        serve(args.idle_timeout)
+        return 0
+    if args.action == "start":
+        return start_daemon(args.idle_timeout)
+    responses = request_daemon({"command": args.action})
+    if responses is None:
+        print("No hay daemon activo.")
+        return 1 if args.action == "status" else 0
+    response = next(responses, {})
+    if args.action == "stop":
+        print("Daemon detenido.")
+    else:
+        print(
+            f"Daemon activo: pid {response.get('pid')}, {response.get('uptime')} s, "
+            f"{response.get('handled')} ordenes, {response.get('documents')} documentos parseados en cache"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,590 @@
+"""
+Motor unico de comprobaciones del curso (links, FILE_ORDER, estructura,
+diagramas y learning gates).
+Solo stdlib Python 3.
+
+Cada validador recorria el arbol y leia los .md por su cuenta: check-links.py
+y validate-diagram-semantics.py hacian cada uno su rglob("*.md"), y
+validate-file-order.py sacaba FILE_ORDER de build-html.py con una regex. Aqui
+CourseCorpus descubre los .md una sola vez (un os.walk que no entra en .git,
+dist/...) y parsea cada uno como mucho una vez (load_document, memorizado
+por mtime y tamano, asi que en course-daemon.py tampoco se repite entre
+ordenes); corpus.line_index() da a cualquier regla la posicion exacta
+(linea y columna) de un offset del texto fuente. Las reglas son funciones
+registradas con @register_check que reciben el corpus y anotan incidencias
+en su CheckResult; run_checks() las ejecuta todas (o las pedidas) sobre el
+mismo corpus, y print_report() saca un informe combinado con un codigo de
+salida: 1 si alguna regla falla.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote
+
+import course_markdown
+from course_markdown import (
+    INLINE_IMAGE,
+    Heading,
+    MermaidBlock,
+    heading_anchor,
+    inline_format,
+    iter_link_positions,
+    iter_nodes,
+    load_document,
+    load_line_index,
+)
+from course_order import FILE_ORDER
+
+COURSE_ROOT = Path(__file__).resolve().parent.parent
+LINK_CACHE_FILE = COURSE_ROOT / "dist" / ".cache" / "checks" / "links.json"
+# Subir si cambia el formato de las entradas de LINK_CACHE_FILE.
+LINK_CACHE_VERSION = 1
+URL_CACHE_FILE = COURSE_ROOT / "dist" / ".cache" / "checks" / "urls.json"
+
+# Never walked: VCS data, build outputs (dist/, Gradle's build/) and tool caches hold no course markdown,
+# and tests/fixtures holds frozen lesson copies whose relative links only resolve in the original place.
+DISCOVERY_SKIP_DIRS = frozenset(
+    (
+        ".git",
+        "dist",
+        "node_modules",
+        "__pycache__",
+        ".gradle",
+        "build",
+        ".idea",
+        ".runtime",
+        ".build",
+        "output",
+        "fixtures",
+    )
+)
+# Below this many files to (re)check, starting the thread pool costs more than it saves.
+PARALLEL_MIN_FILES = 8
+
+# name -> (check(corpus, result), description), in registration order.
+CHECKS = {}
+
+
+class Issue:
+    """Incidencia de una regla; path, line y column son None si no apunta a un archivo, linea o columna."""
+
+    __slots__ = ("path", "line", "column", "kind", "message")
+
+    def __init__(self, path, line, kind: str, message: str, column=None):
+        self.path = path
+        self.line = line
+        self.column = column
+        self.kind = kind
+        self.message = message
+
+    def format(self) -> str:
+        where = self.path or ""
+        if self.path and self.line:
+            where += f":{self.line}"
+            if self.column:
+                where += f":{self.column}"
+        return f"{where}  [{self.kind}] {self.message}" if where else f"[{self.kind}] {self.message}"
+
+
+class CheckResult:
+    """Incidencias y lineas de resumen de una regla, mas lo que tardo."""
+
+    __slots__ = ("name", "issues", "notes", "elapsed")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.issues = []
+        self.notes = []
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def error(self, path, line, kind: str, message: str, column=None) -> None:
+        self.issues.append(Issue(path, line, kind, message, column))
+
+    def note(self, text: str) -> None:
+        self.notes.append(text)
+
+
+class CourseCorpus:
+    """Los .md del repo, descubiertos una vez y parseados bajo demanda una sola vez.
+
+    El mismo recorrido guarda todas las rutas (archivos y carpetas) que no
+    cuelgan de skip_dirs, asi que exists() responde casi siempre sin tocar
+    el disco. use_cache, jobs y url_ttl son para las reglas con cache en
+    disco, pool de hilos o red (links, external).
+    """
+
+    def __init__(
+        self,
+        root: Path = COURSE_ROOT,
+        skip_dirs=DISCOVERY_SKIP_DIRS,
+        use_cache: bool = True,
+        jobs=None,
+        url_ttl=None,
+    ):
+        self.root = root
+        self.paths, self.entries = discover_tree(root, skip_dirs)
+        self.path_set = frozenset(self.paths)
+        self.use_cache = use_cache
+        self.jobs = jobs or os.cpu_count() or 1
+        self.url_ttl = url_ttl
+        self._root_prefix = str(root) + os.sep
+        self._documents = {}
+        self._anchors = {}
+        self._all_anchors = None
+        self._exists = {}
+        self._entries_digest = None
+
+    def document(self, rel_path: str):
+        """Arbol de rel_path (relativo a root, con /) o None si no existe."""
+        if rel_path not in self._documents:
+            self._documents[rel_path] = load_document(self.root, rel_path)
+        return self._documents[rel_path]
+
+    def documents(self, skip_dirs=()):
+        """(ruta, documento) de cada .md descubierto, sin los que cuelgan de skip_dirs."""
+        for rel_path in self.paths:
+            if skip_dirs and any(part in skip_dirs for part in rel_path.split("/")[:-1]):
+                continue
+            document = self.document(rel_path)
+            if document is not None:
+                yield rel_path, document
+
+    def line_index(self, rel_path: str):
+        """LineIndex de rel_path (offset -> linea y columna), compartido por todas las reglas."""
+        return load_line_index(self.root, rel_path)
+
+    def anchors(self, rel_path: str) -> frozenset:
+        """ids HTML que el build da a rel_path (ver document_anchors), calculados una vez por archivo."""
+        anchors = self._anchors.get(rel_path)
+        if anchors is None:
+            document = self.document(rel_path) if rel_path in self.path_set else None
+            anchors = self._anchors[rel_path] = document_anchors(document) if document is not None else frozenset()
+        return anchors
+
+    def remember_anchors(self, rel_path: str, anchors: frozenset) -> None:
+        """Fija los ids de rel_path (p. ej. desde una cache valida) para no tener que parsearlo."""
+        self._anchors[rel_path] = anchors
+
+    def all_anchors(self) -> frozenset:
+        """ids de la pagina del curso: los de las lecciones de FILE_ORDER, las unicas que build-html.py publica."""
+        if self._all_anchors is None:
+            self._all_anchors = frozenset().union(
+                *(self.anchors(rel_path) for rel_path in FILE_ORDER if rel_path in self.path_set)
+            )
+        return self._all_anchors
+
+    def exists(self, path: str) -> bool:
+        """Si existe path (absoluta y normalizada); memorizado, y sin stat para lo descubierto."""
+        found = self._exists.get(path)
+        if found is None:
+            found = path.startswith(self._root_prefix) and path[len(self._root_prefix) :].replace(
+                os.sep, "/"
+            ) in self.entries
+            # Missing from the walk: outside root, under a skipped folder or really missing.
+            found = self._exists[path] = found or os.path.exists(path)
+        return found
+
+    def signature(self, rel_path: str):
+        """(mtime_ns, tamano) de rel_path, para las caches por archivo."""
+        stat = (self.root / rel_path).stat()
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def entries_digest(self) -> str:
+        """Huella del conjunto de rutas descubiertas: cambia si se crea, borra o renombra algo."""
+        if self._entries_digest is None:
+            self._entries_digest = hashlib.sha256("\n".join(sorted(self.entries)).encode("utf-8")).hexdigest()
+        return self._entries_digest
+
+
+def discover_tree(root: Path, skip_dirs=DISCOVERY_SKIP_DIRS):
+    """(.md ordenados, conjunto de todas las rutas) bajo root, relativas y con /, sin entrar en skip_dirs."""
+    markdown = []
+    entries = set()
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = [name for name in subdirs if name not in skip_dirs]
+        relative = Path(directory).relative_to(root).as_posix()
+        prefix = "" if relative == "." else f"{relative}/"
+        entries.update(prefix + name for name in subdirs)
+        entries.update(prefix + name for name in files)
+        markdown.extend(prefix + name for name in files if name.endswith(".md"))
+    markdown.sort()
+    return markdown, frozenset(entries)
+
+
+def document_anchors(document) -> frozenset:
+    """ids HTML de una leccion con las mismas reglas que build-html.py.
+
+    La leccion es una seccion con id file_id (file_id_for de su ruta, como en
+    build_html) y cada titulo lleva heading_anchor(file_id, titulo ya
+    formateado), como en md_to_html.
+    """
+    file_id = document.file_id
+    ids = {file_id}
+    for node in iter_nodes(document, Heading):
+        ids.add(heading_anchor(file_id, inline_format(node.text)))
+    return frozenset(ids)
+
+
+def build_anchor_index(documents) -> dict:
+    """{ruta: frozenset de ids} de cada (ruta, documento)."""
+    return {rel_path: document_anchors(document) for rel_path, document in documents}
+
+
+def fragment_exists(fragment: str, anchors: frozenset) -> bool:
+    """fragment es exactamente un id de anchors, tal como lo genera el build.
+
+    Un "#slug" suelto no vale: el build no reescribe los href y la pagina
+    solo tiene ids <file_id>-<slug>, asi que ese link no lleva a ningun sitio.
+    """
+    return fragment in anchors
+
+
+def register_check(name: str, description: str, default: bool = True):
+    """Decorador: registra check(corpus, result) como la regla name.
+
+    Las reglas con default=False (p. ej. las que salen a la red) solo se
+    ejecutan si se piden por nombre.
+    """
+
+    def decorator(check):
+        CHECKS[name] = (check, description, default)
+        return check
+
+    return decorator
+
+
+def default_checks() -> list:
+    """Nombres de las reglas que se ejecutan cuando no se pide ninguna."""
+    return [name for name, (_check, _description, default) in CHECKS.items() if default]
+
+
+def run_checks(names=None, corpus=None) -> list:
+    """Ejecuta las reglas names (las de default_checks() si es None) sobre un mismo corpus; devuelve sus CheckResult."""
+    if corpus is None:
+        corpus = CourseCorpus()
+    results = []
+    for name in names or default_checks():
+        check, _description, _default = CHECKS[name]
+        result = CheckResult(name)
+        started = time.perf_counter()
+        check(corpus, result)
+        result.elapsed = time.perf_counter() - started
+        results.append(result)
+    return results
+
+
+def print_report(results, corpus=None) -> int:
+    """Imprime el informe combinado y devuelve el codigo de salida (0 todo OK, 1 si algo falla)."""
+    if corpus is not None:
+        print(f"Comprobando {len(corpus.paths)} archivos .md con {len(results)} regla(s)...")
+    failed = 0
+    for result in results:
+        status = "OK" if result.ok else "ERROR"
+        print(f"[{status}] {result.name} ({result.elapsed * 1000:.0f} ms)")
+        for note in result.notes:
+            print(f"  {note}")
+        for issue in result.issues:
+            print(f"  {issue.format()}")
+        failed += not result.ok
+    print()
+    if failed:
+        issues = sum(len(result.issues) for result in results)
+        print(f"❌ {issues} problema(s) en {failed} de {len(results)} regla(s).")
+        return 1
+    print(f"✅ {len(results)} regla(s) verificadas.")
+    return 0
+
+
+def check_main(names=None) -> int:
+    """run_checks + print_report sobre un corpus nuevo (lo que usan los validate-*.py)."""
+    corpus = CourseCorpus()
+    return print_report(run_checks(names, corpus), corpus)
+
+
+# -- Reglas ------------------------------------------------------------------
+
+EXTERNAL_PREFIXES = ("http://", "https://")
+LINK_IGNORED_PREFIXES = EXTERNAL_PREFIXES + ("mailto:", "tel:")
+
+
+@register_check("links", "Links markdown, imagenes y anclas #... relativos que no llevan a ningun sitio.")
+def check_links(corpus: CourseCorpus, result: CheckResult) -> None:
+    """Comprueba cada .md, reutilizando su resultado de LINK_CACHE_FILE si nada de lo que mira cambio.
+
+    Una entrada vale mientras coincidan el (mtime, tamano) del archivo y su
+    contexto: la huella de las rutas del repo y, si tiene anclas #..., la de
+    los ids de todas las lecciones y de FILE_ORDER. Los ids de los archivos sin cambios
+    tambien salen de la cache, asi que tras editar una leccion solo se parsea
+    esa. Los archivos pendientes se comprueban en un pool de hilos.
+    """
+    cache = load_link_cache() if corpus.use_cache else {}
+    signatures = {rel_path: corpus.signature(rel_path) for rel_path in corpus.paths}
+    for rel_path, entry in cache.items():
+        if signatures.get(rel_path) == entry["signature"]:
+            corpus.remember_anchors(rel_path, frozenset(entry["anchors"]))
+    # The page's ids depend on which lessons FILE_ORDER publishes, too.
+    anchors_digest = hashlib.sha256("\n".join(FILE_ORDER).encode("utf-8"))
+    for rel_path in corpus.paths:
+        anchors_digest.update(f"{rel_path}\0{chr(0).join(sorted(corpus.anchors(rel_path)))}\n".encode("utf-8"))
+    contexts = {
+        False: corpus.entries_digest(),
+        True: hashlib.sha256(f"{corpus.entries_digest()}:{anchors_digest.hexdigest()}".encode("utf-8")).hexdigest(),
+    }
+    # Pure #fragment links need every lesson's ids: computed here, before any thread reads them.
+    corpus.all_anchors()
+
+    entries = {}
+    pending = []
+    for rel_path in corpus.paths:
+        entry = cache.get(rel_path)
+        if (
+            entry is not None
+            and not entry["volatile"]
+            and entry["signature"] == signatures[rel_path]
+            and entry["context"] == contexts[entry["uses_anchors"]]
+        ):
+            entries[rel_path] = entry
+        else:
+            pending.append(rel_path)
+    if corpus.jobs > 1 and len(pending) >= PARALLEL_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=corpus.jobs) as pool:
+            fresh = list(pool.map(lambda rel_path: check_link_file(corpus, rel_path), pending))
+    else:
+        fresh = [check_link_file(corpus, rel_path) for rel_path in pending]
+    for rel_path, entry in zip(pending, fresh):
+        entry["signature"] = signatures[rel_path]
+        entry["anchors"] = sorted(corpus.anchors(rel_path))
+        entry["context"] = contexts[entry["uses_anchors"]]
+        entries[rel_path] = entry
+    if corpus.use_cache and pending:
+        store_link_cache(entries)
+
+    for rel_path in corpus.paths:
+        for line_num, column, kind, target in entries[rel_path]["issues"]:
+            result.error(rel_path, line_num, kind, target, column)
+    checked = sum(entry["checked"] for entry in entries.values())
+    anchors_checked = sum(entry["anchors_checked"] for entry in entries.values())
+    result.note(
+        f"{checked} links/imagenes locales y {anchors_checked} anclas en {len(corpus.paths)} archivos "
+        f"({len(pending)} comprobados, {len(corpus.paths) - len(pending)} desde la cache)"
+    )
+
+
+def check_link_file(corpus: CourseCorpus, rel_path: str) -> dict:
+    """Entrada de cache (sin firma ni contexto) con las incidencias de links de rel_path."""
+    entry = {"issues": [], "checked": 0, "anchors_checked": 0, "uses_anchors": False, "volatile": False}
+    document = corpus.document(rel_path)
+    if document is None:
+        return entry
+    base = os.path.dirname(os.path.join(str(corpus.root), rel_path))
+    for line_num, column, kind, target, _label in iter_link_positions(document, corpus.line_index(rel_path)):
+        if target.startswith(LINK_IGNORED_PREFIXES):
+            continue
+        # Images keep the whole target; links split off their #anchor.
+        target_clean, _, fragment = (target, "", "") if kind == INLINE_IMAGE else target.partition("#")
+        fragment = unquote(fragment)
+        if fragment:
+            entry["uses_anchors"] = True
+        if not target_clean:
+            # In-page link: every lesson shares the built page.
+            if fragment:
+                entry["anchors_checked"] += 1
+                if not fragment_exists(fragment, corpus.all_anchors()):
+                    entry["issues"].append([line_num, column, "ANCHOR", target])
+            continue
+        entry["checked"] += 1
+        resolved = os.path.normpath(os.path.join(base, target_clean))
+        if not resolved.startswith(str(corpus.root) + os.sep):
+            # Outside the repo: not covered by the entries digest, so never reused from the cache.
+            entry["volatile"] = True
+        if not corpus.exists(resolved):
+            entry["issues"].append([line_num, column, "IMAGE" if kind == INLINE_IMAGE else "LINK", target])
+            continue
+        target_rel = os.path.relpath(resolved, corpus.root).replace(os.sep, "/")
+        if fragment and target_rel in corpus.path_set:
+            entry["anchors_checked"] += 1
+            if not fragment_exists(fragment, corpus.anchors(target_rel)):
+                entry["issues"].append([line_num, column, "ANCHOR", target])
+    return entry
+
+
+def link_cache_stamp() -> str:
+    """Version de la cache de links: cambia con LINK_CACHE_VERSION o al editar las reglas o el parser."""
+    digest = hashlib.sha256(f"v{LINK_CACHE_VERSION}\n".encode("utf-8"))
+    for module_path in (__file__, course_markdown.__file__):
+        digest.update(Path(module_path).read_bytes())
+    return digest.hexdigest()
+
+
+def load_link_cache() -> dict:
+    """{ruta: entrada} de LINK_CACHE_FILE, o {} si no existe, no se puede leer o es de otra version."""
+    try:
+        data = json.loads(LINK_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("stamp") != link_cache_stamp():
+        return {}
+    return data.get("files", {})
+
+
+def store_link_cache(entries: dict) -> None:
+    LINK_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = LINK_CACHE_FILE.with_name(f"{LINK_CACHE_FILE.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(
+        json.dumps({"stamp": link_cache_stamp(), "files": entries}, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, LINK_CACHE_FILE)
+
+
+@register_check("external", "URLs http(s) que no responden o dan error (sale a la red).", default=False)
+def check_external_links(corpus: CourseCorpus, result: CheckResult) -> None:
+    """Comprueba cada URL distinta una vez con course_urls; cada link roto se anota en su posicion."""
+    # asyncio and ssl are only imported when this opt-in rule runs.
+    import course_urls
+
+    locations = {}
+    for rel_path, document in corpus.documents():
+        for line_num, column, _kind, target, _label in iter_link_positions(document, corpus.line_index(rel_path)):
+            if target.startswith(EXTERNAL_PREFIXES):
+                url = target.partition("#")[0]
+                locations.setdefault(url, []).append((rel_path, line_num, column, target))
+    entries, stats = course_urls.check_urls(
+        list(locations),
+        cache_file=URL_CACHE_FILE if corpus.use_cache else None,
+        ttl=course_urls.DEFAULT_TTL if corpus.url_ttl is None else corpus.url_ttl,
+    )
+    for url, entry in entries.items():
+        if entry["ok"]:
+            continue
+        reason = f"HTTP {entry['status']}" if entry["status"] else entry["error"]
+        for rel_path, line_num, column, target in locations[url]:
+            result.error(rel_path, line_num, "URL", f"{target} ({reason})", column)
+    result.note(
+        f"{stats['urls']} URLs distintas: {stats['cached']} desde la cache, {stats['requests']} peticiones "
+        f"por {stats['connections']} conexiones, {stats['revalidated']} revalidadas con 304"
+    )
+
+
+@register_check("file-order", "Cada ruta de FILE_ORDER (course_order.py) existe.")
+def check_file_order(corpus: CourseCorpus, result: CheckResult) -> None:
+    for rel_path in FILE_ORDER:
+        if rel_path not in corpus.path_set:
+            result.error(rel_path, None, "MISSING", "en FILE_ORDER pero no existe (P0)")
+    result.note(f"FILE_ORDER: {len(FILE_ORDER)} entradas")
+
+
+STRUCTURE_REQUIRED_DIRS = (
+    "00-informe",
+    "00-nivel-cero",
+    "01-junior",
+    "02-midlevel",
+    "03-senior",
+    "04-maestria",
+    "05-proyecto-final",
+    "anexos",
+    "scripts",
+)
+STRUCTURE_REQUIRED_FILES = (
+    "README.md",
+    "00-informe/INFORME-CURSO.md",
+    "00-informe/AUDITORIA-EQUIVALENCIA-IOS-ANDROID.md",
+    "00-informe/PLAN-REFUERZO-CURSO-ANDROID.md",
+    "00-informe/MEJORAS-POR-MODULO-Y-EVIDENCIAS.md",
+    "scripts/build-html.py",
+    "05-proyecto-final/00-brief-ruralgo-fieldops.md",
+    "05-proyecto-final/01-rubrica-empleabilidad.md",
+    "05-proyecto-final/02-evidencias-obligatorias.md",
+)
+
+
+@register_check("structure", "Carpetas base y archivos criticos del curso.")
+def check_structure(corpus: CourseCorpus, result: CheckResult) -> None:
+    for rel_dir in STRUCTURE_REQUIRED_DIRS:
+        if not (corpus.root / rel_dir).is_dir():
+            result.error(f"{rel_dir}/", None, "MISSING DIR", "carpeta base (P0)")
+    for rel_path in STRUCTURE_REQUIRED_FILES:
+        # Markdown is already known from discovery: only the rest needs a stat.
+        exists = rel_path in corpus.path_set if rel_path.endswith(".md") else (corpus.root / rel_path).is_file()
+        if not exists:
+            result.error(rel_path, None, "MISSING FILE", "archivo critico (P0)")
+    result.note(f"{len(STRUCTURE_REQUIRED_DIRS)} carpetas y {len(STRUCTURE_REQUIRED_FILES)} archivos requeridos")
+
+
+# Folders outside the course path (reports, annexes, projects): their diagrams do not count.
+DIAGRAM_SKIP_DIRS = frozenset(
+    (
+        "00-informe",
+        "anexos",
+        "docs",
+        "output",
+        ".runtime",
+        ".build",
+        "project",
+        "assistant-bridge",
+    )
+)
+DIAGRAM_ARROWS = ("-->", "-.->", "==>", "--o")
+
+
+@register_check("diagrams", "Los mermaid del curso usan todas las semanticas de flecha.")
+def check_diagram_semantics(corpus: CourseCorpus, result: CheckResult) -> None:
+    present = {arrow: 0 for arrow in DIAGRAM_ARROWS}
+    blocks = 0
+    for _rel_path, document in corpus.documents(DIAGRAM_SKIP_DIRS):
+        for node in iter_nodes(document, MermaidBlock):
+            blocks += 1
+            for arrow in DIAGRAM_ARROWS:
+                if arrow in node.code:
+                    present[arrow] += 1
+    if not blocks:
+        result.error(None, None, "MERMAID", "no se encontraron bloques mermaid en ruta de curso")
+        return
+    for arrow, count in present.items():
+        if not count:
+            result.error(None, None, "MERMAID", f"falta la semantica de flecha {arrow}")
+    result.note(f"{blocks} bloques mermaid; cobertura de flechas:")
+    for arrow, count in present.items():
+        result.note(f"  {arrow}: {count} bloques")
+
+
+LEARNING_GATES = {
+    "00-informe/MATRIZ-COMPETENCIAS.md": (
+        "# Matriz de competencias",
+        "## Niveles y evidencias",
+        "## Criterio de paso",
+    ),
+    "00-informe/RUBRICA-GATES-POR-FASE.md": (
+        "# Rubrica de gates por fase",
+        "## Gates por fase",
+        "## Regla de aprobado",
+    ),
+    "00-informe/SCORECARD-EMPLEABILIDAD.md": (
+        "# Scorecard de empleabilidad",
+        "## Seniority map",
+        "## Criterio de empleabilidad",
+    ),
+}
+
+
+@register_check("gates", "Los documentos de learning gates tienen sus encabezados obligatorios.")
+def check_learning_gates(corpus: CourseCorpus, result: CheckResult) -> None:
+    for rel_path, headers in LEARNING_GATES.items():
+        if rel_path not in corpus.path_set:
+            result.error(rel_path, None, "MISSING FILE", "documento de learning gates")
+            continue
+        # Same rule as the original validate-learning-gates.py: the header text
+        # has to appear somewhere in the file, not as a heading of that exact level.
+        text = corpus.line_index(rel_path).text
+        for header in headers:
+            if header not in text:
+                result.error(rel_path, None, "HEADING", f"falta '{header}'")
+    result.note(f"{len(LEARNING_GATES)} documentos de learning gates")
@@ -0,0 +1,287 @@
+"""
+Resaltado de sintaxis en build para los bloques de codigo del curso.
+Solo stdlib Python 3.
+
+highlight_code(code, lang) devuelve el contenido del bloque ya partido en
+<span> con las mismas clases que highlight.js (hljs-keyword, hljs-string,
+hljs-title function_...), asi que los temas de highlight.js que carga la
+pagina lo colorean igual y el navegador no tiene que descargar ni ejecutar
+highlight.js. Para lenguajes sin gramatica aqui devuelve None y ese bloque
+sigue resaltandose en el navegador.
+
+Cada gramatica es una lista de reglas (clase hljs, patron) unidas en una
+sola regex con grupos con nombre: un finditer recorre el bloque una vez y
+match.lastgroup dice que regla ha casado, como INLINE_RE en
+course_markdown.py. Una regla puede usar una funcion en lugar de la clase
+cuando el token tiene estructura (cadenas con plantillas, etiquetas XML).
+"""
+
+import functools
+import re
+
+
+def escape_code(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _span(scope: str, text: str) -> str:
+    return f'<span class="{scope}">{escape_code(text)}</span>'
+
+
+class Grammar:
+    """Reglas (clase hljs o funcion texto -> HTML, patron) compiladas en una regex."""
+
+    __slots__ = ("name", "pattern", "scopes")
+
+    def __init__(self, name: str, rules):
+        self.name = name
+        self.scopes = {}
+        alternatives = []
+        for index, (scope, pattern) in enumerate(rules):
+            group = f"r{index}"
+            self.scopes[group] = scope
+            alternatives.append(f"(?P<{group}>{pattern})")
+        self.pattern = re.compile("|".join(alternatives), flags=re.MULTILINE) if alternatives else None
+
+    def render(self, code: str) -> str:
+        if self.pattern is None:
+            return escape_code(code)
+        parts = []
+        position = 0
+        scopes = self.scopes
+        for match in self.pattern.finditer(code):
+            start = match.start()
+            if start > position:
+                parts.append(escape_code(code[position:start]))
+            scope = scopes[match.lastgroup]
+            text = match.group()
+            parts.append(_span(scope, text) if scope.__class__ is str else scope(text))
+            position = match.end()
+        if position < len(code):
+            parts.append(escape_code(code[position:]))
+        return "".join(parts)
+
+
+def _words(words: str) -> str:
+    return r"\b(?:" + "|".join(words.split()) + r")\b"
+
+
+TEMPLATE_RE = re.compile(r"\$\{[^}\n]*\}|\$[A-Za-z_]\w*")
+SHELL_VARIABLE_RE = re.compile(r"\$\{[^}\n]*\}|\$\w+|\$[#?@*$!-]")
+XML_TAG_RE = re.compile(r"^(</?)([^\s/>]+)([\s\S]*?)(/?>)$")
+XML_ATTRIBUTE_RE = re.compile(r"([^\s=/>]+)(?:(\s*=\s*)(\"[^\"]*\"|'[^']*'|[^\s>]+))?")
+INDENT_RE = re.compile(r"^[ \t]*")
+
+
+def _string_with(template_re, template_scope: str):
+    """Cadena con plantillas ('$x', '${...}') resaltadas dentro."""
+
+    def render(text: str) -> str:
+        parts = []
+        position = 0
+        for match in template_re.finditer(text):
+            parts.append(escape_code(text[position:match.start()]))
+            parts.append(_span(template_scope, match.group()))
+            position = match.end()
+        parts.append(escape_code(text[position:]))
+        return f'<span class="hljs-string">{"".join(parts)}</span>'
+
+    return render
+
+
+def _xml_tag(text: str) -> str:
+    match = XML_TAG_RE.match(text)
+    if not match:
+        return escape_code(text)
+    opener, name, attributes, closer = match.groups()
+    parts = [escape_code(opener), _span("hljs-name", name)]
+    position = 0
+    for attribute in XML_ATTRIBUTE_RE.finditer(attributes):
+        parts.append(escape_code(attributes[position:attribute.start()]))
+        parts.append(_span("hljs-attr", attribute.group(1)))
+        if attribute.group(2) is not None:
+            parts.append(escape_code(attribute.group(2)))
+            parts.append(_span("hljs-string", attribute.group(3)))
+        position = attribute.end()
+    parts.append(escape_code(attributes[position:]))
+    parts.append(escape_code(closer))
+    return f'<span class="hljs-tag">{"".join(parts)}</span>'
+
+
+def _indented(scope: str):
+    """Token que casa con su sangria delante: la sangria sale sin resaltar."""
+
+    def render(text: str) -> str:
+        indent = INDENT_RE.match(text).end()
+        return escape_code(text[:indent]) + _span(scope, text[indent:])
+
+    return render
+
+
+def _markdown_link(text: str) -> str:
+    label, _separator, target = text[1:-1].partition("](")
+    return f'[{_span("hljs-string", label)}]({_span("hljs-link", target)})'
+
+
+NUMBER = r"\b(?:0[xX][0-9a-fA-F_]+|0[bB][01_]+|\d[\d_]*(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?)[fFdDlLuU]*\b"
+C_COMMENT = r"//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)"
+DOUBLE_QUOTED = r'"(?:\\.|[^"\\\n])*"?'
+SINGLE_QUOTED = r"'(?:\\.|[^'\\\n])*'?"
+HASH_COMMENT = r"(?:^|(?<=\s))#[^\n]*"
+
+KOTLIN = Grammar(
+    "kotlin",
+    (
+        ("hljs-comment", C_COMMENT),
+        (_string_with(TEMPLATE_RE, "hljs-subst"), r'"""[\s\S]*?(?:"""|\Z)'),
+        (_string_with(TEMPLATE_RE, "hljs-subst"), DOUBLE_QUOTED),
+        ("hljs-string", r"'(?:\\.|[^'\\\n])'"),
+        ("hljs-meta", r"@[A-Za-z_][\w.]*(?::[A-Za-z_]\w*)?"),
+        ("hljs-title function_", r"(?<=\bfun )[A-Za-z_]\w*(?=\s*[(<])"),
+        ("hljs-title class_", r"(?:(?<=\bclass )|(?<=\binterface )|(?<=\bobject ))[A-Za-z_]\w*"),
+        (
+            "hljs-keyword",
+            _words(
+                "abstract actual annotation as break by catch class companion const constructor continue "
+                "crossinline data do dynamic else enum expect external final finally for fun get if import "
+                "in infix init inline inner interface internal is lateinit noinline object open operator out "
+                "override package private protected public reified return sealed set super suspend tailrec "
+                "this throw try typealias val var vararg when where while"
+            ),
+        ),
+        ("hljs-literal", _words("true false null")),
+        ("hljs-built_in", _words("Byte Short Char Int Long Boolean Float Double Void Unit Nothing")),
+        ("hljs-type", r"(?:(?<=: )|(?<=:))[A-Z]\w*"),
+        ("hljs-number", NUMBER),
+    ),
+)
+
+GROOVY = Grammar(
+    "groovy",
+    (
+        ("hljs-meta", r"\A#![^\n]*"),
+        ("hljs-comment", C_COMMENT),
+        (_string_with(TEMPLATE_RE, "hljs-subst"), r'"""[\s\S]*?(?:"""|\Z)'),
+        ("hljs-string", r"'''[\s\S]*?(?:'''|\Z)"),
+        (_string_with(TEMPLATE_RE, "hljs-subst"), DOUBLE_QUOTED),
+        ("hljs-string", SINGLE_QUOTED),
+        ("hljs-meta", r"@[A-Za-z_][\w.]*"),
+        ("hljs-title class_", r"(?:(?<=\bclass )|(?<=\binterface )|(?<=\benum ))[A-Za-z_]\w*"),
+        (
+            "hljs-keyword",
+            _words(
+                "abstract as assert break case catch class continue def default do else enum extends final "
+                "finally for if implements import in instanceof interface new package private protected "
+                "public return static super switch synchronized this throw throws trait try var while"
+            ),
+        ),
+        ("hljs-literal", _words("true false null")),
+        ("hljs-number", NUMBER),
+    ),
+)
+
+BASH = Grammar(
+    "bash",
+    (
+        ("hljs-meta", r"\A#![^\n]*"),
+        ("hljs-comment", HASH_COMMENT),
+        (_string_with(SHELL_VARIABLE_RE, "hljs-variable"), r'"(?:\\.|[^"\\])*"?'),
+        ("hljs-string", r"'[^']*'?"),
+        ("hljs-variable", SHELL_VARIABLE_RE.pattern),
+        (
+            "hljs-keyword",
+            _words("if then else elif fi for while until in do done case esac function select return export local"),
+        ),
+        (
+            "hljs-built_in",
+            _words(
+                "alias cd declare echo eval exec exit printf pwd read readonly set shift source test trap type "
+                "ulimit umask unset wait"
+            ),
+        ),
+    ),
+)
+
+JSON = Grammar(
+    "json",
+    (
+        ("hljs-attr", r'"(?:\\.|[^"\\\n])*"(?=\s*:)'),
+        ("hljs-string", r'"(?:\\.|[^"\\\n])*"'),
+        ("hljs-number", r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"),
+        ("hljs-literal", _words("true false null")),
+    ),
+)
+
+XML = Grammar(
+    "xml",
+    (
+        ("hljs-comment", r"<!--[\s\S]*?(?:-->|\Z)"),
+        ("hljs-meta", r"<\?[\s\S]*?(?:\?>|\Z)|<!DOCTYPE[^>]*>"),
+        (_xml_tag, r"</?[A-Za-z_][\w:.-]*(?:\s+[^<>]*?)?/?>"),
+    ),
+)
+
+YAML = Grammar(
+    "yaml",
+    (
+        ("hljs-comment", HASH_COMMENT),
+        ("hljs-meta", r"^(?:---|\.\.\.)[ \t]*$"),
+        (_indented("hljs-bullet"), r"^[ \t]*-(?=[ \t]|$)"),
+        ("hljs-attr", r"(?:^|(?<=[ \t-]))[A-Za-z_][\w.\-/]*(?=:(?:[ \t]|$))"),
+        ("hljs-string", r'"(?:\\.|[^"\\\n])*"|' + r"'(?:''|[^'\n])*'"),
+        ("hljs-literal", _words("true false yes no null on off") + r"|~"),
+        ("hljs-number", r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])"),
+    ),
+)
+
+MARKDOWN = Grammar(
+    "markdown",
+    (
+        ("hljs-section", r"^#{1,6}[ \t][^\n]*"),
+        ("hljs-quote", r"^>[^\n]*"),
+        (_indented("hljs-bullet"), r"^[ \t]*(?:[-*+]|\d+\.)(?=[ \t])"),
+        ("hljs-code", r"`[^`\n]+`"),
+        ("hljs-strong", r"\*\*[^*\n]+\*\*|__[^_\n]+__"),
+        ("hljs-emphasis", r"\*[^*\s][^*\n]*\*|(?<!\w)_[^_\s][^_\n]*_(?!\w)"),
+        (_markdown_link, r"\[[^\]\n]+\]\([^)\n]+\)"),
+    ),
+)
+
+PLAINTEXT = Grammar("plaintext", ())
+
+# Nombre del fence -> gramatica (los alias son los de highlight.js).
+LANGUAGES = {
+    "kotlin": KOTLIN,
+    "kt": KOTLIN,
+    "kts": KOTLIN,
+    "groovy": GROOVY,
+    "gradle": GROOVY,
+    "bash": BASH,
+    "sh": BASH,
+    "shell": BASH,
+    "zsh": BASH,
+    "json": JSON,
+    "xml": XML,
+    "html": XML,
+    "svg": XML,
+    "yaml": YAML,
+    "yml": YAML,
+    "markdown": MARKDOWN,
+    "md": MARKDOWN,
+    "text": PLAINTEXT,
+    "txt": PLAINTEXT,
+    "plaintext": PLAINTEXT,
+}
+
+
+def grammar_for(lang: str):
+    return LANGUAGES.get(lang.lower()) if lang else None
+
+
+@functools.lru_cache(maxsize=1024)
+def highlight_code(code: str, lang: str):
+    """(nombre canonico del lenguaje, HTML resaltado) o None si no hay gramatica para lang."""
+    grammar = grammar_for(lang)
+    if grammar is None:
+        return None
+    return grammar.name, grammar.render(code)
@@ -0,0 +1,147 @@
+"""
+Servidor local con recarga en vivo para `build-html.py --watch`.
+Solo stdlib Python 3.
+
+Sirve el repo como `python3 -m http.server` y ademas:
+
+- EVENTS_PATH es un endpoint Server-Sent Events: al conectar envia la
+  generacion actual del build y despues una por cada build nuevo
+  (notify_build). La pagina recarga cuando la generacion cambia, tambien
+  si se reconecta tras perderse un aviso.
+- A cada HTML servido se le inyecta LIVE_RELOAD_SNIPPET antes de </body>:
+  dist/ queda identico a un build normal y el script solo existe aqui.
+- Si el cliente acepta gzip y hay un <archivo>.gz al lado (build con
+  --optimize), se sirve el precomprimido.
+"""
+
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+EVENTS_PATH = "/__sma/live"
+# Seconds between keep-alive comments: a closed tab is noticed on the next write.
+HEARTBEAT_INTERVAL = 15
+LIVE_RELOAD_SNIPPET = (
+    "<script>(function () {\n"
+    "  // Live reload injected by build-html.py --watch (not part of dist/).\n"
+    "  var generation = null;\n"
+    f"  var source = new EventSource('{EVENTS_PATH}');\n"
+    "  source.addEventListener('build', function (event) {\n"
+    "    if (generation !== null && event.data !== generation) window.location.reload();\n"
+    "    generation = event.data;\n"
+    "  });\n"
+    "})();</script>\n"
+)
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    server_version = "SMALive/1"
+
+    def end_headers(self):
+        # Local authoring: always revalidate so a reload never shows stale files.
+        self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        if not self.path.startswith(EVENTS_PATH):
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == EVENTS_PATH:
+            self.send_events()
+            return
+        file_path = Path(self.translate_path(self.path))
+        if file_path.is_dir():
+            file_path = file_path / "index.html"
+        if file_path.suffix == ".html" and file_path.is_file() and path.endswith((".html", "/")):
+            self.send_html(file_path)
+            return
+        super().do_GET()
+
+    def send_html(self, file_path: Path) -> None:
+        payload = file_path.read_bytes()
+        position = payload.rfind(b"</body>")
+        if position < 0:
+            position = len(payload)
+        payload = payload[:position] + LIVE_RELOAD_SNIPPET.encode("utf-8") + payload[position:]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        compressed = f"{path}.gz"
+        if "gzip" not in self.headers.get("Accept-Encoding", "") or not (
+            os.path.isfile(path) and os.path.isfile(compressed)
+        ):
+            return super().send_head()
+        try:
+            handle = open(compressed, "rb")
+        except OSError:
+            return super().send_head()
+        stat = os.fstat(handle.fileno())
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(stat.st_size))
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Last-Modified", self.date_time_string(stat.st_mtime))
+        self.end_headers()
+        return handle
+
+    def send_events(self) -> None:
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        server = self.server
+        sent = None
+        try:
+            while True:
+                with server.build_changed:
+                    if server.generation == sent:
+                        server.build_changed.wait(HEARTBEAT_INTERVAL)
+                    generation = server.generation
+                if generation != sent:
+                    self.wfile.write(f"event: build\ndata: {generation}\n\n".encode("utf-8"))
+                    sent = generation
+                else:
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class LiveReloadServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer que sirve root y avisa por SSE de cada build nuevo."""
+
+    daemon_threads = True
+
+    def __init__(self, address, root: Path):
+        super().__init__(address, functools.partial(LiveReloadHandler, directory=str(root)))
+        self.generation = ""
+        self.build_changed = threading.Condition()
+
+    def notify_build(self, generation: str) -> None:
+        """Publica una generacion nueva (p. ej. la huella del build); las paginas abiertas recargan."""
+        with self.build_changed:
+            if generation == self.generation:
+                return
+            self.generation = generation
+            self.build_changed.notify_all()
+
+
+def bind_live_server(root: Path, host: str, start_port: int, attempts: int = 200) -> LiveReloadServer:
+    """LiveReloadServer en el primer puerto libre desde start_port."""
+    for port in range(start_port, start_port + attempts):
+        try:
+            return LiveReloadServer((host, port), root)
+        except OSError:
+            continue
+    raise OSError(f"No se encontro puerto libre entre {start_port} y {start_port + attempts - 1}")
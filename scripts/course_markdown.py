@@ -0,0 +1,527 @@
+"""
+Lexer, formato inline y arbol de documento para el markdown del curso.
+Solo stdlib Python 3.
+
+Clasifica cada linea una sola vez (tabla de despacho por primer caracter +
+patrones precompilados) y produce un flujo de tokens que consumen
+build-html.py y los validadores de scripts/, en lugar de que cada herramienta
+vuelva a escanear el markdown por su cuenta.
+
+Cada token es una tupla (tipo, linea, *datos), con la linea 1-based donde
+empieza el bloque:
+
+    (TOKEN_CODE, linea, lenguaje, codigo)
+    (TOKEN_TABLE, linea, filas)
+    (TOKEN_HEADING, linea, nivel, texto)
+    (TOKEN_HR, linea)
+    (TOKEN_BULLET, linea, texto)
+    (TOKEN_ORDERED, linea, texto)
+    (TOKEN_NEXT_HINT, linea, texto)
+    (TOKEN_PARAGRAPH, linea, texto)
+
+Las lineas en blanco no generan token: no cierran listas.
+
+parse_markdown() agrupa esos tokens en un arbol (Document con nodos Heading,
+Paragraph, ListBlock/ListItem, Table, CodeBlock, MermaidBlock y Rule). Los
+nodos usan __slots__ y se pueden picklear, asi que el mismo arbol sirve para
+el renderer, el indice, los validadores y los procesos del pool de render.
+"""
+
+import bisect
+import hashlib
+import re
+from pathlib import Path
+
+from course_profile import stage
+
+TOKEN_CODE = "code"
+TOKEN_TABLE = "table"
+TOKEN_HEADING = "heading"
+TOKEN_HR = "hr"
+TOKEN_BULLET = "bullet"
+TOKEN_ORDERED = "ordered"
+TOKEN_NEXT_HINT = "next_hint"
+TOKEN_PARAGRAPH = "paragraph"
+
+CODE_FENCE = "```"
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+)$")
+HR_RE = re.compile(r"^---+\s*$")
+BULLET_RE = re.compile(r"^\s*[-*]\s+")
+ORDERED_RE = re.compile(r"^\s*\d+[.)]\s+")
+# Pistas "Siguiente: ..." heredadas; el HTML ya tiene navegacion propia.
+NEXT_HINT_RE = re.compile(r"^\s*siguiente:\s+", flags=re.IGNORECASE)
+NEWLINE_RE = re.compile("\n")
+# heading_anchor: everything but [a-z0-9] collapses to "-".
+ANCHOR_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+# Primer caracter no blanco -> patrones candidatos, en orden de prioridad.
+# Una linea cuyo primer caracter no aparece aqui es un parrafo sin probar
+# ningun patron.
+_LINE_DISPATCH = {
+    "#": ((TOKEN_HEADING, HEADING_RE),),
+    "-": ((TOKEN_HR, HR_RE), (TOKEN_BULLET, BULLET_RE)),
+    "*": ((TOKEN_BULLET, BULLET_RE),),
+    "s": ((TOKEN_NEXT_HINT, NEXT_HINT_RE),),
+    "S": ((TOKEN_NEXT_HINT, NEXT_HINT_RE),),
+}
+for _digit in "0123456789":
+    _LINE_DISPATCH[_digit] = ((TOKEN_ORDERED, ORDERED_RE),)
+del _digit
+
+
+def classify_line(line: str, stripped: str):
+    """Devuelve el token de una linea fuera de bloques de codigo y tablas."""
+    for kind, pattern in _LINE_DISPATCH.get(stripped[0], ()):
+        match = pattern.match(line)
+        if not match:
+            continue
+        if kind == TOKEN_HEADING:
+            return (kind, len(match.group(1)), match.group(2))
+        if kind == TOKEN_HR:
+            return (kind,)
+        if kind == TOKEN_NEXT_HINT:
+            return (kind, line)
+        return (kind, line[match.end():])
+    return (TOKEN_PARAGRAPH, line)
+
+
+def tokenize_blocks(md_text: str):
+    """Genera los tokens de bloque de md_text en orden de aparicion."""
+    code_lang = ""
+    code_start = 0
+    code_lines = None
+    table_start = 0
+    table_rows = []
+
+    for lineno, line in enumerate(md_text.split("\n"), start=1):
+        stripped = line.strip()
+
+        if code_lines is not None:
+            if stripped.startswith(CODE_FENCE):
+                yield (TOKEN_CODE, code_start, code_lang, "\n".join(code_lines))
+                code_lines = None
+            else:
+                code_lines.append(line)
+            continue
+
+        if stripped.startswith("|"):
+            if not table_rows:
+                table_start = lineno
+            table_rows.append(line)
+            continue
+        if table_rows:
+            yield (TOKEN_TABLE, table_start, table_rows)
+            table_rows = []
+
+        if not stripped:
+            continue
+
+        if stripped.startswith(CODE_FENCE):
+            code_lang = stripped[len(CODE_FENCE):].strip()
+            code_start = lineno
+            code_lines = []
+            continue
+
+        kind, *data = classify_line(line, stripped)
+        yield (kind, lineno, *data)
+
+    if code_lines is not None:
+        # Bloque sin cerrar: llega hasta el final del archivo.
+        yield (TOKEN_CODE, code_start, code_lang, "\n".join(code_lines))
+    if table_rows:
+        yield (TOKEN_TABLE, table_start, table_rows)
+
+
+INLINE_TEXT = "text"
+INLINE_CODE = "code"
+INLINE_IMAGE = "image"
+INLINE_LINK = "link"
+INLINE_STRONG_EM = "strong_em"
+INLINE_STRONG = "strong"
+INLINE_EM = "em"
+
+# Una sola alternativa precompilada para todo el formato inline. El orden
+# importa: code protege su contenido, y la imagen va antes que el link para
+# que "![alt](src)" no se lea como "!" + link.
+INLINE_RE = re.compile(
+    r"`(?P<code>[^`]+)`"
+    r"|!\[(?P<alt>[^\]]*)\]\((?P<src>[^)]+)\)"
+    r"|\[(?P<label>[^\]]+)\]\((?P<href>[^)]+)\)"
+    r"|\*\*\*(?P<strong_em>.+?)\*\*\*"
+    r"|\*\*(?P<strong>.+?)\*\*"
+    r"|\*(?P<em>.+?)\*"
+)
+# "[](destino)" no es un link para el renderer (INLINE_RE pide etiqueta) y
+# queda como texto, pero las comprobaciones de links si lo validan.
+EMPTY_LABEL_LINK_RE = re.compile(r"\[\]\((?P<href>[^)]+)\)")
+# Sin ninguno de estos caracteres el texto no tiene formato inline.
+INLINE_MARKERS = ("`", "*", "[")
+
+
+def has_inline_markup(text: str) -> bool:
+    return any(marker in text for marker in INLINE_MARKERS)
+
+
+def tokenize_inline(text: str):
+    """Recorre text una vez y genera tokens (tipo, offset, *datos).
+
+        (INLINE_TEXT, offset, texto)
+        (INLINE_CODE, offset, codigo)
+        (INLINE_IMAGE, offset, alt, src)
+        (INLINE_LINK, offset, etiqueta, href)
+        (INLINE_STRONG_EM | INLINE_STRONG | INLINE_EM, offset, texto_interior)
+
+    El texto interior de links y enfasis queda sin tokenizar: quien lo
+    necesite (el renderer, p. ej.) llama de nuevo a tokenize_inline.
+    """
+    position = 0
+    for match in INLINE_RE.finditer(text):
+        start = match.start()
+        if start > position:
+            yield (INLINE_TEXT, position, text[position:start])
+        kind = match.lastgroup
+        if kind == "src":
+            yield (INLINE_IMAGE, start, match.group("alt"), match.group("src"))
+        elif kind == "href":
+            yield (INLINE_LINK, start, match.group("label"), match.group("href"))
+        else:
+            yield (kind, start, match.group(kind))
+        position = match.end()
+    if position < len(text):
+        yield (INLINE_TEXT, position, text[position:])
+
+
+def inline_format(text):
+    """Aplica formato inline (code, imagenes, links, bold, italic) en una sola pasada."""
+    if not has_inline_markup(text):
+        return text
+    parts = []
+    for token in tokenize_inline(text):
+        kind = token[0]
+        if kind == INLINE_TEXT:
+            parts.append(token[2])
+        elif kind == INLINE_CODE:
+            code = token[2].replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+            parts.append(f"<code>{code}</code>")
+        elif kind == INLINE_IMAGE:
+            parts.append(f'<img alt="{token[2]}" src="{token[3]}" loading="lazy" decoding="async">')
+        elif kind == INLINE_LINK:
+            parts.append(f'<a href="{token[3]}">{inline_format(token[2])}</a>')
+        elif kind == INLINE_STRONG_EM:
+            parts.append(f"<strong><em>{inline_format(token[2])}</em></strong>")
+        elif kind == INLINE_STRONG:
+            parts.append(f"<strong>{inline_format(token[2])}</strong>")
+        else:
+            parts.append(f"<em>{inline_format(token[2])}</em>")
+    return "".join(parts)
+
+
+def heading_anchor(file_id: str, formatted_text: str) -> str:
+    """id del <hN>: file_id + slug del titulo ya formateado."""
+    return f"{file_id}-{ANCHOR_SLUG_RE.sub('-', formatted_text.lower().strip())}"
+
+
+class Node:
+    """Nodo de bloque; line es la linea 1-based donde empieza en el .md.
+
+    kind identifica el tipo de nodo para los hooks de render de build-html.py.
+    """
+
+    __slots__ = ("line",)
+    kind = "node"
+
+    def __init__(self, line: int):
+        self.line = line
+
+
+class Heading(Node):
+    __slots__ = ("level", "text")
+    kind = "heading"
+
+    def __init__(self, line: int, level: int, text: str):
+        super().__init__(line)
+        self.level = level
+        self.text = text
+
+
+class Paragraph(Node):
+    __slots__ = ("text",)
+    kind = "paragraph"
+
+    def __init__(self, line: int, text: str):
+        super().__init__(line)
+        self.text = text
+
+
+class ListItem(Node):
+    __slots__ = ("text",)
+    kind = "list_item"
+
+    def __init__(self, line: int, text: str):
+        super().__init__(line)
+        self.text = text
+
+
+class ListBlock(Node):
+    __slots__ = ("ordered", "items")
+    kind = "list"
+
+    def __init__(self, line: int, ordered: bool, items: list):
+        super().__init__(line)
+        self.ordered = ordered
+        self.items = items
+
+
+class Table(Node):
+    """header y rows ya partidos en celdas; una tabla de una sola fila queda vacia."""
+
+    __slots__ = ("header", "rows")
+    kind = "table"
+
+    def __init__(self, line: int, header: list, rows: list):
+        super().__init__(line)
+        self.header = header
+        self.rows = rows
+
+
+class CodeBlock(Node):
+    __slots__ = ("lang", "code")
+    kind = "code"
+
+    def __init__(self, line: int, lang: str, code: str):
+        super().__init__(line)
+        self.lang = lang
+        self.code = code
+
+
+class MermaidBlock(CodeBlock):
+    __slots__ = ()
+
+
+class Rule(Node):
+    __slots__ = ()
+    kind = "rule"
+
+
+class Document:
+    """Arbol de un .md: children en orden, title es el texto del primer '# '."""
+
+    __slots__ = ("path", "file_id", "title", "digest", "children")
+
+    def __init__(self, path: str, file_id: str, title, digest: str, children: list):
+        self.path = path
+        self.file_id = file_id
+        self.title = title
+        self.digest = digest
+        self.children = children
+
+
+def file_id_for(path: str) -> str:
+    """Id de seccion de una leccion en el HTML: '01-junior/00-x.md' -> '01-junior-00-x'."""
+    return path.replace("/", "-").replace(".md", "")
+
+
+def split_table_row(row: str) -> list:
+    return [cell.strip() for cell in row.strip().strip("|").split("|")]
+
+
+def parse_markdown(md_text: str, path: str = "", file_id=None) -> Document:
+    """Parsea md_text una vez y devuelve su Document."""
+    children = []
+    title = None
+    current_list = None
+
+    for token in tokenize_blocks(md_text):
+        kind, line = token[0], token[1]
+
+        if kind == TOKEN_BULLET or kind == TOKEN_ORDERED:
+            ordered = kind == TOKEN_ORDERED
+            if current_list is None or current_list.ordered != ordered:
+                current_list = ListBlock(line, ordered, [])
+                children.append(current_list)
+            current_list.items.append(ListItem(line, token[2]))
+            continue
+
+        # Cualquier otro bloque (tambien las pistas "Siguiente:") cierra la lista
+        current_list = None
+
+        if kind == TOKEN_PARAGRAPH:
+            children.append(Paragraph(line, token[2]))
+        elif kind == TOKEN_HEADING:
+            level, text = token[2], token[3]
+            if level == 1 and title is None:
+                title = text
+            children.append(Heading(line, level, text))
+        elif kind == TOKEN_CODE:
+            lang, code = token[2], token[3]
+            node_class = MermaidBlock if lang.lower() == "mermaid" else CodeBlock
+            children.append(node_class(line, lang, code))
+        elif kind == TOKEN_TABLE:
+            rows = token[2]
+            if len(rows) < 2:
+                children.append(Table(line, [], []))
+            else:
+                # rows[1] es el separador |---|---|
+                children.append(Table(line, split_table_row(rows[0]), [split_table_row(row) for row in rows[2:]]))
+        elif kind == TOKEN_HR:
+            children.append(Rule(line))
+
+    return Document(
+        path,
+        file_id_for(path) if file_id is None else file_id,
+        title,
+        hashlib.sha256(md_text.encode("utf-8")).hexdigest(),
+        children,
+    )
+
+
+_DOCUMENT_CACHE = {}
+
+
+def load_document(root: Path, rel_path: str):
+    """Lee y parsea root/rel_path, o None si no existe.
+
+    Los arboles se memorizan por (mtime, tamano): en un proceso de larga
+    duracion solo se vuelve a leer y parsear lo que cambio en disco.
+    """
+    full_path = root / rel_path
+    try:
+        stat = full_path.stat()
+    except OSError:
+        return None
+    cache_key = str(full_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _DOCUMENT_CACHE.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with stage("read"):
+        text = full_path.read_text(encoding="utf-8", errors="replace")
+    with stage("parse"):
+        document = parse_markdown(text, rel_path)
+    # [signature, document, source text, LineIndex built on demand by load_line_index]
+    _DOCUMENT_CACHE[cache_key] = [signature, document, text, None]
+    return document
+
+
+class LineIndex:
+    """Offsets donde empieza cada linea de un texto, para pasar offset -> (linea, columna).
+
+    Se construye una vez por archivo en O(n) y cada consulta es una busqueda
+    binaria (bisect) en O(log n), en lugar de contar los saltos de linea del
+    prefijo en cada link, que con muchos links por leccion es cuadratico.
+    Lineas y columnas son 1-based; la columna cuenta caracteres.
+    """
+
+    __slots__ = ("text", "starts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = [0]
+        self.starts.extend(match.end() for match in NEWLINE_RE.finditer(text))
+
+    def line_start(self, line: int) -> int:
+        """Offset del primer caracter de line (1-based)."""
+        return self.starts[min(max(line, 1), len(self.starts)) - 1]
+
+    def locate(self, offset: int):
+        """(linea, columna) del caracter en offset."""
+        line = bisect.bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+
+def load_line_index(root: Path, rel_path: str):
+    """LineIndex del mismo texto que parseo load_document (memorizado igual), o None si no existe."""
+    if load_document(root, rel_path) is None:
+        return None
+    entry = _DOCUMENT_CACHE[str(root / rel_path)]
+    if entry[3] is None:
+        entry[3] = LineIndex(entry[2])
+    return entry[3]
+
+
+def iter_nodes(document: Document, node_class=Node):
+    """Nodos de bloque del documento (incluidos los items de lista) que son node_class."""
+    for node in document.children:
+        if isinstance(node, node_class):
+            yield node
+        if isinstance(node, ListBlock):
+            for item in node.items:
+                if isinstance(item, node_class):
+                    yield item
+
+
+def iter_inline_texts(document: Document):
+    """(linea, texto) de cada texto con formato inline: titulos, parrafos, items y celdas."""
+    for node in document.children:
+        if isinstance(node, (Heading, Paragraph)):
+            yield node.line, node.text
+        elif isinstance(node, ListBlock):
+            for item in node.items:
+                yield item.line, item.text
+        elif isinstance(node, Table) and node.header:
+            for cell in node.header:
+                yield node.line, cell
+            for row_index, row in enumerate(node.rows):
+                for cell in row:
+                    yield node.line + 2 + row_index, cell
+
+
+def _iter_span_links(span: str):
+    if not has_inline_markup(span):
+        return
+    for token in tokenize_inline(span):
+        kind = token[0]
+        if kind == INLINE_TEXT:
+            for match in EMPTY_LABEL_LINK_RE.finditer(token[2]):
+                yield INLINE_LINK, match.group("href"), ""
+        elif kind == INLINE_LINK:
+            yield kind, token[3], token[2]
+            yield from _iter_span_links(token[2])
+        elif kind == INLINE_IMAGE:
+            yield kind, token[3], token[2]
+        elif kind in (INLINE_STRONG_EM, INLINE_STRONG, INLINE_EM):
+            yield from _iter_span_links(token[2])
+
+
+def iter_links(document: Document):
+    """(linea, tipo, destino, texto) de cada link e imagen fuera de bloques de codigo.
+
+    tipo es INLINE_LINK o INLINE_IMAGE; tambien se recorren los links que hay
+    dentro de etiquetas o enfasis.
+    """
+    for line, text in iter_inline_texts(document):
+        for kind, target, label in _iter_span_links(text):
+            yield line, kind, target, label
+
+
+def iter_link_positions(document: Document, index: LineIndex):
+    """(linea, columna, tipo, destino, texto) de cada link e imagen, con la posicion exacta del destino.
+
+    iter_links solo sabe la linea donde empieza el bloque (un parrafo puede
+    ocupar varias); aqui se busca "](destino" en el texto fuente desde esa
+    linea, avanzando dentro del bloque, y LineIndex da linea y columna. Si el
+    destino no aparece tal cual, queda la linea del bloque sin columna.
+    """
+    text = index.text
+    block_line = None
+    cursor = 0
+    for line, kind, target, label in iter_links(document):
+        if line != block_line:
+            block_line = line
+            cursor = index.line_start(line)
+        position = -1
+        for prefix in ("](", "](<"):
+            found = text.find(prefix + target, cursor)
+            if found >= 0:
+                position = found + len(prefix)
+                break
+        if position < 0:
+            # A link nested in a previous link's label sits before the cursor.
+            found = text.find(target, index.line_start(line))
+            position = found if found >= 0 else -1
+        if position < 0:
+            yield line, None, kind, target, label
+            continue
+        cursor = position + len(target)
+        found_line, column = index.locate(position)
+        yield found_line, column, kind, target, label
@@ -0,0 +1,615 @@
+"""
+Modelo de diagramas Mermaid (flowchart/graph y stateDiagram) del curso.
+Solo stdlib Python 3.
+
+parse_mermaid() recorre el codigo de un bloque una sola vez y construye un
+MermaidDiagram con sus nodos, aristas y subgraphs. Los helpers de
+build-html.py (leyenda de flechas, deteccion y render del diagrama de
+arquitectura por capas) consultan ese modelo en lugar de volver a escanear el
+texto con una regex distinta cada uno; load_mermaid() lo memoiza por texto.
+
+No es un parser completo de Mermaid: reconoce lo que usa el curso
+(declaraciones de nodo con forma y etiqueta, cadenas de aristas con '&',
+etiquetas '-->|x|' y '-- x -->', subgraphs anidados, estados compuestos y
+directivas style/linkStyle/classDef). Las lineas que no entiende se ignoran.
+"""
+
+import functools
+import re
+
+# Referencia a nodo: id, forma opcional (el grupo con nombre de la forma
+# guarda la etiqueta; match.lastgroup dice cual es) y clase ':::x'. Las
+# aperturas de dos caracteres van antes que las de uno para que '((' no se
+# lea como '('; una etiqueta entre comillas puede contener el cierre.
+NODE_REF_RE = re.compile(
+    r"""\s*(?P<id>\[\*\]|[\w$]+)
+    (?:\(\((?P<circle>"[^"]*".*?|.*?)\)\)
+      |\(\[(?P<stadium>"[^"]*".*?|.*?)\]\)
+      |\[\[(?P<subroutine>"[^"]*".*?|.*?)\]\]
+      |\[\((?P<cylinder>"[^"]*".*?|.*?)\)\]
+      |\{\{(?P<hexagon>"[^"]*".*?|.*?)\}\}
+      |\[(?P<rect>"[^"]*"[^\]]*|[^\]]*)\]
+      |\((?P<round>"[^"]*"[^)]*|[^)]*)\)
+      |\{(?P<rhombus>"[^"]*"[^}]*|[^}]*)\}
+      |>(?P<flag>"[^"]*"[^\]]*|[^\]]*)\]
+    )?
+    (?::::[\w-]+)?[ \t]*""",
+    flags=re.VERBOSE,
+)
+# Una sola regex para todos los conectores: primero la forma con texto en
+# medio ('A -- texto --> B'), despues el token con etiqueta opcional '|x|'.
+MERMAID_LINK_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<open>--|==|-\.)\s+(?P<text>[^|]+?)\s+(?P<close>-{2,}[>ox]?|={2,}[>ox]?|\.+-[>ox]?)"
+    r"|(?P<token><?(?:-\.+-|-{2,}|={2,})[>ox]?)(?:\|(?P<label>[^|]*)\|)?"
+    r")\s*"
+)
+# Una pasada sobre el bloque entero: cada linea se clasifica por el grupo
+# con nombre que casa (fin de bloque, directiva, direction, subgraph o
+# sentencia con nodos y aristas). Los comentarios '%%' no casan.
+MERMAID_LINE_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"(?P<end>(?:end|\})[ \t;]*$)"
+    r"|(?P<directive>style|linkStyle|classDef|class|click|note)[ \t]+(?P<args>[^\n]*)"
+    r"|direction[ \t]+(?P<direction>\w+)"
+    r"|subgraph[ \t]+(?P<subgraph>[^\n]*)"
+    r"|(?P<statement>[^\s%][^\n]*)"
+    r")",
+    flags=re.MULTILINE,
+)
+STATE_BLOCK_RE = re.compile(r'^state\s+(?:"(?P<title>[^"]*)"\s+as\s+)?(?P<id>[\w$]+)\s*\{$')
+STATE_ALIAS_RE = re.compile(r'^state\s+"(?P<title>[^"]*)"\s+as\s+(?P<id>[\w$]+)$')
+LABEL_BREAK_RE = re.compile(r"\s*\n\s*")
+
+
+class MermaidNode:
+    """Nodo del diagrama; label es None si nunca se declaro con forma."""
+
+    __slots__ = ("id", "label", "shape", "subgraph")
+
+    def __init__(self, node_id: str, subgraph=None):
+        self.id = node_id
+        self.label = None
+        self.shape = None
+        self.subgraph = subgraph
+
+
+class MermaidEdge:
+    """Arista source -> target; token es el conector tal cual ('-->', '-.->', '--o'...)."""
+
+    __slots__ = ("source", "target", "token", "label")
+
+    def __init__(self, source: str, target: str, token: str, label):
+        self.source = source
+        self.target = target
+        self.token = token
+        self.label = label
+
+
+class MermaidSubgraph:
+    """Subgraph (o estado compuesto) con los ids de nodo declarados dentro, en orden."""
+
+    __slots__ = ("id", "title", "parent", "direction", "nodes")
+
+    def __init__(self, subgraph_id: str, title, parent):
+        self.id = subgraph_id
+        self.title = title
+        self.parent = parent
+        self.direction = None
+        self.nodes = []
+
+
+class MermaidDiagram:
+    """Modelo de un bloque: kind es 'flowchart', 'state' u 'other'.
+
+    nodes y subgraphs son dicts por id en orden de aparicion; edges conserva
+    el orden del codigo (el que usan los linkStyle N). directives guarda
+    (palabra clave, resto de la linea) de style/linkStyle/classDef/...
+    skipped son las sentencias que el parser no pudo leer enteras.
+    """
+
+    __slots__ = ("source", "kind", "direction", "nodes", "edges", "subgraphs", "directives", "skipped")
+
+    def __init__(self, source: str, kind: str, direction):
+        self.source = source
+        self.kind = kind
+        self.direction = direction
+        self.nodes = {}
+        self.edges = []
+        self.subgraphs = {}
+        self.directives = []
+        self.skipped = []
+
+    def node_label(self, node_id: str, default: str) -> str:
+        node = self.nodes.get(node_id)
+        if node is None or not node.label:
+            return default
+        return node.label
+
+    def subgraph_title(self, subgraph_id: str, default: str) -> str:
+        subgraph = self.subgraphs.get(subgraph_id)
+        if subgraph is None or not subgraph.title:
+            return default
+        return subgraph.title
+
+    def has_edge(self, source: str, target=None, token=None) -> bool:
+        """Hay una arista desde source (y hacia target / con token, si se indican).
+
+        Los ids se comparan sin distinguir mayusculas.
+        """
+        source = source.lower()
+        target = target.lower() if target else None
+        for edge in self.edges:
+            if edge.source.lower() != source:
+                continue
+            if target is not None and edge.target.lower() != target:
+                continue
+            if token is not None and edge.token != token:
+                continue
+            return True
+        return False
+
+    def has_subgraph(self, subgraph_id: str) -> bool:
+        subgraph_id = subgraph_id.lower()
+        return any(key.lower() == subgraph_id for key in self.subgraphs)
+
+
+def clean_mermaid_label(raw_label: str) -> str:
+    label = raw_label.strip()
+    if not label or (label[0] not in "\"'" and "<br" not in label and "\\n" not in label and "\n" not in label):
+        return label
+    if len(label) >= 2 and ((label[0] == '"' and label[-1] == '"') or (label[0] == "'" and label[-1] == "'")):
+        label = label[1:-1]
+    label = label.replace("<br/>", "\n").replace("<br>", "\n").replace("\\n", "\n")
+    label = LABEL_BREAK_RE.sub("\n", label)
+    return label.strip()
+
+
+def mermaid_kind(source: str) -> str:
+    header = source.lstrip()
+    if header.startswith("flowchart") or header.startswith("graph"):
+        return "flowchart"
+    if header.startswith("stateDiagram"):
+        return "state"
+    return "other"
+
+
+def normalize_mermaid_source(source: str) -> str:
+    """Unifica conectores que el Mermaid del navegador no pinta igual.
+
+    En flowcharts '..>' y '-.o' pasan a '-.->'; en stateDiagram '-.->' pasa
+    a '-->'.
+    """
+    kind = mermaid_kind(source)
+    if kind == "flowchart":
+        if "..>" in source:
+            source = source.replace("..>", "-.->")
+        if "-.o" in source:
+            source = source.replace("-.o", "-.->")
+    elif kind == "state" and "-.->" in source:
+        source = source.replace("-.->", "-->")
+    return source
+
+
+def _parse_node_ref(text: str, position: int):
+    """Lee 'ID', 'ID[etiqueta]', 'ID((x))'... desde position.
+
+    Devuelve (id, forma, etiqueta, fin) o None si no hay un id.
+    """
+    match = NODE_REF_RE.match(text, position)
+    if not match:
+        return None
+    shape = match.lastgroup
+    if shape == "id":
+        return match.group("id"), None, None, match.end()
+    return match.group("id"), shape, clean_mermaid_label(match.group(shape)), match.end()
+
+
+def _parse_node_group(text: str, position: int):
+    """Lee 'A & B[x] & C' -> ([(id, forma, etiqueta)...], fin)."""
+    group = []
+    while True:
+        parsed = _parse_node_ref(text, position)
+        if parsed is None:
+            return group, position
+        node_id, shape, label, position = parsed
+        group.append((node_id, shape, label))
+        if not text.startswith("&", position):
+            return group, position
+        position += 1
+
+
+def _declare_node(diagram: MermaidDiagram, stack: list, node_id: str, shape, label):
+    node = diagram.nodes.get(node_id)
+    if node is None:
+        if node_id in diagram.subgraphs:
+            return
+        subgraph = stack[-1] if stack else None
+        node = MermaidNode(node_id, subgraph.id if subgraph else None)
+        diagram.nodes[node_id] = node
+        if subgraph is not None:
+            subgraph.nodes.append(node_id)
+    if shape is not None and node.label is None:
+        node.shape = shape
+        node.label = label
+
+
+def _parse_statement(diagram: MermaidDiagram, stack: list, line: str) -> bool:
+    """Anade los nodos y aristas de una sentencia; False si no la pudo leer entera."""
+    edge_label = None
+    if diagram.kind == "state" and " : " in line:
+        line, edge_label = line.split(" : ", 1)
+        edge_label = edge_label.strip()
+    group, position = _parse_node_group(line, 0)
+    if not group:
+        return False
+    for node_id, shape, label in group:
+        _declare_node(diagram, stack, node_id, shape, label)
+    while position < len(line):
+        link = MERMAID_LINK_RE.match(line, position)
+        if not link:
+            return False
+        if link.group("open"):
+            token = link.group("close")
+            if token.startswith("."):
+                token = "-" + token
+            label = link.group("text")
+        else:
+            token = link.group("token")
+            label = link.group("label")
+        targets, position = _parse_node_group(line, link.end())
+        if not targets:
+            return False
+        for node_id, shape, node_label in targets:
+            _declare_node(diagram, stack, node_id, shape, node_label)
+        for source_id, _shape, _label in group:
+            for target_id, _shape, _label in targets:
+                diagram.edges.append(MermaidEdge(source_id, target_id, token, label or edge_label))
+        group = targets
+    return True
+
+
+def _open_subgraph(diagram: MermaidDiagram, stack: list, subgraph_id: str, title) -> None:
+    parent = stack[-1].id if stack else None
+    subgraph = MermaidSubgraph(subgraph_id, title, parent)
+    diagram.subgraphs[subgraph_id] = subgraph
+    stack.append(subgraph)
+
+
+def _parse_state_declaration(diagram: MermaidDiagram, stack: list, line: str) -> None:
+    block = STATE_BLOCK_RE.match(line)
+    if block:
+        _open_subgraph(diagram, stack, block.group("id"), block.group("title"))
+        return
+    alias = STATE_ALIAS_RE.match(line)
+    if alias:
+        _declare_node(diagram, stack, alias.group("id"), "rect", alias.group("title"))
+
+
+def parse_mermaid(source: str) -> MermaidDiagram:
+    """Construye el MermaidDiagram de un bloque (ya normalizado o no)."""
+    header_start = len(source) - len(source.lstrip())
+    header_end = source.find("\n", header_start)
+    if header_end == -1:
+        header_end = len(source)
+    header_words = source[header_start:header_end].split()
+    diagram = MermaidDiagram(
+        source,
+        mermaid_kind(header_words[0] if header_words else ""),
+        header_words[1] if len(header_words) > 1 else None,
+    )
+    if diagram.kind == "other":
+        return diagram
+
+    stack = []
+    for match in MERMAID_LINE_RE.finditer(source, header_end):
+        line_kind = match.lastgroup
+        if line_kind == "statement":
+            line = match.group("statement").rstrip(" \t;")
+            if diagram.kind == "state" and line.startswith("state "):
+                _parse_state_declaration(diagram, stack, line)
+            elif not _parse_statement(diagram, stack, line):
+                diagram.skipped.append(line)
+        elif line_kind == "args":
+            diagram.directives.append((match.group("directive"), match.group("args").rstrip(" \t;")))
+        elif line_kind == "end":
+            if stack:
+                stack.pop()
+        elif line_kind == "direction":
+            if stack:
+                stack[-1].direction = match.group("direction")
+            else:
+                diagram.direction = match.group("direction")
+        elif line_kind == "subgraph":
+            rest = match.group("subgraph").rstrip(" \t;")
+            parsed = _parse_node_ref(rest, 0)
+            if parsed is not None and parsed[3] == len(rest):
+                _open_subgraph(diagram, stack, parsed[0], parsed[2])
+            else:
+                _open_subgraph(diagram, stack, rest, clean_mermaid_label(rest))
+    return diagram
+
+
+# Layout por capas para render_flowchart_svg (build-html.py). Medidas en
+# unidades del viewBox del SVG.
+LAYOUT_MARGIN = 20
+LAYOUT_RANK_GAP = 84
+LAYOUT_NODE_GAP = 28
+LAYOUT_LANE_GAP = 32
+LAYOUT_CLUSTER_PAD = 18
+LAYOUT_CLUSTER_TITLE = 30
+
+
+class FlowchartLayout:
+    """Geometria de un flowchart ya colocado.
+
+    nodes: id -> (x, y, ancho, alto) con x, y en la esquina superior izquierda.
+    clusters: id de subgraph -> (x, y, ancho, alto).
+    edges: (MermaidEdge, (inicio, control1, control2, fin)) en el orden del
+    codigo; cada punto es (x, y) y forman una curva cubica.
+    """
+
+    __slots__ = ("width", "height", "nodes", "clusters", "edges")
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.nodes = {}
+        self.clusters = {}
+        self.edges = []
+
+
+def _assign_ranks(diagram: MermaidDiagram) -> dict:
+    """Rango de cada nodo: camino mas largo desde una fuente, sin las aristas de retorno.
+
+    Las aristas que cierran un ciclo (las que el DFS encuentra hacia un nodo
+    de la pila, recorriendo en orden de declaracion) no cuentan para el rango.
+    """
+    successors = {node_id: [] for node_id in diagram.nodes}
+    for edge in diagram.edges:
+        successors[edge.source].append(edge.target)
+
+    on_stack = set()
+    visited = set()
+    forward = {node_id: [] for node_id in diagram.nodes}
+    for root in diagram.nodes:
+        if root in visited:
+            continue
+        visited.add(root)
+        on_stack.add(root)
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node_id, children = stack[-1]
+            for child in children:
+                if child in on_stack:
+                    continue
+                forward[node_id].append(child)
+                if child not in visited:
+                    visited.add(child)
+                    on_stack.add(child)
+                    stack.append((child, iter(successors[child])))
+                    break
+            else:
+                stack.pop()
+                on_stack.discard(node_id)
+
+    indegree = {node_id: 0 for node_id in diagram.nodes}
+    for targets in forward.values():
+        for target in targets:
+            indegree[target] += 1
+    ranks = {node_id: 0 for node_id in diagram.nodes}
+    ready = [node_id for node_id in diagram.nodes if indegree[node_id] == 0]
+    while ready:
+        node_id = ready.pop()
+        for target in forward[node_id]:
+            ranks[target] = max(ranks[target], ranks[node_id] + 1)
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                ready.append(target)
+    return ranks
+
+
+def _order_slots(diagram: MermaidDiagram, ranks: dict, lanes: list, lane_of: dict) -> dict:
+    """(carril, rango) -> ids en orden, con una pasada de baricentros hacia abajo y otra hacia arriba."""
+    slots = {}
+    for node_id in diagram.nodes:
+        slots.setdefault((lane_of[node_id], ranks[node_id]), []).append(node_id)
+    neighbours = {node_id: ([], []) for node_id in diagram.nodes}
+    for edge in diagram.edges:
+        if ranks[edge.source] < ranks[edge.target]:
+            neighbours[edge.target][0].append(edge.source)
+            neighbours[edge.source][1].append(edge.target)
+        elif ranks[edge.source] > ranks[edge.target]:
+            neighbours[edge.source][0].append(edge.target)
+            neighbours[edge.target][1].append(edge.source)
+
+    max_rank = max(ranks.values(), default=0)
+
+    def positions():
+        # Posicion transversal de cada nodo dentro de su rango, recorriendo los carriles en orden.
+        result = {}
+        for rank in range(max_rank + 1):
+            index = 0
+            for lane in lanes:
+                for node_id in slots.get((lane, rank), ()):
+                    result[node_id] = index
+                    index += 1
+        return result
+
+    for side, rank_order in ((0, range(1, max_rank + 1)), (1, range(max_rank - 1, -1, -1))):
+        for rank in rank_order:
+            current = positions()
+            for lane in lanes:
+                members = slots.get((lane, rank))
+                if not members or len(members) < 2:
+                    continue
+
+                def barycenter(node_id, current=current):
+                    linked = neighbours[node_id][side]
+                    if not linked:
+                        return current[node_id]
+                    return sum(current[other] for other in linked) / len(linked)
+
+                members.sort(key=barycenter)
+    return slots
+
+
+def layout_flowchart(diagram: MermaidDiagram, node_sizes: dict, label_sizes=()) -> FlowchartLayout:
+    """Coloca un flowchart por capas: rango en el eje principal, subgraphs en carriles.
+
+    node_sizes da (ancho, alto) de cada nodo y label_sizes el de las
+    etiquetas de arista que haya; el hueco entre rangos crece para que la
+    etiqueta mas larga quepa entre los nodos. El eje principal es vertical
+    para TD/TB/BT y horizontal para LR/RL. Cada subgraph ocupa su propio
+    carril en el eje transversal (los nodos sueltos comparten otro), asi
+    que las cajas de los subgraphs nunca se solapan. Dentro de cada rango
+    los nodos se ordenan por baricentro para reducir cruces.
+    """
+    direction = (diagram.direction or "TD").upper()
+    horizontal = direction in ("LR", "RL")
+    mirrored = direction in ("RL", "BT")
+
+    def main_size(node_id):
+        width, height = node_sizes[node_id]
+        return width if horizontal else height
+
+    def cross_size(node_id):
+        width, height = node_sizes[node_id]
+        return height if horizontal else width
+
+    ranks = _assign_ranks(diagram)
+    lane_of = {}
+    lanes = []
+    for node_id, node in diagram.nodes.items():
+        lane_of[node_id] = node.subgraph
+        if node.subgraph not in lanes:
+            lanes.append(node.subgraph)
+    slots = _order_slots(diagram, ranks, lanes, lane_of)
+    max_rank = max(ranks.values(), default=0)
+    has_clusters = any(lane is not None for lane in lanes)
+    title_main = LAYOUT_CLUSTER_TITLE if has_clusters and not horizontal else 0
+    title_cross = LAYOUT_CLUSTER_TITLE if horizontal else 0
+    rank_gap = max(
+        [LAYOUT_RANK_GAP] + [(width if horizontal else height) + 32 for width, height in label_sizes]
+    )
+
+    # Eje principal: grosor de cada rango = nodo mas grueso del rango.
+    rank_start = []
+    rank_thickness = []
+    main_cursor = LAYOUT_MARGIN + (LAYOUT_CLUSTER_PAD + title_main if has_clusters else 0)
+    for rank in range(max_rank + 1):
+        thickness = max(
+            (main_size(node_id) for lane in lanes for node_id in slots.get((lane, rank), ())),
+            default=0,
+        )
+        rank_start.append(main_cursor)
+        rank_thickness.append(thickness)
+        main_cursor += thickness + rank_gap
+    main_total = main_cursor - rank_gap + LAYOUT_MARGIN + (LAYOUT_CLUSTER_PAD if has_clusters else 0)
+
+    # Eje transversal: cada carril mide lo que su rango mas ancho.
+    lane_start = {}
+    lane_content = {}
+    cross_cursor = LAYOUT_MARGIN
+    for lane in lanes:
+        content = max(
+            (
+                sum(cross_size(node_id) for node_id in slots[(lane, rank)])
+                + LAYOUT_NODE_GAP * (len(slots[(lane, rank)]) - 1)
+                for rank in range(max_rank + 1)
+                if (lane, rank) in slots
+            ),
+            default=0,
+        )
+        padding = LAYOUT_CLUSTER_PAD if lane is not None else 0
+        lane_start[lane] = cross_cursor
+        lane_content[lane] = (cross_cursor + padding + (title_cross if lane is not None else 0), content)
+        cross_cursor += padding * 2 + (title_cross if lane is not None else 0) + content + LAYOUT_LANE_GAP
+    cross_total = cross_cursor - LAYOUT_LANE_GAP + LAYOUT_MARGIN
+
+    def to_xy(main, cross):
+        return (main, cross) if horizontal else (cross, main)
+
+    def mirror(main, main_len=0):
+        # RL/BT: se coloca como LR/TD y se refleja el eje principal.
+        return main_total - main - main_len if mirrored else main
+
+    layout = FlowchartLayout()
+    layout.width, layout.height = to_xy(main_total, cross_total)
+    placed = {}
+    for (lane, rank), members in slots.items():
+        content_start, content = lane_content[lane]
+        used = sum(cross_size(node_id) for node_id in members) + LAYOUT_NODE_GAP * (len(members) - 1)
+        cross = content_start + (content - used) / 2
+        for node_id in members:
+            main = rank_start[rank] + (rank_thickness[rank] - main_size(node_id)) / 2
+            placed[node_id] = (main, cross, main_size(node_id), cross_size(node_id))
+            cross += cross_size(node_id) + LAYOUT_NODE_GAP
+
+    for node_id in diagram.nodes:
+        main, cross, main_len, _cross_len = placed[node_id]
+        x, y = to_xy(mirror(main, main_len), cross)
+        width, height = node_sizes[node_id]
+        layout.nodes[node_id] = (x, y, width, height)
+
+    for lane in lanes:
+        if lane is None:
+            continue
+        members = diagram.subgraphs[lane].nodes
+        if not members:
+            continue
+        first_rank = min(ranks[node_id] for node_id in members)
+        last_rank = max(ranks[node_id] for node_id in members)
+        main_from = rank_start[first_rank] - LAYOUT_CLUSTER_PAD - title_main
+        main_to = rank_start[last_rank] + rank_thickness[last_rank] + LAYOUT_CLUSTER_PAD
+        content_start, content = lane_content[lane]
+        cross_from = lane_start[lane]
+        cross_to = content_start + content + LAYOUT_CLUSTER_PAD
+        x1, y1 = to_xy(mirror(main_from, main_to - main_from), cross_from)
+        width, height = to_xy(main_to - main_from, cross_to - cross_from)
+        layout.clusters[lane] = (x1, y1, width, height)
+
+    for edge in diagram.edges:
+        source_main, source_cross, source_main_len, source_cross_len = placed[edge.source]
+        target_main, target_cross, target_main_len, target_cross_len = placed[edge.target]
+        source_mid = source_cross + source_cross_len / 2
+        target_mid = target_cross + target_cross_len / 2
+        source_rank = ranks[edge.source]
+        target_rank = ranks[edge.target]
+        bend = rank_gap / 2
+        if source_rank < target_rank:
+            start = (source_main + source_main_len, source_mid)
+            end = (target_main, target_mid)
+            control_1 = (start[0] + bend, start[1])
+            control_2 = (end[0] - bend, end[1])
+        elif source_rank > target_rank:
+            # Arista de retorno: sale y entra por el borde transversal final
+            # de los nodos y hace un arco por fuera, para no pisar la de ida.
+            start = (source_main + source_main_len / 2, source_cross + source_cross_len)
+            end = (target_main + target_main_len / 2, target_cross + target_cross_len)
+            reach = bend + (start[0] - end[0]) * 0.12
+            control_1 = (start[0], max(start[1], end[1]) + reach)
+            control_2 = (end[0], max(start[1], end[1]) + reach)
+        else:
+            before = source_cross < target_cross
+            start = (source_main + source_main_len / 2, source_cross + (source_cross_len if before else 0))
+            end = (target_main + target_main_len / 2, target_cross + (0 if before else target_cross_len))
+            control_1 = (start[0] - bend / 2, start[1])
+            control_2 = (end[0] - bend / 2, end[1])
+        points = tuple(to_xy(mirror(main), cross) for main, cross in (start, control_1, control_2, end))
+        layout.edges.append((edge, points))
+        # La curva queda dentro de sus puntos de control: el lienzo crece si un arco sale de el.
+        cross_total = max(cross_total, control_1[1] + LAYOUT_MARGIN, control_2[1] + LAYOUT_MARGIN)
+    layout.width, layout.height = to_xy(main_total, cross_total)
+    return layout
+
+
+@functools.lru_cache(maxsize=512)
+def load_mermaid(source: str) -> MermaidDiagram:
+    """parse_mermaid(normalize_mermaid_source(source)), memoizado por texto.
+
+    El curso repite muchos diagramas identicos (el de arquitectura por capas
+    sale en decenas de lecciones): cada texto distinto se parsea una vez por
+    proceso. El modelo devuelto es compartido; no hay que modificarlo.
+    """
+    return parse_mermaid(normalize_mermaid_source(source))
@@ -0,0 +1,251 @@
+"""
+Minificacion conservadora de HTML, CSS y JS y variantes .gz para dist/.
+Solo stdlib Python 3.
+
+Nada de renombrar variables ni reescribir expresiones: solo se quitan
+comentarios y espacios que no cambian el significado. Cada minificador
+recorre el texto con una regex de grupos con nombre (match.lastgroup dice
+que token es, como en course_highlight.py), asi que cadenas, plantillas,
+literales regex y bloques <pre> salen intactos.
+
+En JS los saltos de linea se conservan (salvo tras ; { , ( [) para no
+alterar la insercion automatica de punto y coma.
+"""
+
+import gzip
+import re
+
+# -- CSS ---------------------------------------------------------------------
+
+CSS_TOKEN_RE = re.compile(
+    r"""(?P<comment>/\*[\s\S]*?(?:\*/|\Z))"""
+    r"""|(?P<string>"(?:\\[\s\S]|[^"\\])*"|'(?:\\[\s\S]|[^'\\])*')"""
+    r"""|(?P<space>\s+)"""
+    r"""|(?P<punct>[{};,>:])"""
+    r"""|(?P<other>[^"'/\s{};,>:]+|/)"""
+)
+# Whitespace next to these never matters ("a :hover" keeps its space: the colon is not here).
+CSS_TIGHT_BEFORE = frozenset("{};,>")
+CSS_TIGHT_AFTER = frozenset("{};,>:")
+
+
+def minify_css(css: str) -> str:
+    parts = []
+    pending_space = False
+    for match in CSS_TOKEN_RE.finditer(css):
+        kind = match.lastgroup
+        if kind == "comment":
+            # "a/**/b" must not become "ab".
+            pending_space = pending_space or bool(parts)
+            continue
+        if kind == "space":
+            pending_space = bool(parts)
+            continue
+        text = match.group()
+        if pending_space:
+            if parts[-1][-1] not in CSS_TIGHT_AFTER and text[0] not in CSS_TIGHT_BEFORE:
+                parts.append(" ")
+            pending_space = False
+        if text == "}" and parts and parts[-1] == ";":
+            parts.pop()
+        parts.append(text)
+    return "".join(parts)
+
+
+# -- JS ----------------------------------------------------------------------
+
+JS_TOKEN_RE = re.compile(
+    r"""(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))"""
+    r"""|(?P<string>"(?:\\[\s\S]|[^"\\\n])*"|'(?:\\[\s\S]|[^'\\\n])*')"""
+    r"""|(?P<template>`)"""
+    r"""|(?P<space>\s+)"""
+    r"""|(?P<word>[\w$\u0080-\uffff]+)"""
+    r"""|(?P<slash>/)"""
+    r"""|(?P<open>\{)"""
+    r"""|(?P<close>\})"""
+    r"""|(?P<punct>[^\w$\s/{}`"'])"""
+)
+JS_REGEX_RE = re.compile(r"/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*")
+JS_TEMPLATE_CHUNK_RE = re.compile(r"(?:\\[\s\S]|[^`\\$]|\$(?!\{))*")
+# After these words a slash starts a regex literal, not a division.
+JS_REGEX_KEYWORDS = frozenset(
+    "return typeof instanceof in of new delete void throw case do else yield await".split()
+)
+# A newline right after these characters can never end a statement.
+JS_NEWLINE_FREE_AFTER = frozenset(";{,([")
+JS_NEWLINE_FREE_BEFORE = frozenset("}),]")
+
+
+def _word_char(char: str) -> bool:
+    return char.isalnum() or char in "_$" or char > "\x7f"
+
+
+def _js_join_space(before: str, after: str, newline: bool) -> str:
+    """Separador minimo entre dos tokens que en el original tenian espacio en medio."""
+    if newline:
+        if before in JS_NEWLINE_FREE_AFTER or after in JS_NEWLINE_FREE_BEFORE:
+            return ""
+        return "\n"
+    if _word_char(before) and _word_char(after) or before.isdigit() and after == ".":
+        return " "
+    # "a - -b", "a + ++b" and "/ /" (a division next to a regex) need their space.
+    if before == after and before in "+-/" or before in "+-" and after in "+-":
+        return " "
+    return ""
+
+
+def _minify_js_code(source: str, position: int, parts: list, inside_template: bool) -> int:
+    """Minifica codigo JS desde position; dentro de ${...} para en la llave que la cierra."""
+    depth = 0
+    previous = ""  # last significant token
+    pending = None  # None, " " or "\n"
+    length = len(source)
+    while position < length:
+        match = JS_TOKEN_RE.match(source, position)
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "comment":
+            if text.startswith("//") or "\n" in text:
+                pending = "\n"
+            elif pending is None:
+                pending = " "
+            position = match.end()
+            continue
+        if kind == "space":
+            pending = "\n" if "\n" in text or pending == "\n" else " "
+            position = match.end()
+            continue
+        if kind == "close" and inside_template and depth == 0:
+            return position
+        if kind == "slash" and (
+            not previous or previous in JS_REGEX_KEYWORDS or not (_word_char(previous[-1]) or previous in ")]}")
+        ):
+            regex = JS_REGEX_RE.match(source, position)
+            if regex is not None:
+                kind = "regex"
+                text = regex.group()
+                match = regex
+        if pending is not None and parts:
+            parts.append(_js_join_space(parts[-1][-1], text[0], pending == "\n"))
+        pending = None
+        if kind == "template":
+            position = _copy_template(source, match.end(), parts)
+            previous = "`"
+            continue
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+        parts.append(text)
+        previous = text
+        position = match.end()
+    return position
+
+
+def _copy_template(source: str, position: int, parts: list) -> int:
+    """Copia una plantilla `...` tal cual salvo el codigo de sus ${...}; devuelve el final."""
+    parts.append("`")
+    while True:
+        chunk = JS_TEMPLATE_CHUNK_RE.match(source, position)
+        parts.append(chunk.group())
+        position = chunk.end()
+        if position >= len(source):
+            return position
+        if source[position] == "`":
+            parts.append("`")
+            return position + 1
+        # "${": minify the expression up to its closing brace.
+        parts.append("${")
+        position = _minify_js_code(source, position + 2, parts, inside_template=True)
+        if position < len(source):
+            parts.append("}")
+            position += 1
+
+
+def minify_js(js: str) -> str:
+    parts = []
+    _minify_js_code(js, 0, parts, inside_template=False)
+    return "".join(parts).strip()
+
+
+# -- HTML --------------------------------------------------------------------
+
+HTML_TOKEN_RE = re.compile(
+    r"""(?P<raw><(?P<raw_tag>pre|textarea|script|style)\b(?P<raw_attrs>(?:"[^"]*"|'[^']*'|[^>"'])*)>"""
+    r"""(?P<raw_body>[\s\S]*?)</(?P=raw_tag)\s*>)"""
+    r"""|(?P<comment><!--(?!\[if)[\s\S]*?-->)"""
+    r"""|(?P<tag></?[A-Za-z!][^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>)"""
+    r"""|(?P<space>\s+)"""
+    r"""|(?P<text>[^<\s]+|<)""",
+    re.IGNORECASE,
+)
+SCRIPT_TYPE_RE = re.compile(r"""\btype\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+JS_SCRIPT_TYPES = frozenset(("text/javascript", "application/javascript", "module"))
+
+
+def _minify_raw_element(match) -> str:
+    tag = match.group("raw_tag").lower()
+    body = match.group("raw_body")
+    if tag == "style":
+        body = minify_css(body)
+    elif tag == "script":
+        script_type = SCRIPT_TYPE_RE.search(match.group("raw_attrs"))
+        if script_type is None or script_type.group(1).lower() in JS_SCRIPT_TYPES:
+            body = minify_js(body)
+    else:
+        return match.group()
+    open_tag_end = match.start("raw_body") - match.start()
+    close_tag_start = match.end("raw_body") - match.start()
+    whole = match.group()
+    return whole[:open_tag_end] + body + whole[close_tag_start:]
+
+
+def minify_html(html: str) -> str:
+    """Quita comentarios y reduce cada tramo de espacios a uno (un salto si lo habia).
+
+    <pre> y <textarea> se copian tal cual y los <script>/<style> en linea pasan
+    por minify_js/minify_css; las etiquetas (y sus atributos) no se tocan.
+    """
+    parts = []
+    for match in HTML_TOKEN_RE.finditer(html):
+        kind = match.lastgroup
+        if kind == "comment":
+            continue
+        if kind == "space":
+            parts.append("\n" if "\n" in match.group() else " ")
+        elif kind == "text" or kind == "tag":
+            parts.append(match.group())
+        else:
+            parts.append(_minify_raw_element(match))
+    return "".join(parts)
+
+
+# -- Precompresion -----------------------------------------------------------
+
+MINIFIERS = {".html": minify_html, ".css": minify_css, ".js": minify_js}
+
+
+def minify_for(name: str):
+    """Minificador para el archivo name (por extension) o None."""
+    dot = name.rfind(".")
+    return MINIFIERS.get(name[dot:].lower()) if dot >= 0 else None
+
+
+def gzip_bytes(payload: bytes) -> bytes:
+    """gzip con compresion maxima y mtime 0: mismos bytes de entrada, mismo .gz."""
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def format_size_report(rows) -> list:
+    """Lineas de la tabla de tamanos; rows: [(artefacto, original, minificado, gzip)]."""
+    rows = list(rows)
+    rows.append(("total", *(sum(row[column] for row in rows) for column in (1, 2, 3))))
+    width = max(len(row[0]) for row in rows + [("artefacto",)])
+    lines = [f"  {'artefacto':<{width}} {'original':>10} {'minificado':>11} {'gzip':>10} {'ahorro':>7}"]
+    for artifact, original, minified, compressed in rows:
+        saving = 100 - 100 * compressed / original if original else 0
+        lines.append(
+            f"  {artifact:<{width}} {original / 1024:>8.1f}KB {minified / 1024:>9.1f}KB "
+            f"{compressed / 1024:>8.1f}KB {saving:>6.1f}%"
+        )
+    return lines
@@ -0,0 +1,91 @@
+"""
+Orden de las lecciones del curso (segun README).
+Solo stdlib Python 3.
+
+build-html.py las publica en este orden y course_checks.py comprueba que
+todas existen; vive en su propio modulo para que los validadores lo importen
+sin cargar el build.
+"""
+
+FILE_ORDER = [
+    "00-informe/INFORME-CURSO.md",
+    "00-informe/AUDITORIA-EQUIVALENCIA-IOS-ANDROID.md",
+    "00-informe/PLAN-REFUERZO-CURSO-ANDROID.md",
+    "00-informe/MEJORAS-POR-MODULO-Y-EVIDENCIAS.md",
+    "00-nivel-cero/00-introduccion.md",
+    "00-nivel-cero/00-setup.md",
+    "00-nivel-cero/01-que-es-software.md",
+    "00-nivel-cero/02-logica-basica.md",
+    "00-nivel-cero/03-primer-kotlin.md",
+    "00-nivel-cero/04-variables-y-tipos.md",
+    "00-nivel-cero/05-condicionales-y-bucles.md",
+    "00-nivel-cero/06-funciones.md",
+    "00-nivel-cero/07-errores-frecuentes.md",
+    "00-nivel-cero/08-android-studio-desde-cero.md",
+    "00-nivel-cero/09-primera-app-compose.md",
+    "00-nivel-cero/10-inputs-y-validacion.md",
+    "00-nivel-cero/11-navegacion-simple.md",
+    "00-nivel-cero/12-proyecto-rutina-diaria.md",
+    "00-nivel-cero/entregables-nivel-cero.md",
+    "01-junior/00-introduccion.md",
+    "01-junior/00-setup-junior.md",
+    "01-junior/01-arquitectura-android-recomendada.md",
+    "01-junior/02-feature-base-practica.md",
+    "01-junior/03-navegacion-moderna-navigation-compose.md",
+    "01-junior/04-hilt-integracion-inicial.md",
+    "01-junior/05-room-offline-first.md",
+    "01-junior/06-datastore-estado-ligero.md",
+    "01-junior/07-workmanager-tareas-persistentes.md",
+    "01-junior/08-compose-ui-testing.md",
+    "01-junior/09-pruebas-unitarias-viewmodel-repositorio.md",
+    "01-junior/entregables-nivel-junior.md",
+    "02-midlevel/00-introduccion.md",
+    "02-midlevel/01-red-robusta-retrofit-okhttp.md",
+    "02-midlevel/02-offline-first-sincronizacion.md",
+    "02-midlevel/03-consistencia-y-resolucion-de-conflictos.md",
+    "02-midlevel/04-observabilidad-y-diagnostico.md",
+    "02-midlevel/05-pruebas-de-integracion-offline-sync.md",
+    "02-midlevel/06-quality-gates-ci-offline-sync.md",
+    "02-midlevel/07-performance-ci-macrobenchmark-baselineprofiles.md",
+    "02-midlevel/08-observabilidad-produccion-metricas-alertas.md",
+    "02-midlevel/09-decisiones-evolutivas-con-metricas.md",
+    "02-midlevel/10-gobernanza-dependencias-entre-features.md",
+    "02-midlevel/11-versionado-contratos-internos.md",
+    "02-midlevel/12-evolucion-navegacion-y-deeplinks-compatibles.md",
+    "02-midlevel/entregables-nivel-midlevel.md",
+    "03-senior/00-introduccion.md",
+    "03-senior/01-release-strategy-y-rollback-seguro.md",
+    "03-senior/02-incident-response-y-runbooks-operativos.md",
+    "03-senior/03-slos-error-budgets-priorizacion-fiabilidad.md",
+    "03-senior/04-tablero-operativo-fiabilidad-y-alertas-accionables.md",
+    "03-senior/05-gobernanza-tecnica-de-sprint-fiabilidad-vs-roadmap.md",
+    "03-senior/06-simulacion-sprint-bajo-presion-roadmap-y-fiabilidad.md",
+    "03-senior/07-cierre-del-bloque-senior-y-transicion-a-maestria.md",
+    "04-maestria/00-introduccion.md",
+    "04-maestria/01-contratos-evolutivos-entre-dominios.md",
+    "04-maestria/02-bounded-contexts-y-ownership-tecnico.md",
+    "04-maestria/03-mapa-de-dependencias-y-acoplamiento-circular.md",
+    "04-maestria/04-migraciones-transversales-sin-bloqueo.md",
+    "04-maestria/05-coordinacion-release-rollback-y-comunicacion-tecnica.md",
+    "04-maestria/06-evolucion-multi-equipo-y-gobernanza-trimestral.md",
+    "04-maestria/07-defensa-tecnica-del-proyecto-android.md",
+    "04-maestria/08-cierre-proyecto-final-y-publicacion-play-store.md",
+    "04-maestria/09-rubrica-final-y-entrevista-tecnica-android.md",
+    "04-maestria/10-plan-de-90-dias-despues-del-curso.md",
+    "04-maestria/11-epilogo-profesional-y-siguientes-retos.md",
+    "04-maestria/12-casos-reales-y-antipatrones-de-equipos-android.md",
+    "04-maestria/13-operacion-largo-plazo-y-deuda-tecnica.md",
+    "04-maestria/14-primer-ano-en-equipo-android-real.md",
+    "04-maestria/15-mapa-de-carrera-android-de-junior-a-senior.md",
+    "04-maestria/16-cierre-definitivo-del-recorrido-android.md",
+    "05-proyecto-final/00-brief.md",
+    "05-proyecto-final/00-brief-ruralgo-fieldops.md",
+    "05-proyecto-final/01-rubrica-empleabilidad.md",
+    "05-proyecto-final/02-evidencias-obligatorias.md",
+    "05-proyecto-final/03-operacion-senior.md",
+    "05-proyecto-final/04-gobernanza-maestria.md",
+    "anexos/glosario.md",
+    "anexos/guia-publicacion-playstore-real.md",
+    "anexos/preguntas-entrevista-android.md",
+    "anexos/proyecto-final-android.md",
+]
@@ -0,0 +1,146 @@
+"""
+Telemetria de build por etapas para `build-html.py --profile`.
+Solo stdlib Python 3.
+
+Los modulos marcan sus etapas con `with stage("render", item=ruta):`. Sin
+un perfil activo stage() devuelve un contexto vacio, asi que las marcas
+pueden quedarse en el codigo sin coste apreciable. Con start_profile() cada
+etapa acumula llamadas, tiempo total y tiempo propio (sin sus etapas
+hijas: "write" no cuenta el render de las lecciones que va consumiendo), y
+las etapas con item guardan el tiempo de cada item (leccion, diagrama) para
+sacar los mas lentos. Con memory=True se mide ademas el pico de memoria de
+Python con tracemalloc, global y por etapa de primer nivel.
+"""
+
+import contextlib
+import time
+import tracemalloc
+
+PROFILE_VERSION = 1
+
+_ACTIVE = None
+
+
+class _Stage:
+    __slots__ = ("calls", "total", "children", "peak", "items")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.children = 0.0
+        self.peak = 0
+        self.items = {}
+
+
+class BuildProfile:
+    """Etapas anidadas en curso (pila) y acumulados por nombre de etapa."""
+
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self.stages = {}
+        self.order = []
+        self.stack = []
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.peak = 0
+
+    @contextlib.contextmanager
+    def stage(self, name: str, item=None):
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = _Stage()
+            self.order.append(name)
+        top_level = not self.stack
+        if top_level and self.memory:
+            tracemalloc.reset_peak()
+        frame = [0.0]  # time spent in child stages
+        self.stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stack.pop()
+            if self.stack:
+                self.stack[-1][0] += elapsed
+            record.calls += 1
+            record.total += elapsed
+            record.children += frame[0]
+            if item is not None:
+                record.items[item] = record.items.get(item, 0.0) + elapsed
+            if top_level and self.memory:
+                record.peak = max(record.peak, tracemalloc.get_traced_memory()[1])
+
+    def report(self, top: int = 10, extra=None) -> dict:
+        """Informe JSON: etapas en orden de aparicion y los top items mas lentos de cada etapa con items."""
+        stages = []
+        slowest = {}
+        for name in self.order:
+            record = self.stages[name]
+            entry = {
+                "name": name,
+                "calls": record.calls,
+                "total_ms": round(record.total * 1000, 2),
+                "self_ms": round((record.total - record.children) * 1000, 2),
+            }
+            if record.peak:
+                entry["peak_bytes"] = record.peak
+            stages.append(entry)
+            if record.items:
+                ranked = sorted(record.items.items(), key=lambda pair: pair[1], reverse=True)[:top]
+                slowest[name] = [{"item": item, "ms": round(seconds * 1000, 2)} for item, seconds in ranked]
+        report = {
+            "version": PROFILE_VERSION,
+            "total_ms": round((self.elapsed or 0.0) * 1000, 2),
+            "peak_memory_bytes": self.peak if self.memory else None,
+            "stages": stages,
+            "slowest": slowest,
+        }
+        if extra:
+            report.update(extra)
+        return report
+
+
+def stage(name: str, item=None):
+    """Contexto que mide una etapa del perfil activo (nada si no hay perfil)."""
+    if _ACTIVE is None:
+        return contextlib.nullcontext()
+    return _ACTIVE.stage(name, item)
+
+
+def start_profile(memory: bool = True) -> BuildProfile:
+    global _ACTIVE
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _ACTIVE = BuildProfile(memory=memory)
+    return _ACTIVE
+
+
+def stop_profile() -> BuildProfile:
+    """Cierra el perfil activo y lo devuelve (con tiempo total y pico de memoria)."""
+    global _ACTIVE
+    profile, _ACTIVE = _ACTIVE, None
+    profile.elapsed = time.perf_counter() - profile.started
+    if profile.memory:
+        profile.peak = max([tracemalloc.get_traced_memory()[1]] + [record.peak for record in profile.stages.values()])
+        tracemalloc.stop()
+    return profile
+
+
+def format_profile_summary(report: dict) -> list:
+    """Resumen legible del informe de report()."""
+    lines = [f"  Perfil: {report['total_ms']:.0f} ms en total"]
+    if report.get("peak_memory_bytes") is not None:
+        lines[0] += f", pico de memoria {report['peak_memory_bytes'] / (1024 * 1024):.1f} MB (tracemalloc)"
+    width = max([len(entry["name"]) for entry in report["stages"]] + [5])
+    lines.append(f"  {'etapa':<{width}} {'llamadas':>8} {'total ms':>10} {'propio ms':>10} {'pico MB':>8}")
+    for entry in report["stages"]:
+        peak = f"{entry['peak_bytes'] / (1024 * 1024):>8.1f}" if "peak_bytes" in entry else f"{'':>8}"
+        lines.append(
+            f"  {entry['name']:<{width}} {entry['calls']:>8} {entry['total_ms']:>10.1f} {entry['self_ms']:>10.1f} {peak}"
+        )
+    for name, items in report["slowest"].items():
+        lines.append(f"  Mas lentos en {name}:")
+        for entry in items:
+            lines.append(f"    {entry['ms']:>8.1f} ms  {entry['item']}")
+    return lines
@@ -0,0 +1,197 @@
+"""
+Indice de busqueda de texto completo del curso, generado en build.
+Solo stdlib Python 3.
+
+Cada seccion del indice es un tramo de leccion bajo un mismo titulo (su
+anchor es el id del <hN> en el HTML). Los terminos se normalizan como
+normalizeSearchText en la pagina (minusculas y sin acentos), asi que la
+consulta y el indice hablan el mismo idioma. Los identificadores de codigo
+se indexan enteros y tambien partidos por camelCase/snake_case
+("TaskViewModel" -> taskviewmodel, task, view, model).
+
+El indice se parte en un shard por bloque del curso (00-informe, 01-junior,
+...). Cada shard es un JSON con los terminos ordenados (busqueda por prefijo
+con biseccion) y, por termino, una lista plana [gap, peso, gap, peso, ...]
+de secciones codificada por deltas. assets/search-worker.js los carga bajo
+demanda y ordena los resultados fuera del hilo principal.
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from pathlib import Path
+
+SEARCH_INDEX_VERSION = 1
+
+# Peso de cada aparicion segun donde este el termino.
+WEIGHT_TITLE = 8
+WEIGHT_HEADING = 4
+WEIGHT_DIAGRAM = 2
+WEIGHT_TEXT = 1
+WEIGHT_CODE = 1
+
+# Runs of MIN_TERM_LENGTH or more: shorter runs are never indexed. The
+# manifest carries it so the worker drops the same short query words.
+MIN_TERM_LENGTH = 2
+TERM_RE = re.compile(rf"[a-z0-9]{{{MIN_TERM_LENGTH},}}")
+COMBINING_MARK_RE = re.compile("[\u0300-\u036f]")
+IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+IDENTIFIER_PART_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+# Destino de links/imagenes markdown: la URL no es texto de la leccion.
+LINK_TARGET_RE = re.compile(r"\]\([^)]*\)")
+
+# Palabras vacias: aparecen en casi todas las secciones y no discriminan. La
+# lista viaja en el manifest para que el worker descarte las mismas.
+STOPWORDS = frozenset(
+    """
+    al como con de del el en es esta este la las lo los mas no o para pero por que se sin su sus
+    un una uno y ya and the of to in is it or be are for on as by with this that an if br
+    """.split()
+)
+
+
+def normalize_search_text(value: str) -> str:
+    """Igual que normalizeSearchText (JS): minusculas, NFD y sin marcas diacriticas."""
+    value = value.lower()
+    if value.isascii():
+        return value
+    return COMBINING_MARK_RE.sub("", unicodedata.normalize("NFD", value))
+
+
+def text_terms(text: str) -> list:
+    return [term for term in TERM_RE.findall(normalize_search_text(text)) if term not in STOPWORDS]
+
+
+def code_terms(code: str) -> list:
+    """Identificadores del codigo, enteros y (si son compuestos) por partes."""
+    terms = []
+    for identifier in IDENTIFIER_RE.findall(code):
+        terms.append(identifier)
+        parts = IDENTIFIER_PART_RE.findall(identifier)
+        if len(parts) > 1:
+            terms.extend(parts)
+    return text_terms(" ".join(terms))
+
+
+class SearchSection:
+    """Tramo de leccion bajo un titulo, con el peso acumulado de cada termino."""
+
+    __slots__ = ("file_id", "anchor", "heading", "weights")
+
+    def __init__(self, file_id: str, anchor: str, heading: str):
+        self.file_id = file_id
+        self.anchor = anchor
+        self.heading = heading
+        self.weights = {}
+
+    def _add(self, terms, weight: int) -> None:
+        weights = self.weights
+        for term in terms:
+            weights[term] = weights.get(term, 0) + weight
+
+    def add_text(self, text: str, weight: int = WEIGHT_TEXT) -> None:
+        self._add(text_terms(LINK_TARGET_RE.sub("]", text)), weight)
+
+    def add_code(self, code: str, weight: int = WEIGHT_CODE) -> None:
+        self._add(code_terms(code), weight)
+
+    def to_json(self) -> list:
+        return [self.anchor, self.heading, self.weights]
+
+    @classmethod
+    def from_json(cls, file_id: str, data: list) -> "SearchSection":
+        section = cls(file_id, data[0], data[1])
+        section.weights = data[2]
+        return section
+
+
+def encode_shard(key: str, label: str, lessons, sections) -> dict:
+    """Shard JSON de un bloque del curso.
+
+    lessons: [(file_id, titulo, ruta)]; sections: [SearchSection] en orden de
+    lectura. terms va en un solo string separado por espacios y docs guarda
+    solo la parte del anchor que sigue a "file_id-" ("" si el anchor es el
+    propio file_id). En postings, el primer gap de cada termino es el indice
+    de la primera seccion y los siguientes la distancia a la anterior.
+    """
+    lesson_index = {file_id: index for index, (file_id, _title, _path) in enumerate(lessons)}
+    postings = {}
+    for section_index, section in enumerate(sections):
+        for term, weight in section.weights.items():
+            entry = postings.get(term)
+            if entry is None:
+                postings[term] = [section_index, weight, section_index]
+            else:
+                entry[-1:] = [section_index - entry[-1], weight, section_index]
+    terms = sorted(postings)
+    return {
+        "section": key,
+        "label": label,
+        "lessons": [list(lesson) for lesson in lessons],
+        "docs": [
+            [lesson_index[section.file_id], section.anchor[len(section.file_id) + 1 :], section.heading]
+            for section in sections
+        ],
+        "terms": " ".join(terms),
+        # The trailing element of each entry is the last section index, kept only while encoding.
+        "postings": [postings[term][:-1] for term in terms],
+    }
+
+
+def _write_atomic(target: Path, payload: bytes) -> None:
+    """Escribe target via un .tmp y os.replace: un build interrumpido no deja un shard truncado con nombre valido."""
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, target)
+
+
+def write_search_index(shards, output_dir: Path) -> dict:
+    """Escribe los shards y manifest.json en output_dir; devuelve el manifest.
+
+    Los shards llevan el hash de su contenido en el nombre (se pueden cachear
+    sin limite) y solo se reescriben si cambian; los shards viejos (y sus
+    .gz) se borran.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_shards = []
+    live_files = {"manifest.json"}
+    total_docs = 0
+    for shard in shards:
+        payload = json.dumps(shard, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        name = f"{shard['section']}.{hashlib.sha256(payload).hexdigest()[:12]}.json"
+        target = output_dir / name
+        if not target.is_file():
+            _write_atomic(target, payload)
+        live_files.add(name)
+        total_docs += len(shard["docs"])
+        manifest_shards.append(
+            {
+                "section": shard["section"],
+                "label": shard["label"],
+                "file": name,
+                "docs": len(shard["docs"]),
+                "terms": len(shard["postings"]),
+                "bytes": len(payload),
+            }
+        )
+    manifest = {
+        "version": SEARCH_INDEX_VERSION,
+        "docs": total_docs,
+        "stopwords": sorted(STOPWORDS),
+        "minTermLength": MIN_TERM_LENGTH,
+        "shards": manifest_shards,
+    }
+    manifest_payload = json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    manifest_path = output_dir / "manifest.json"
+    if not manifest_path.is_file() or manifest_path.read_bytes() != manifest_payload:
+        _write_atomic(manifest_path, manifest_payload)
+    for entry in output_dir.iterdir():
+        if entry.name.removesuffix(".gz") not in live_files:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+    manifest["digest"] = hashlib.sha256(manifest_payload).hexdigest()[:12]
+    return manifest
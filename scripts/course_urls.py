@@ -0,0 +1,307 @@
+"""
+Comprobacion de URLs externas (http/https) para la regla "external" de course_checks.py.
+Solo stdlib Python 3.
+
+Es opt-in (`check-course.py --external`): sale a la red. Todas las URLs se
+comprueban a la vez con asyncio, con un limite global de peticiones en
+vuelo y un pool de conexiones HTTP/1.1 keep-alive por host (como mucho
+MAX_CONNECTIONS_PER_HOST), asi que decenas de links al mismo dominio
+comparten una o dos conexiones en lugar de abrir una por link.
+
+Cada URL se pide con HEAD; si el servidor no lo admite o responde con error
+se repite con GET (solo se leen las cabeceras). Las redirecciones se siguen
+hasta MAX_REDIRECTS.
+
+Los resultados se guardan en disco (cache_file) con la hora de la
+comprobacion, el estado y el ETag/Last-Modified del servidor. Mientras no
+pase el TTL una URL no se vuelve a pedir; despues se revalida con
+If-None-Match/If-Modified-Since y un 304 la da por buena sin descargar nada.
+Los fallos caducan antes (FAILURE_TTL) para reintentarlos pronto.
+
+No hay proxy ni certificados propios: solo el contexto SSL por defecto.
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import time
+from pathlib import Path
+from urllib.parse import quote, urljoin, urlsplit
+
+# Subir si cambia el formato de las entradas de la cache.
+URL_CACHE_VERSION = 1
+DEFAULT_TTL = 7 * 24 * 3600
+FAILURE_TTL = 24 * 3600
+MAX_CONCURRENCY = 16
+MAX_CONNECTIONS_PER_HOST = 2
+MAX_REDIRECTS = 5
+REQUEST_TIMEOUT = 10
+MAX_HEADER_LINES = 100
+USER_AGENT = "sma-course-link-check/1"
+# HEAD answers that mean "ask again with GET" rather than "broken".
+HEAD_FALLBACK_MIN_STATUS = 400
+# Characters left as-is in the request target; existing %XX escapes are kept.
+REQUEST_TARGET_SAFE = "/%:@!$&'()*+,;=?"
+
+
+class HttpError(Exception):
+    """Respuesta que no es HTTP/1.x valido."""
+
+
+def ascii_host(parts) -> str:
+    """Host de parts en ASCII (IDNA para dominios internacionales), para la conexion y la cabecera Host."""
+    if not parts.hostname:
+        raise HttpError("URL sin host")
+    return parts.hostname.encode("idna").decode("ascii")
+
+
+def request_target(parts) -> str:
+    """Ruta y query de parts con lo que no es ASCII escapado en UTF-8 (%XX), como lo pide un navegador."""
+    path = quote(parts.path or "/", safe=REQUEST_TARGET_SAFE)
+    if parts.query:
+        path += "?" + quote(parts.query, safe=REQUEST_TARGET_SAFE)
+    return path
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "reused")
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class HostPool:
+    """Conexiones keep-alive a un (esquema, host, puerto), con un maximo abiertas a la vez."""
+
+    def __init__(self, scheme: str, host: str, port: int, limit: int, ssl_context, stats: dict):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.idle = []
+        self.slots = asyncio.Semaphore(limit)
+        self.ssl_context = ssl_context if scheme == "https" else None
+        self.stats = stats
+
+    async def acquire(self) -> _Connection:
+        await self.slots.acquire()
+        while self.idle:
+            connection = self.idle.pop()
+            if not connection.reader.at_eof():
+                connection.reused = True
+                return connection
+            connection.close()
+        try:
+            reader, writer = await asyncio.open_connection(
+                self.host,
+                self.port,
+                ssl=self.ssl_context,
+                server_hostname=self.host if self.ssl_context else None,
+            )
+        except BaseException:
+            self.slots.release()
+            raise
+        self.stats["connections"] += 1
+        return _Connection(reader, writer)
+
+    def release(self, connection: _Connection, reusable: bool) -> None:
+        if reusable:
+            self.idle.append(connection)
+        else:
+            connection.close()
+        self.slots.release()
+
+    def close(self) -> None:
+        for connection in self.idle:
+            connection.close()
+        self.idle.clear()
+
+
+class UrlChecker:
+    """Pools por host y limite global de peticiones para una tanda de comprobaciones."""
+
+    def __init__(self, concurrency: int = MAX_CONCURRENCY, per_host: int = MAX_CONNECTIONS_PER_HOST):
+        self.pools = {}
+        self.per_host = per_host
+        self.in_flight = asyncio.Semaphore(concurrency)
+        self.ssl_context = ssl.create_default_context()
+        self.stats = {"connections": 0, "requests": 0}
+
+    def pool_for(self, parts) -> HostPool:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        host = ascii_host(parts)
+        key = (parts.scheme, host, port)
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = HostPool(parts.scheme, host, port, self.per_host, self.ssl_context, self.stats)
+        return pool
+
+    def close(self) -> None:
+        for pool in self.pools.values():
+            pool.close()
+
+    async def request(self, method: str, url: str, headers: dict):
+        """(estado, cabeceras en minusculas) de method url; reintenta una vez si una conexion reutilizada estaba cerrada."""
+        parts = urlsplit(url)
+        pool = self.pool_for(parts)
+        for attempt in range(2):
+            connection = await pool.acquire()
+            try:
+                status, response_headers, reusable = await asyncio.wait_for(
+                    self._exchange(connection, method, parts, headers), REQUEST_TIMEOUT
+                )
+            except (ConnectionError, asyncio.IncompleteReadError, HttpError) as error:
+                pool.release(connection, reusable=False)
+                # A keep-alive connection the server already dropped: retry on a fresh one.
+                if attempt == 0 and connection.reused and not isinstance(error, HttpError):
+                    continue
+                raise
+            except BaseException:
+                pool.release(connection, reusable=False)
+                raise
+            pool.release(connection, reusable)
+            return status, response_headers
+        raise ConnectionError("conexion cerrada")
+
+    async def _exchange(self, connection: _Connection, method: str, parts, headers: dict):
+        host = ascii_host(parts) if parts.port is None else f"{ascii_host(parts)}:{parts.port}"
+        lines = [f"{method} {request_target(parts)} HTTP/1.1", f"Host: {host}", f"User-Agent: {USER_AGENT}", "Accept: */*"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        connection.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await connection.writer.drain()
+        self.stats["requests"] += 1
+
+        status_line = (await connection.reader.readline()).decode("latin-1").strip()
+        protocol, _, rest = status_line.partition(" ")
+        if not protocol.startswith("HTTP/1.") or not rest[:3].isdigit():
+            if not status_line:
+                raise asyncio.IncompleteReadError(b"", None)
+            raise HttpError(f"respuesta no HTTP: {status_line[:60]!r}")
+        status = int(rest[:3])
+        response_headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = (await connection.reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        keep_alive = protocol == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+        # Only bodiless answers leave the connection ready for the next request; GET bodies are never read.
+        bodiless = method == "HEAD" or status in (204, 304) or 100 <= status < 200
+        return status, response_headers, keep_alive and bodiless
+
+    async def check(self, url: str, cached=None) -> dict:
+        """Entrada de cache nueva para url; cached (si la hay) aporta ETag/Last-Modified para revalidar."""
+        conditional = {}
+        if cached and cached.get("ok"):
+            if cached.get("etag"):
+                conditional["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                conditional["If-Modified-Since"] = cached["last_modified"]
+        entry = {"ok": False, "status": None, "error": None, "etag": None, "last_modified": None}
+        current = url
+        async with self.in_flight:
+            try:
+                for _ in range(MAX_REDIRECTS + 1):
+                    status, headers = await self.request("HEAD", current, conditional)
+                    if status >= HEAD_FALLBACK_MIN_STATUS:
+                        status, headers = await self.request("GET", current, conditional)
+                    if 300 <= status < 400 and status != 304 and headers.get("location"):
+                        current = urljoin(current, headers["location"])
+                        # Validators belong to the original resource.
+                        conditional = {}
+                        if urlsplit(current).scheme not in ("http", "https"):
+                            entry["error"] = f"redireccion a {current}"
+                            return entry
+                        continue
+                    entry["status"] = status
+                    if status == 304 and cached:
+                        entry.update(ok=True, etag=cached.get("etag"), last_modified=cached.get("last_modified"))
+                    else:
+                        entry.update(
+                            ok=200 <= status < 300,
+                            etag=headers.get("etag"),
+                            last_modified=headers.get("last-modified"),
+                        )
+                    return entry
+                entry["error"] = f"mas de {MAX_REDIRECTS} redirecciones"
+            except asyncio.TimeoutError:
+                entry["error"] = f"sin respuesta en {REQUEST_TIMEOUT} s"
+            except (OSError, asyncio.IncompleteReadError, HttpError, ssl.SSLError, UnicodeError) as error:
+                entry["error"] = str(error) or type(error).__name__
+        return entry
+
+
+def load_url_cache(cache_file: Path) -> dict:
+    """{url: entrada} de cache_file, o {} si no existe, no se puede leer o es de otra version."""
+    try:
+        data = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != URL_CACHE_VERSION:
+        return {}
+    return data.get("urls", {})
+
+
+def store_url_cache(cache_file: Path, entries: dict) -> None:
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(
+        json.dumps({"version": URL_CACHE_VERSION, "urls": entries}, ensure_ascii=False, indent=1, sort_keys=True),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, cache_file)
+
+
+def is_fresh(entry: dict, ttl: float, now: float) -> bool:
+    return now - entry.get("checked_at", 0) < (ttl if entry.get("ok") else min(ttl, FAILURE_TTL))
+
+
+async def _check_all(urls, cache: dict, checker_options: dict):
+    checker = UrlChecker(**checker_options)
+    try:
+        entries = await asyncio.gather(*(checker.check(url, cache.get(url)) for url in urls))
+    finally:
+        checker.close()
+    return dict(zip(urls, entries)), checker.stats
+
+
+def check_urls(
+    urls,
+    cache_file=None,
+    ttl: float = DEFAULT_TTL,
+    concurrency: int = MAX_CONCURRENCY,
+    per_host: int = MAX_CONNECTIONS_PER_HOST,
+) -> tuple:
+    """Comprueba urls (sin #fragmento) y devuelve ({url: entrada}, estadisticas).
+
+    Con cache_file solo salen a la red las URLs sin entrada o con la entrada
+    caducada; el resto se responde desde la cache. Al final la cache queda
+    con las entradas de urls y nada mas: las URLs que ya no estan en el curso
+    se olvidan.
+    Cada entrada: ok, status, error, etag, last_modified y checked_at.
+    """
+    urls = sorted(set(urls))
+    now = time.time()
+    cache = load_url_cache(cache_file) if cache_file is not None else {}
+    results = {url: cache[url] for url in urls if url in cache and is_fresh(cache[url], ttl, now)}
+    pending = [url for url in urls if url not in results]
+    stats = {"urls": len(urls), "cached": len(results), "revalidated": 0, "connections": 0, "requests": 0}
+    if pending:
+        fresh, checker_stats = asyncio.run(
+            _check_all(pending, cache, {"concurrency": concurrency, "per_host": per_host})
+        )
+        stats.update(checker_stats)
+        for url, entry in fresh.items():
+            entry["checked_at"] = now
+            if entry["status"] == 304:
+                stats["revalidated"] += 1
+            results[url] = entry
+    if cache_file is not None and (pending or cache.keys() != results.keys()):
+        store_url_cache(cache_file, {url: results[url] for url in urls})
+    return results, stats
@@ -1,51 +1,20 @@
 #!/usr/bin/env python3
-from pathlib import Path
-import sys
+"""
+Valida los encabezados obligatorios de los documentos de learning gates.
+Solo stdlib Python 3.
+Exit 0 si todo OK, exit 1 si falla.
 
-ROOT = Path(__file__).resolve().parents[1]
-BASE = ROOT / "00-informe"
+Atajo de `check-course.py --only gates`: la regla vive en course_checks.py.
+"""
 
-REQUIRED = {
-    "MATRIZ-COMPETENCIAS.md": [
-        "# Matriz de competencias",
-        "## Niveles y evidencias",
-        "## Criterio de paso",
-    ],
-    "RUBRICA-GATES-POR-FASE.md": [
-        "# Rubrica de gates por fase",
-        "## Gates por fase",
-        "## Regla de aprobado",
-    ],
-    "SCORECARD-EMPLEABILIDAD.md": [
-        "# Scorecard de empleabilidad",
-        "## Seniority map",
-        "## Criterio de empleabilidad",
-    ],
-}
+import sys
 
-missing_files = []
-missing_headers = []
+from course_checks import check_main
 
-for filename, headers in REQUIRED.items():
-    path = BASE / filename
-    if not path.exists():
-        missing_files.append(str(path))
-        continue
 
-    text = path.read_text(encoding="utf-8")
-    for header in headers:
-        if header not in text:
-            missing_headers.append(f"{filename}: falta '{header}'")
+def main():
+    sys.exit(check_main(["gates"]))
 
-if missing_files or missing_headers:
-    if missing_files:
-        print("[ERROR] Archivos faltantes:")
-        for item in missing_files:
-            print(f"  - {item}")
-    if missing_headers:
-        print("[ERROR] Encabezados faltantes:")
-        for item in missing_headers:
-            print(f"  - {item}")
-    sys.exit(1)
 
-print("[OK] Learning gates baseline validado")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Utilidades comunes de los tests: scripts/ en sys.path y build-html.py cargado como modulo.
+Solo stdlib Python 3 (unittest).
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = ROOT / "scripts"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+_BUILD_MODULE = None
+
+
+def load_build():
+    """build-html.py como modulo (el guion del nombre impide importarlo), cargado una vez."""
+    global _BUILD_MODULE
+    if _BUILD_MODULE is None:
+        spec = importlib.util.spec_from_file_location("build_html", SCRIPTS_DIR / "build-html.py")
+        module = importlib.util.module_from_spec(spec)
+        # Registered like an import so pickle finds its functions (render pool).
+        sys.modules["build_html"] = module
+        spec.loader.exec_module(module)
+        _BUILD_MODULE = module
+    return _BUILD_MODULE
@@ -0,0 +1,184 @@
+"""build-html.py frente al renderer original y piezas del build que no escriben en dist/."""
+
+import contextlib
+import html
+import io
+import os
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import support
+
+FIXTURE_PATH = "tests/fixtures/leccion-base.md"
+FIXTURE_ID = "tests-fixtures-leccion-base"
+CODE_BLOCK_RE = re.compile(r"<pre><code[^>]*>(.*?)</code></pre>", re.DOTALL)
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def non_blank_lines(text: str) -> list:
+    return [line for line in text.split("\n") if line.strip()]
+
+
+class BaselineEquivalenceTests(unittest.TestCase):
+    """fixtures/leccion-base.html es la salida de md_to_html del build-html.py original.
+
+    La serie de optimizaciones promete la misma salida salvo lo que cambia a
+    proposito: el resaltado en build, los flowcharts prerenderizados como SVG
+    y las lineas en blanco dentro de las listas de flechas.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.build = support.load_build()
+        cls.source = (support.FIXTURES_DIR / "leccion-base.md").read_text(encoding="utf-8")
+        cls.expected = (support.FIXTURES_DIR / "leccion-base.html").read_text(encoding="utf-8")
+
+    def render(self):
+        return self.build.md_to_html(self.source, FIXTURE_ID, FIXTURE_PATH)
+
+    def test_same_html_without_build_time_extras(self):
+        hooks = {key: value for key, value in self.build.RENDER_HOOKS.items() if key != ("code", None)}
+        with mock.patch.dict(self.build.RENDER_HOOKS, hooks, clear=True), mock.patch.object(
+            self.build, "is_static_flowchart", lambda diagram: False
+        ):
+            rendered = self.render()
+        self.assertEqual(non_blank_lines(rendered), non_blank_lines(self.expected))
+
+    def test_highlighted_code_keeps_its_text(self):
+        rendered = self.render()
+        self.assertIn("data-sma-prehighlighted", rendered)
+        expected_blocks = CODE_BLOCK_RE.findall(self.expected)
+        rendered_blocks = CODE_BLOCK_RE.findall(rendered)
+        self.assertEqual(len(rendered_blocks), len(expected_blocks))
+        for expected, actual in zip(expected_blocks, rendered_blocks):
+            self.assertEqual(html.unescape(TAG_RE.sub("", actual)), html.unescape(expected))
+
+    def test_render_lesson_matches_md_to_html(self):
+        document = self.build.parse_markdown(self.source, FIXTURE_PATH, FIXTURE_ID)
+        self.assertEqual(self.build._render_lesson(document), self.render())
+
+
+class RenderPoolTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.build = support.load_build()
+        rel_paths = [path for path in cls.build.FILE_ORDER if (cls.build.COURSE_ROOT / path).is_file()]
+        cls.documents = [
+            cls.build.parse_markdown((cls.build.COURSE_ROOT / path).read_text(encoding="utf-8"), path)
+            for path in rel_paths[: cls.build.PARALLEL_MIN_LESSONS + 4]
+        ]
+
+    def rendered(self, jobs):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            lessons = list(self.build.iter_rendered_lessons(self.documents, jobs=jobs, use_cache=False))
+        return lessons, output.getvalue()
+
+    def test_pool_and_sequential_render_agree(self):
+        sequential, _log = self.rendered(1)
+        pooled, log = self.rendered(2)
+        self.assertIn("2 procesos", log)
+        self.assertEqual([path for path, _html in pooled], [document.path for document in self.documents])
+        self.assertEqual(pooled, sequential)
+
+    def test_unreadable_cache_entry_counts_as_rendered(self):
+        documents = self.documents[:2]
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.object(
+            self.build, "RENDER_CACHE_DIR", Path(tmp_dir)
+        ), mock.patch.object(self.build, "evict_highlight_cache", return_value=0), mock.patch.dict(
+            self.build.RENDER_MEMO, clear=True
+        ):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                first = list(self.build.iter_rendered_lessons(documents))
+            self.assertIn("0 reutilizadas, 2 renderizadas", output.getvalue())
+            self.build.RENDER_MEMO.clear()
+            corrupted = sorted(Path(tmp_dir).glob("*.html"))[0]
+            corrupted.write_bytes(b"\xff\xfe")
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                second = list(self.build.iter_rendered_lessons(documents))
+        self.assertIn("1 reutilizadas, 1 renderizadas", output.getvalue())
+        self.assertEqual(second, first)
+
+
+class DocumentPartsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.build = support.load_build()
+
+    def page(self, lesson_html):
+        return "".join(self.build.iter_document_parts([("a/b.md", lesson_html)], "<nav></nav>", {}))
+
+    def test_highlight_loader_only_for_unhighlighted_blocks(self):
+        highlighted = '<pre><code class="language-kotlin hljs" data-highlighted="1">x</code></pre>'
+        self.assertNotIn("__SMA_HLJS_CORE_SRC", self.page(highlighted))
+        page = self.page('<pre><code class="language-zig">x</code></pre>')
+        self.assertIn("__SMA_HLJS_CORE_SRC", page)
+        self.assertLess(page.index("__SMA_HLJS_CORE_SRC"), page.index("course-core.js"))
+
+    def test_lesson_section(self):
+        page = self.page("<p>hola</p>\n")
+        self.assertIn('<section id="a-b" class="lesson" data-topic-id="a-b" data-lesson-path="a/b.md">', page)
+        self.assertNotIn("{highlight_loader}", page)
+
+
+class BuildKeyTests(unittest.TestCase):
+    def test_key_depends_on_every_option(self):
+        build = support.load_build()
+        keys = {
+            build.build_inputs_key([], {}),
+            build.build_inputs_key([], {}, split=True),
+            build.build_inputs_key([], {}, optimize=True),
+            build.build_inputs_key([], {}, asset_sync="hardlink"),
+            build.build_inputs_key([], {"a.css": b"x"}),
+        }
+        self.assertEqual(len(keys), 5)
+        self.assertEqual(build.build_inputs_key([], {}), build.build_inputs_key([], {}, asset_sync="copy"))
+
+
+class BuildCurrentTests(unittest.TestCase):
+    def setUp(self):
+        self.build = support.load_build()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        output_dir = Path(tmp_dir.name)
+        for name, value in (
+            ("OUTPUT_DIR", output_dir),
+            ("CACHE_DIR", output_dir / ".cache"),
+            ("ASSET_MANIFEST_FILE", output_dir / "asset-manifest.json"),
+            ("OUTPUT_STAT_FILE", output_dir / ".cache" / "output-mtimes.json"),
+        ):
+            patcher = mock.patch.object(self.build, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.page = output_dir / "index.html"
+        self.page.write_text("<p>hola</p>", encoding="utf-8")
+        self.build.write_asset_manifest("clave", {})
+
+    def bump_mtime(self):
+        stat = self.page.stat()
+        os.utime(self.page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_untouched_output_is_current(self):
+        self.assertTrue(self.build.is_build_current("clave"))
+        self.assertFalse(self.build.is_build_current("otra"))
+
+    def test_same_size_edit_is_detected(self):
+        self.page.write_text("<p>HOLA</p>", encoding="utf-8")
+        self.bump_mtime()
+        self.assertFalse(self.build.is_build_current("clave"))
+
+    def test_rewrite_with_same_bytes_is_rehashed_once(self):
+        self.page.write_text("<p>hola</p>", encoding="utf-8")
+        self.bump_mtime()
+        self.assertTrue(self.build.is_build_current("clave"))
+        mtimes = self.build.load_output_mtimes()
+        self.assertEqual(mtimes["index.html"], self.page.stat().st_mtime_ns)
+
+
+if __name__ == "__main__":
+    unittest.main()
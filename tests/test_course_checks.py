@@ -0,0 +1,174 @@
+"""Reglas de course_checks sobre el curso real y sobre corpus sinteticos en un directorio temporal."""
+
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import support
+
+import course_checks
+from course_checks import CourseCorpus, fragment_exists, run_checks
+
+# Links that point to the sibling course repos (iOS, SDD...), absent from a standalone checkout.
+SIBLING_REPO_RE = re.compile(r"^(?:\.\./)+stack-my-architecture-")
+LEGACY_IGNORED_PREFIXES = ("http://", "https://", "mailto:", "#", "tel:")
+LEGACY_LINK_RE = re.compile(r"!?\[([^\]\n]*)\]\(([^)]+)\)")
+FENCE_RE = re.compile(r"^```[^\n]*\n[\s\S]*?(?:^```[^\n]*$|\Z)", re.MULTILINE)
+
+
+def legacy_broken_links(root: Path, rel_path: str) -> set:
+    """Links rotos segun el check-links.py original: regex sobre el texto, sin anclas.
+
+    Dos diferencias asumidas: los bloques de codigo se saltan y la etiqueta no
+    cruza lineas (ni el renderer ni la regla nueva los tratan como links).
+    """
+    path = root / rel_path
+    content = path.read_text(encoding="utf-8", errors="replace")
+    content = FENCE_RE.sub(lambda match: "\n" * match.group().count("\n"), content)
+    broken = set()
+    for match in LEGACY_LINK_RE.finditer(content):
+        target = match.group(2)
+        if target.startswith(LEGACY_IGNORED_PREFIXES):
+            continue
+        target_clean = target if match.group().startswith("!") else target.split("#")[0]
+        if target_clean and not (path.parent / target_clean).resolve().exists():
+            broken.add((rel_path, content.count("\n", 0, match.start()) + 1, target))
+    return broken
+
+
+def write_tree(root: Path, files: dict) -> None:
+    for rel_path, text in files.items():
+        target = root / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+
+
+class RealCourseTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus = CourseCorpus(use_cache=False)
+        cls.results = {result.name: result for result in run_checks(corpus=cls.corpus)}
+
+    def test_only_sibling_repo_links_fail(self):
+        for name, result in self.results.items():
+            if name != "links":
+                self.assertTrue(result.ok, [issue.format() for issue in result.issues])
+        for issue in self.results["links"].issues:
+            self.assertEqual(issue.kind, "LINK", issue.format())
+            self.assertRegex(issue.message, SIBLING_REPO_RE)
+            self.assertIsNotNone(issue.column)
+
+    def test_links_agree_with_the_original_checker(self):
+        legacy = set()
+        for rel_path in self.corpus.paths:
+            legacy |= legacy_broken_links(self.corpus.root, rel_path)
+        found = {(issue.path, issue.line, issue.message) for issue in self.results["links"].issues}
+        self.assertEqual(found, legacy)
+
+    def test_cached_run_matches(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.object(
+            course_checks, "LINK_CACHE_FILE", Path(tmp_dir) / "links.json"
+        ):
+            runs = [run_checks(["links"], CourseCorpus(jobs=4))[0] for _ in range(2)]
+        expected = [issue.format() for issue in self.results["links"].issues]
+        for result in runs:
+            self.assertEqual([issue.format() for issue in result.issues], expected)
+        # Only files with links outside the repo (the sibling repos) are rechecked every time.
+        rechecked = int(re.search(r"\((\d+) comprobados", runs[1].notes[0]).group(1))
+        self.assertEqual(rechecked, len({issue.path for issue in self.results["links"].issues}))
+
+
+class SyntheticLinkTests(unittest.TestCase):
+    def check(self, files: dict) -> list:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_tree(Path(tmp_dir), files)
+            result = run_checks(["links"], CourseCorpus(Path(tmp_dir), use_cache=False))[0]
+        return [(issue.path, issue.line, issue.column, issue.kind, issue.message) for issue in result.issues]
+
+    def test_links_images_and_anchors(self):
+        issues = self.check(
+            {
+                "a/leccion.md": (
+                    "# Leccion\n\n## Mi Titulo\n\n"
+                    "[ok](../b/otra.md) [roto](../b/falta.md) ![img](img/no.png)\n"
+                    "[ancla](../b/otra.md#b-otra-otro-titulo) [slug](../b/otra.md#otro-titulo)\n"
+                    "[vacio](../b/otra.md#) [](../b/nada.md) [web](https://x.invalid/nope)\n"
+                ),
+                "b/otra.md": "# Otra\n\n## Otro titulo\n",
+            }
+        )
+        self.assertEqual(
+            issues,
+            [
+                ("a/leccion.md", 5, 27, "LINK", "../b/falta.md"),
+                ("a/leccion.md", 5, 49, "IMAGE", "img/no.png"),
+                ("a/leccion.md", 6, 49, "ANCHOR", "../b/otra.md#otro-titulo"),
+                ("a/leccion.md", 7, 27, "LINK", "../b/nada.md"),
+            ],
+        )
+
+    def test_page_fragments_need_a_published_lesson(self):
+        # Outside FILE_ORDER nothing is on the built page, not even the file's own headings.
+        issues = self.check({"doc.md": "# Doc\n\n## Parte\n\n[aqui](#doc-parte)\n"})
+        self.assertEqual(issues, [("doc.md", 5, 8, "ANCHOR", "#doc-parte")])
+
+    def test_fragment_exists_is_exact(self):
+        anchors = frozenset(("01-junior-05-room", "01-junior-05-room-dao"))
+        self.assertTrue(fragment_exists("01-junior-05-room-dao", anchors))
+        self.assertFalse(fragment_exists("dao", anchors))
+
+
+class PublishedAnchorTests(unittest.TestCase):
+    def test_page_ids_come_from_file_order(self):
+        corpus = CourseCorpus(use_cache=False)
+        published = set()
+        for rel_path in course_checks.FILE_ORDER:
+            published |= corpus.anchors(rel_path)
+        self.assertEqual(corpus.all_anchors(), published)
+        self.assertIn("01-junior-05-room-offline-first", corpus.all_anchors())
+        self.assertFalse(corpus.anchors("README.md") & corpus.all_anchors())
+
+
+class GatesTests(unittest.TestCase):
+    def check(self, overrides: dict) -> list:
+        files = {}
+        for rel_path, headers in course_checks.LEARNING_GATES.items():
+            files[rel_path] = "\n\n".join(headers) + "\n"
+        files.update(overrides)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_tree(Path(tmp_dir), {path: text for path, text in files.items() if text is not None})
+            result = run_checks(["gates"], CourseCorpus(Path(tmp_dir), use_cache=False))[0]
+        return [(issue.path, issue.kind, issue.message) for issue in result.issues]
+
+    def test_header_text_anywhere_passes(self):
+        # Same rule as the original validate-learning-gates.py: a substring, at any heading level.
+        self.assertEqual(
+            self.check(
+                {
+                    "00-informe/MATRIZ-COMPETENCIAS.md": (
+                        "# Matriz de competencias\n\n### Niveles y evidencias\n\nVer ## Criterio de paso.\n"
+                    )
+                }
+            ),
+            [],
+        )
+
+    def test_missing_header_and_file(self):
+        self.assertEqual(
+            self.check(
+                {
+                    "00-informe/MATRIZ-COMPETENCIAS.md": "# Matriz de competencias\n\n## Niveles y evidencias\n",
+                    "00-informe/SCORECARD-EMPLEABILIDAD.md": None,
+                }
+            ),
+            [
+                ("00-informe/MATRIZ-COMPETENCIAS.md", "HEADING", "falta '## Criterio de paso'"),
+                ("00-informe/SCORECARD-EMPLEABILIDAD.md", "MISSING FILE", "documento de learning gates"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
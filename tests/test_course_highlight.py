@@ -0,0 +1,61 @@
+"""Gramaticas de course_highlight: el resaltado solo anade <span>, nunca cambia el codigo."""
+
+import html
+import re
+import unittest
+
+import support
+
+import course_markdown
+from course_checks import discover_tree
+from course_highlight import LANGUAGES, highlight_code
+
+TAG_RE = re.compile(r"<[^>]+>")
+SPAN_RE = re.compile(r'<span class="(hljs-[\w -]+)">')
+
+
+def visible_text(highlighted: str) -> str:
+    return html.unescape(TAG_RE.sub("", highlighted))
+
+
+class HighlightTests(unittest.TestCase):
+    def test_unknown_language(self):
+        self.assertIsNone(highlight_code("x", "zig"))
+        self.assertIsNone(highlight_code("x", ""))
+
+    def test_aliases_share_a_grammar(self):
+        self.assertEqual(highlight_code("val x = 1", "KT")[0], "kotlin")
+        self.assertEqual(highlight_code("echo hi", "zsh")[0], "bash")
+        self.assertEqual(highlight_code("a: 1", "yml")[0], "yaml")
+
+    def test_kotlin_scopes(self):
+        _canonical, highlighted = highlight_code('fun greet(name: String) = "Hola $name" // saludo', "kotlin")
+        scopes = SPAN_RE.findall(highlighted)
+        for scope in ("hljs-keyword", "hljs-string", "hljs-comment", "hljs-subst"):
+            self.assertIn(scope, scopes)
+
+    def test_markup_is_escaped(self):
+        _canonical, highlighted = highlight_code('<a href="x">&amp;</a>', "xml")
+        self.assertNotIn('<a href="x">', highlighted)
+        self.assertEqual(visible_text(highlighted), '<a href="x">&amp;</a>')
+
+    def test_unterminated_tokens_keep_text(self):
+        for lang, code in (("kotlin", 'val s = "sin cerrar\n/* tampoco'), ("json", '{"a": "b'), ("bash", "echo 'x")):
+            self.assertEqual(visible_text(highlight_code(code, lang)[1]), code)
+
+    def test_every_course_block_round_trips(self):
+        paths, _entries = discover_tree(support.ROOT)
+        checked = 0
+        for rel_path in paths:
+            document = course_markdown.load_document(support.ROOT, rel_path)
+            for node in course_markdown.iter_nodes(document, course_markdown.CodeBlock):
+                if node.lang.lower() not in LANGUAGES:
+                    continue
+                with self.subTest(path=rel_path, line=node.line):
+                    self.assertEqual(visible_text(highlight_code(node.code, node.lang)[1]), node.code)
+                checked += 1
+        self.assertGreater(checked, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
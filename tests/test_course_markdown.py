@@ -0,0 +1,177 @@
+"""Lexer, arbol, formato inline, LineIndex y posiciones de links de course_markdown."""
+
+import unittest
+
+import support  # noqa: F401  (scripts/ en sys.path)
+
+import course_markdown
+from course_markdown import (
+    INLINE_IMAGE,
+    INLINE_LINK,
+    CodeBlock,
+    Heading,
+    LineIndex,
+    ListBlock,
+    MermaidBlock,
+    Paragraph,
+    Rule,
+    Table,
+    heading_anchor,
+    inline_format,
+    iter_link_positions,
+    parse_markdown,
+    tokenize_blocks,
+)
+
+SAMPLE = """# Titulo
+
+Parrafo uno
+sigue aqui.
+
+- item a
+- item b
+1. paso uno
+
+| A | B |
+| --- | --- |
+| 1 | 2 |
+
+```kotlin
+val x = 1
+```
+
+```mermaid
+flowchart LR
+    A --> B
+```
+
+---
+Siguiente: otra leccion
+"""
+
+
+class BlockTests(unittest.TestCase):
+    def test_tokens_carry_start_lines(self):
+        kinds = [(token[0], token[1]) for token in tokenize_blocks(SAMPLE)]
+        self.assertEqual(
+            kinds,
+            [
+                ("heading", 1),
+                ("paragraph", 3),
+                ("paragraph", 4),
+                ("bullet", 6),
+                ("bullet", 7),
+                ("ordered", 8),
+                ("table", 10),
+                ("code", 14),
+                ("code", 18),
+                ("hr", 23),
+                ("next_hint", 24),
+            ],
+        )
+
+    def test_tree(self):
+        document = parse_markdown(SAMPLE, "01-junior/00-x.md")
+        self.assertEqual(document.file_id, "01-junior-00-x")
+        self.assertEqual(document.title, "Titulo")
+        types = [type(node) for node in document.children]
+        self.assertEqual(
+            types, [Heading, Paragraph, Paragraph, ListBlock, ListBlock, Table, CodeBlock, MermaidBlock, Rule]
+        )
+        # Each source line is its own paragraph, as in the original renderer.
+        self.assertEqual(document.children[2].text, "sigue aqui.")
+        bullets, ordered = document.children[3], document.children[4]
+        self.assertFalse(bullets.ordered)
+        self.assertEqual([item.text for item in bullets.items], ["item a", "item b"])
+        self.assertTrue(ordered.ordered)
+        table = document.children[5]
+        self.assertEqual((table.header, table.rows), (["A", "B"], [["1", "2"]]))
+        self.assertEqual(document.children[6].code, "val x = 1")
+        self.assertEqual(document.children[7].lang, "mermaid")
+
+    def test_unclosed_fence_runs_to_the_end(self):
+        document = parse_markdown("```bash\necho hola\n")
+        self.assertEqual([(node.lang, node.code) for node in document.children], [("bash", "echo hola\n")])
+
+
+class InlineTests(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(inline_format("sin formato"), "sin formato")
+        self.assertEqual(
+            inline_format("**a** *b* ***c*** `d`"),
+            "<strong>a</strong> <em>b</em> <strong><em>c</em></strong> <code>d</code>",
+        )
+
+    def test_code_span_is_not_reformatted(self):
+        self.assertEqual(inline_format("`*x* [y](z)`"), "<code>*x* [y](z)</code>")
+
+    def test_image_before_link(self):
+        self.assertEqual(
+            inline_format("![alt](img.png)"),
+            '<img alt="alt" src="img.png" loading="lazy" decoding="async">',
+        )
+        self.assertEqual(inline_format("[**x**](a.md)"), '<a href="a.md"><strong>x</strong></a>')
+
+    def test_heading_anchor(self):
+        self.assertEqual(heading_anchor("f", "Hola, Mundo!"), "f-hola-mundo-")
+        # The slug comes from the formatted title, tags included, like the ids build-html.py emits.
+        self.assertEqual(heading_anchor("f", "1) Qué es <code>Room</code>?"), "f-1-qu-es-code-room-code-")
+
+
+class LineIndexTests(unittest.TestCase):
+    def test_locate_matches_counting_newlines(self):
+        text = "ab\n\ncd\nlast"
+        index = LineIndex(text)
+        for offset in range(len(text)):
+            line = text.count("\n", 0, offset) + 1
+            column = offset - (text.rfind("\n", 0, offset) + 1) + 1
+            self.assertEqual(index.locate(offset), (line, column), offset)
+
+    def test_line_start_is_clamped(self):
+        index = LineIndex("a\nb\n")
+        self.assertEqual([index.line_start(line) for line in (0, 1, 2, 3, 99)], [0, 0, 2, 4, 4])
+
+
+class LinkPositionTests(unittest.TestCase):
+    def positions(self, text):
+        document = parse_markdown(text, "x.md")
+        return list(iter_link_positions(document, LineIndex(text)))
+
+    def test_positions_and_kinds(self):
+        text = "# T\n\nUno [a](a.md) y\notro [b](b.md#frag) con ![i](img/i.png).\n\n- [c](c.md)\n"
+        self.assertEqual(
+            self.positions(text),
+            [
+                (3, 9, INLINE_LINK, "a.md", "a"),
+                (4, 10, INLINE_LINK, "b.md#frag", "b"),
+                (4, 30, INLINE_IMAGE, "img/i.png", "i"),
+                (6, 7, INLINE_LINK, "c.md", "c"),
+            ],
+        )
+
+    def test_empty_label_links_are_reported(self):
+        self.assertEqual(self.positions("ver [](falta.md)\n"), [(1, 8, INLINE_LINK, "falta.md", "")])
+        # The renderer still leaves them as text, as before.
+        self.assertEqual(inline_format("ver [](falta.md)"), "ver [](falta.md)")
+
+    def test_code_blocks_are_skipped(self):
+        self.assertEqual(self.positions("```\n[a](a.md)\n```\n"), [])
+
+    def test_table_cells_use_their_row_line(self):
+        text = "| A | B |\n| --- | --- |\n| [x](x.md) | 2 |\n"
+        self.assertEqual(self.positions(text), [(3, 7, INLINE_LINK, "x.md", "x")])
+
+
+class LoadDocumentTests(unittest.TestCase):
+    def test_document_and_index_are_memoized(self):
+        root = support.ROOT
+        first = course_markdown.load_document(root, "README.md")
+        self.assertIs(course_markdown.load_document(root, "README.md"), first)
+        index = course_markdown.load_line_index(root, "README.md")
+        self.assertIs(course_markdown.load_line_index(root, "README.md"), index)
+        self.assertEqual(index.text, (root / "README.md").read_text(encoding="utf-8"))
+        self.assertIsNone(course_markdown.load_document(root, "no-existe.md"))
+
+
+if __name__ == "__main__":
+    unittest.main()
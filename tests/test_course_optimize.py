@@ -0,0 +1,120 @@
+"""Minificadores de course_optimize: ida y vuelta sobre los assets reales y casos limite."""
+
+import gzip
+import re
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+import support
+
+from course_optimize import CSS_TOKEN_RE, gzip_bytes, minify_css, minify_html, minify_js
+
+ASSETS_DIR = support.ROOT / "assets"
+PRE_RE = re.compile(r"<pre\b[\s\S]*?</pre>", re.IGNORECASE)
+TAG_RE = re.compile(r"<(?!!--)[^>]+>")
+COMMENT_RE = re.compile(r"<!--[\s\S]*?-->")
+
+
+def assets(suffix: str) -> list:
+    return sorted(ASSETS_DIR.glob(f"*{suffix}"))
+
+
+def css_tokens(css: str) -> list:
+    """Tokens con significado: sin comentarios, espacios ni el ';' antes de '}'."""
+    tokens = [match.group() for match in CSS_TOKEN_RE.finditer(css) if match.lastgroup not in ("comment", "space")]
+    return [token for index, token in enumerate(tokens) if not (token == ";" and tokens[index + 1 : index + 2] == ["}"])]
+
+
+class CssTests(unittest.TestCase):
+    def test_assets_round_trip(self):
+        for path in assets(".css"):
+            with self.subTest(asset=path.name):
+                source = path.read_text(encoding="utf-8")
+                minified = minify_css(source)
+                self.assertLess(len(minified), len(source))
+                self.assertEqual(css_tokens(minified), css_tokens(source))
+                self.assertEqual(minify_css(minified), minified)
+
+    def test_significant_spaces(self):
+        # A space before ":" may be a descendant selector, so it is kept.
+        self.assertEqual(minify_css("a :hover { color: red ; }"), "a :hover{color:red}")
+        self.assertEqual(minify_css("a/**/b{x:'a  /* b */'}"), "a b{x:'a  /* b */'}")
+        self.assertEqual(minify_css("@media (max-width: 1px) and (x) { a { b: c } }"), "@media (max-width:1px) and (x){a{b:c}}")
+
+
+class JsTests(unittest.TestCase):
+    def test_assets_are_idempotent(self):
+        for path in assets(".js"):
+            with self.subTest(asset=path.name):
+                minified = minify_js(path.read_text(encoding="utf-8"))
+                self.assertEqual(minify_js(minified), minified)
+
+    @unittest.skipUnless(shutil.which("node"), "sin node para comprobar la sintaxis")
+    def test_assets_still_parse(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for path in assets(".js"):
+                with self.subTest(asset=path.name):
+                    target = Path(tmp_dir) / path.name
+                    target.write_text(minify_js(path.read_text(encoding="utf-8")), encoding="utf-8")
+                    checked = subprocess.run(["node", "--check", str(target)], capture_output=True, text=True)
+                    self.assertEqual(checked.returncode, 0, checked.stderr)
+
+    def test_edge_cases(self):
+        cases = {
+            "a = b\n(c)": "a=b\n(c)",
+            "x = a - -b; y = a + ++b": "x=a- -b;y=a+ ++b",
+            "return /a\\/b [/]/g.test(s) // fin": "return/a\\/b [/]/g.test(s)",
+            "const t = `a  ${ { b: 1 }.b }  // no es comentario`;": "const t=`a  ${{b:1}.b}  // no es comentario`;",
+            "s = 'x // y' /* c */ + \"z\"": "s='x // y'+\"z\"",
+            "n = 1 .toString(); m = a / b / c": "n=1 .toString();m=a/b/c",
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                self.assertEqual(minify_js(source), expected)
+
+    @unittest.skipUnless(shutil.which("node"), "sin node para ejecutar JS")
+    def test_edge_cases_evaluate_the_same(self):
+        program = (
+            "let a = 5, b = 2\n"
+            "const f = () => { return /\\/+/g.test('//') }\n"
+            "let r = [a - -b, a + ++b, `${a}  ${ {k: b}.k }`, 'x // y', f(), a / b / 1]\n"
+            "console.log(JSON.stringify(r))"
+        )
+        outputs = [
+            subprocess.run(["node", "-e", code], capture_output=True, text=True, check=True).stdout
+            for code in (program, minify_js(program))
+        ]
+        self.assertEqual(outputs[0], outputs[1])
+
+
+class HtmlTests(unittest.TestCase):
+    def test_rendered_lesson_round_trip(self):
+        build = support.load_build()
+        source = (support.FIXTURES_DIR / "leccion-base.md").read_text(encoding="utf-8")
+        page = build.md_to_html(source, "tests-fixtures-leccion-base", "tests/fixtures/leccion-base.md")
+        minified = minify_html(page)
+        self.assertEqual(PRE_RE.findall(minified), PRE_RE.findall(page))
+        self.assertEqual(TAG_RE.findall(minified), TAG_RE.findall(page))
+        self.assertEqual(TAG_RE.sub("", minified).split(), TAG_RE.sub("", COMMENT_RE.sub("", page)).split())
+        self.assertEqual(minify_html(minified), minified)
+
+    def test_inline_scripts_and_comments(self):
+        self.assertEqual(
+            minify_html("<p>a  <!-- fuera -->\n\n b</p><script>\n  var x = 1 // c\n</script>"),
+            "<p>a \nb</p><script>var x=1</script>",
+        )
+        self.assertEqual(minify_html('<script type="application/json">{ "a" : 1 }</script>'), '<script type="application/json">{ "a" : 1 }</script>')
+
+
+class GzipTests(unittest.TestCase):
+    def test_deterministic_and_lossless(self):
+        payload = (ASSETS_DIR / "course-core.css").read_bytes()
+        self.assertEqual(gzip_bytes(payload), gzip_bytes(payload))
+        self.assertEqual(gzip.decompress(gzip_bytes(payload)), payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
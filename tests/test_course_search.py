@@ -0,0 +1,86 @@
+"""Terminos, codificacion de shards y escritura del indice de course_search."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import support  # noqa: F401  (scripts/ en sys.path)
+
+from course_search import (
+    MIN_TERM_LENGTH,
+    SearchSection,
+    code_terms,
+    encode_shard,
+    normalize_search_text,
+    text_terms,
+    write_search_index,
+)
+
+
+def decode_postings(shard: dict) -> dict:
+    """{termino: [(seccion, peso)]} deshaciendo los deltas, como search-worker.js."""
+    decoded = {}
+    for term, flat in zip(shard["terms"].split(" "), shard["postings"]):
+        section = 0
+        entries = []
+        for index in range(0, len(flat), 2):
+            section += flat[index]
+            entries.append((section, flat[index + 1]))
+        decoded[term] = entries
+    return decoded
+
+
+class TermTests(unittest.TestCase):
+    def test_normalization_matches_the_page(self):
+        self.assertEqual(normalize_search_text("Navegación ÁRBOL"), "navegacion arbol")
+
+    def test_stopwords_and_short_runs_are_dropped(self):
+        self.assertEqual(text_terms("El uso de Room y a x"), ["uso", "room"])
+        self.assertTrue(all(len(term) >= MIN_TERM_LENGTH for term in text_terms("a bb ccc 1 22")))
+
+    def test_identifiers_are_split(self):
+        self.assertEqual(code_terms("TaskViewModel"), ["taskviewmodel", "task", "view", "model"])
+        self.assertEqual(code_terms("HTTPClient x"), ["httpclient", "http", "client"])
+
+
+class ShardTests(unittest.TestCase):
+    def sections(self):
+        sections = []
+        for index, text in enumerate(("room room dao", "dao", "otra cosa", "room")):
+            section = SearchSection("01-junior-05-room", f"01-junior-05-room-s{index}", f"S{index}")
+            section.add_text(text)
+            sections.append(section)
+        return sections
+
+    def test_postings_round_trip(self):
+        sections = self.sections()
+        shard = encode_shard("01-junior", "Junior", [("01-junior-05-room", "Room", "01-junior/05-room.md")], sections)
+        self.assertEqual(shard["terms"].split(" "), sorted(shard["terms"].split(" ")))
+        self.assertEqual([doc[1] for doc in shard["docs"]], ["s0", "s1", "s2", "s3"])
+        expected = {}
+        for index, section in enumerate(sections):
+            for term, weight in section.weights.items():
+                expected.setdefault(term, []).append((index, weight))
+        self.assertEqual(decode_postings(shard), expected)
+        self.assertEqual(decode_postings(shard)["room"], [(0, 2), (3, 1)])
+
+    def test_write_is_content_addressed_and_pruned(self):
+        shard = encode_shard("01-junior", "Junior", [("01-junior-05-room", "Room", "x.md")], self.sections())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir)
+            (output / "stale.0123456789ab.json").write_text("{}", encoding="utf-8")
+            (output / ".01-junior.x.json.1.tmp").write_text("{", encoding="utf-8")
+            manifest = write_search_index([shard], output)
+            name = manifest["shards"][0]["file"]
+            self.assertEqual(sorted(path.name for path in output.iterdir()), sorted([name, "manifest.json"]))
+            on_disk = json.loads((output / "manifest.json").read_text(encoding="utf-8"))
+            self.assertEqual(on_disk["minTermLength"], MIN_TERM_LENGTH)
+            self.assertEqual(json.loads((output / name).read_text(encoding="utf-8")), shard)
+            mtime = (output / name).stat().st_mtime_ns
+            self.assertEqual(write_search_index([shard], output)["digest"], manifest["digest"])
+            self.assertEqual((output / name).stat().st_mtime_ns, mtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
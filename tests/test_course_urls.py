@@ -0,0 +1,165 @@
+"""course_urls contra servidores HTTP locales: nada sale a la red."""
+
+import json
+import socket
+import socketserver
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import support  # noqa: F401  (scripts/ en sys.path)
+
+import course_urls
+from course_urls import HttpError, ascii_host, check_urls, request_target
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Sitio de prueba: cada ruta ejercita un caso del comprobador."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    seen_paths = []
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        body = b"cuerpo" if self.command == "GET" else b""
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        type(self).seen_paths.append((self.command, self.path))
+        if self.path.split("?")[0] == "/ok" or self.path == "/%C3%A1rbol?q=%E2%80%93":
+            self.reply(200)
+        elif self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.reply(304, [("ETag", '"v1"')])
+            else:
+                self.reply(200, [("ETag", '"v1"')])
+        elif self.path == "/get-only":
+            self.reply(405 if self.command == "HEAD" else 200)
+        elif self.path == "/moved":
+            self.reply(301, [("Location", "/ok")])
+        elif self.path == "/loop":
+            self.reply(302, [("Location", "/loop")])
+        else:
+            self.reply(404)
+
+    do_GET = do_HEAD
+
+
+class GarbageHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.recv(4096)
+        self.request.sendall(b"SSH-2.0-no-http\r\n\r\n")
+
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class RequestLineTests(unittest.TestCase):
+    def test_target_is_percent_encoded_utf8(self):
+        self.assertEqual(request_target(urlsplit("http://h/árbol/ó?q=–&a=%20b")), "/%C3%A1rbol/%C3%B3?q=%E2%80%93&a=%20b")
+        self.assertEqual(request_target(urlsplit("http://h")), "/")
+
+    def test_hosts_use_idna(self):
+        self.assertEqual(ascii_host(urlsplit("https://münchen.de/x")), "xn--mnchen-3ya.de")
+        with self.assertRaises(HttpError):
+            ascii_host(urlsplit("http:///sin-host"))
+
+
+class CheckUrlsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = serve(ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler))
+        cls.server.daemon_threads = True
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInHandler.connections = 0
+        StandInHandler.seen_paths = []
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_file = Path(tmp_dir.name) / "urls.json"
+
+    def url(self, path):
+        return self.base + path
+
+    def test_outcomes(self):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            refused = f"http://127.0.0.1:{probe.getsockname()[1]}/"
+        urls = [self.url(path) for path in ("/ok", "/get-only", "/moved", "/loop", "/missing", "/árbol?q=–")]
+        results, stats = check_urls(urls + [refused])
+        outcome = {url: (entry["ok"], entry["status"]) for url, entry in results.items()}
+        self.assertEqual(outcome[self.url("/ok")], (True, 200))
+        self.assertEqual(outcome[self.url("/get-only")], (True, 200))
+        self.assertEqual(outcome[self.url("/moved")], (True, 200))
+        self.assertEqual(outcome[self.url("/missing")], (False, 404))
+        self.assertEqual(outcome[self.url("/árbol?q=–")], (True, 200))
+        self.assertIn("redirecciones", results[self.url("/loop")]["error"])
+        self.assertFalse(results[refused]["ok"])
+        self.assertIsNotNone(results[refused]["error"])
+        self.assertIn(("GET", "/get-only"), StandInHandler.seen_paths)
+        self.assertEqual(stats["urls"], 7)
+
+    def test_connections_are_reused(self):
+        urls = [self.url(f"/ok?n={index}") for index in range(40)]
+        results, stats = check_urls(urls, per_host=2)
+        self.assertTrue(all(entry["ok"] for entry in results.values()))
+        self.assertLessEqual(StandInHandler.connections, 2 + stats["requests"] // 2)
+        self.assertLessEqual(stats["connections"], StandInHandler.connections)
+
+    def test_cache_revalidation_and_pruning(self):
+        urls = [self.url("/ok"), self.url("/etag")]
+        check_urls(urls, cache_file=self.cache_file)
+        _results, stats = check_urls(urls, cache_file=self.cache_file)
+        self.assertEqual((stats["cached"], stats["requests"]), (2, 0))
+        results, stats = check_urls(urls, cache_file=self.cache_file, ttl=0)
+        self.assertEqual(stats["revalidated"], 1)
+        self.assertTrue(results[self.url("/etag")]["ok"])
+        self.assertEqual(results[self.url("/etag")]["etag"], '"v1"')
+        _results, stats = check_urls([self.url("/ok")], cache_file=self.cache_file)
+        self.assertEqual(stats["requests"], 0)
+        stored = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        self.assertEqual(list(stored["urls"]), [self.url("/ok")])
+
+    def test_failures_expire_sooner(self):
+        entry = {"ok": False, "checked_at": 0}
+        self.assertTrue(course_urls.is_fresh(entry, ttl=10**9, now=course_urls.FAILURE_TTL - 1))
+        self.assertFalse(course_urls.is_fresh(entry, ttl=10**9, now=course_urls.FAILURE_TTL + 1))
+        self.assertTrue(course_urls.is_fresh({"ok": True, "checked_at": 0}, ttl=10**9, now=course_urls.FAILURE_TTL + 1))
+
+
+class ResponseParsingTests(unittest.TestCase):
+    def test_non_http_answer_is_an_error(self):
+        server = serve(socketserver.ThreadingTCPServer(("127.0.0.1", 0), GarbageHandler))
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        results, _stats = check_urls([url])
+        self.assertFalse(results[url]["ok"])
+        self.assertIn("respuesta no HTTP", results[url]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()